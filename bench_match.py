@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+후보 매칭 벤치마크
+
+대역 서버의 합성 카탈로그(100선 작품 + 합성 유물)를 후보 집합으로 두고
+artworks.json 작품을 매칭해, 예전 방식(후보를 차례로 보며 부분 문자열 검사, 없으면 첫 결과)과
+CandidateIndex 의 1위 정확도와 처리량을 비교한다.
+
+실제 수집 결과처럼 후보 순서는 섞는다(100선 작품이 앞에 몰려 있으면 선형 검사가 유리해진다).
+정답은 카탈로그에서 그 작품으로 만든 유물(원래 작품명 그대로, 소장품번호가 작품의 번호 중 하나)이고,
+작업 대상의 명칭을 바꿔도 정답은 바뀌지 않는다.
+
+- 번호+명칭: artworks.json 그대로
+- 번호+명칭 변형: 작품명을 마지막 낱말로 줄이고('황남대총 북분 금관' → '금관'), 그 낱말과
+  이름이 똑같은 다른 번호의 유물(미끼)을 카탈로그에 넣는다. 소장품번호로만 정답을 가릴 수 있다.
+- 번호만: 작품명을 빼고 소장품번호만으로 매칭한다.
+- 명칭만: 소장품번호를 빼고 명칭 n-gram 만으로 매칭한다.
+
+    python bench_match.py --count 50000
+"""
+
+import argparse
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from museum_engine import make_target
+from museum_match import CandidateIndex, normalize_inventory, split_inventory
+from museum_standin import ARTWORKS_JSON_PATH, build_catalog
+
+
+def linear_match(target: Dict[str, Any], items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """예전 find_best_match: 소장품번호 포함 > 작품명 포함 > 첫 결과"""
+    inventory = (target.get('inventory') or '').replace(' ', '')
+    if inventory:
+        for item in items:
+            collection = (item.get('collection') or '').replace(' ', '')
+            if collection and (inventory in collection or collection in inventory):
+                return item
+    title = target.get('title') or ''
+    for item in items:
+        name = item.get('name') or ''
+        if name and (title in name or name in title):
+            return item
+    return items[0] if items else None
+
+
+def ground_truth(targets: List[Dict[str, Any]], catalog: List[Dict[str, Any]]) -> List[Set[str]]:
+    """작품마다 그 작품으로 만든 유물 ID (원래 작품명 + 작품의 소장품번호)"""
+    truth = []
+    for target in targets:
+        inventories = set(split_inventory(target['inventory']))
+        truth.append({
+            relic['id'] for relic in catalog
+            if relic['name'] == target['title'] and normalize_inventory(relic['collection']) in inventories
+        })
+    return truth
+
+
+def name_variants(targets: List[Dict[str, Any]], catalog: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """작품명을 마지막 낱말로 줄이고, 같은 이름의 다른 번호 유물(미끼)을 카탈로그에 더한다"""
+    variants = []
+    decoys: Dict[str, Dict[str, Any]] = {}
+    for target in targets:
+        words = target['title'].split()
+        short = words[-1] if len(words) > 1 else target['title']
+        variants.append(dict(target, title=short))
+        if len(words) > 1 and short not in decoys:
+            decoys[short] = {
+                'id': f"DECOY{len(decoys):06d}", 'name': short, 'nameEng': '',
+                'collection': f"경주 {90000 + len(decoys)}",
+            }
+    catalog.extend(decoys.values())
+    return variants
+
+
+def evaluate(name: str, targets: List[Dict[str, Any]], truth: List[Set[str]], match: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]], repeat: int = 1) -> None:
+    """한 번 돌린 결과로 정확도를 매기고, 처리량은 repeat 번 돌린 시간으로 잰다"""
+    started = time.perf_counter()
+    picks = [match(target) for target in targets]
+    for _ in range(repeat - 1):
+        for target in targets:
+            match(target)
+    elapsed = time.perf_counter() - started
+    scored = [(pick, answers) for pick, answers in zip(picks, truth) if answers]
+    correct = sum(1 for pick, answers in scored if pick is not None and pick['id'] in answers)
+    wrong = sum(1 for pick, answers in scored if pick is not None and pick['id'] not in answers)
+    precision = correct / (correct + wrong) if correct + wrong else 0.0
+    print(f"{name:28}{correct:>6}/{len(scored):<6}{precision * 100:>9.1f}%{wrong:>7}{len(targets) * repeat / elapsed:>12,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="선형 부분 문자열 매칭 대 인덱스 매칭 비교")
+    parser.add_argument('--count', type=int, default=50000, help="후보(합성 유물) 수")
+    parser.add_argument('--repeat', type=int, default=5, help="처리량 측정을 위해 작품 목록을 반복할 횟수")
+    args = parser.parse_args()
+
+    catalog = build_catalog(args.count)
+    with open(ARTWORKS_JSON_PATH, 'r', encoding='utf-8') as f:
+        targets = [make_target(artwork) for artwork in json.load(f)]
+    truth = ground_truth(targets, catalog)
+    variants = name_variants(targets, catalog)
+    random.Random(1).shuffle(catalog)
+
+    started = time.perf_counter()
+    index = CandidateIndex(catalog)
+    print(f"후보 {len(catalog):,}건, 작품 {len(targets)}건 (정답 있는 작품 {sum(1 for t in truth if t)}건)")
+    print(f"인덱스 생성: {time.perf_counter() - started:.2f}s")
+
+    def best(target: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        match = index.best(target)
+        return match.item if match else None
+
+    title_only = [dict(target, inventory='') for target in targets]
+    inventory_only = [dict(target, title='') for target in targets]
+    print(f"\n{'':28}{'정답':>13}{'정밀도':>9}{'오답':>6}{'작품/초':>11}")
+    evaluate('선형 (번호+명칭)', targets, truth, lambda t: linear_match(t, catalog))
+    evaluate('인덱스 (번호+명칭)', targets, truth, best, args.repeat)
+    evaluate('선형 (번호+명칭 변형)', variants, truth, lambda t: linear_match(t, catalog))
+    evaluate('인덱스 (번호+명칭 변형)', variants, truth, best, args.repeat)
+    evaluate('선형 (번호만)', inventory_only, truth, lambda t: linear_match(t, catalog))
+    evaluate('인덱스 (번호만)', inventory_only, truth, best, args.repeat)
+    evaluate('선형 (명칭만)', title_only, truth, lambda t: linear_match(t, catalog))
+    evaluate('인덱스 (명칭만)', title_only, truth, best, args.repeat)
+
+    started = time.perf_counter()
+    index.match_many(targets * args.repeat, k=5)
+    elapsed = time.perf_counter() - started
+    print(f"\nmatch_many top-5: {len(targets) * args.repeat / elapsed:,.0f}작품/초")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+유물 레코드 메모리 벤치마크
+
+대역 서버의 합성 카탈로그를 JSONL 로 직렬화한 뒤, 실제 수집처럼 한 줄씩 파싱해
+(1) dict 그대로 들고 있을 때와 (2) Relic 레코드(__slots__ + intern)로 바꿔 들고 있을 때
+남는 메모리와 변환 속도를 비교한다.
+
+    python bench_records.py --count 200000
+"""
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from typing import Callable, List, Tuple
+
+from museum_records import Relic
+from museum_standin import build_catalog
+
+
+def measure(lines: List[bytes], build: Callable[[bytes], object]) -> Tuple[int, float, list]:
+    """lines 를 build 로 변환해 보관했을 때 늘어난 메모리(바이트)와 걸린 시간(초)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    kept = [build(line) for line in lines]
+    elapsed = time.perf_counter() - started
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, elapsed, kept
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="dict 대 Relic 레코드 메모리 비교")
+    parser.add_argument('--count', type=int, default=200000, help="합성 유물 수")
+    args = parser.parse_args()
+
+    print(f"합성 카탈로그 {args.count:,}건 생성 중...")
+    lines = [json.dumps(relic, ensure_ascii=False).encode('utf-8') for relic in build_catalog(args.count)]
+    size = sum(len(line) for line in lines)
+    print(f"JSONL 크기: {size / 1024 / 1024:.1f} MiB")
+
+    dict_bytes, dict_time, dicts = measure(lines, json.loads)
+    del dicts
+    record_bytes, record_time, records = measure(lines, lambda line: Relic.from_dict(json.loads(line)))
+
+    started = time.perf_counter()
+    for relic in records:
+        relic.to_dict()
+    to_dict_time = time.perf_counter() - started
+
+    mib = 1024 * 1024
+    print(f"{'':12}{'메모리':>12}{'건당':>10}{'파싱+변환':>12}")
+    print(f"{'dict':12}{dict_bytes / mib:>10.1f}MiB{dict_bytes / args.count:>9.0f}B{dict_time:>11.2f}s")
+    print(f"{'Relic':12}{record_bytes / mib:>10.1f}MiB{record_bytes / args.count:>9.0f}B{record_time:>11.2f}s")
+    print(f"메모리 절감: {(1 - record_bytes / dict_bytes) * 100:.1f}%")
+    print(f"Relic.to_dict: {to_dict_time:.2f}s ({args.count / to_dict_time:,.0f}건/초)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+전송 방식 벤치마크 (http1 커넥션 풀 vs http2 어댑터 vs h2c)
+
+로컬 대역 서버에 같은 동시성으로 relic/detail 을 보내고
+처리량, 지연 분위수, 서버가 받은 TCP 연결 수, 협상된 HTTP 버전을 비교한다.
+응답 캐시와 메모는 쓰지 않으며 토큰 버킷은 충분히 크게 둔다.
+
+- http1, http2: 평문 HTTP/1.1 대역 서버. 평문에는 ALPN 이 없으므로 http2 전송은
+  httpx 의 HTTP/1.1 로 내려가고, 내려갔을 때의 비용(httpx 오버헤드)을 보여 준다.
+- h2c: h2c 대역 서버(start_standin_server(h2c=True)). 같은 httpx 어댑터가 prior knowledge 로
+  HTTP/2 를 쓰므로 다중화(연결 수, 지연)를 실제로 측정한다.
+  실제 e뮤지엄(https)에서 http2 가 h2 를 협상했을 때의 동작에 해당한다.
+
+    python bench_transport.py --requests 2000 --concurrency 32 --latency 0.02
+"""
+
+import argparse
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from museum_pipeline import percentile
+from museum_rate_limit import TokenBucket
+from museum_standin import start_standin_server
+from museum_transport import TRANSPORT_H2C, TRANSPORTS, transport_stats
+from update_artworks import MuseumAPIClient
+
+
+def run_transport(transport: str, server: Any, relic_ids: List[str], concurrency: int) -> Dict[str, Any]:
+    os.environ['MUSEUM_API_BASE_URL'] = server.base_url
+    client = MuseumAPIClient(
+        use_cache=False,
+        rate_limiter=TokenBucket(100000, 100000),
+        transport=transport,
+        pool_maxsize=concurrency,
+    )
+    server.state.stats.clear()
+    latencies: List[float] = []
+
+    def fetch(relic_id: str) -> bool:
+        started = time.monotonic()
+        data = client._make_request('relic/detail', {'id': relic_id})
+        latencies.append(time.monotonic() - started)
+        return data is not None
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        ok = sum(executor.map(fetch, relic_ids))
+    elapsed = time.monotonic() - started
+    result = dict(
+        transport_stats(client.session),
+        ok=ok,
+        elapsed=round(elapsed, 3),
+        rps=round(len(relic_ids) / elapsed, 1),
+        connections=server.state.stats.get('connections', 0),
+    )
+    latencies.sort()
+    result.update({f"p{int(p * 100)}": round(percentile(latencies, p) * 1000, 1) for p in (0.5, 0.9, 0.99)})
+    client.close()
+    return result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="http1 / http2 / h2c 전송 방식 벤치마크 (로컬 대역 서버)")
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--latency', type=float, default=0.02, help="대역 서버 응답 지연 (초)")
+    parser.add_argument('--transports', nargs='+', choices=TRANSPORTS, default=list(TRANSPORTS))
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    relics = max(2000, args.requests)
+    os.environ.setdefault('MUSEUM_API_KEY', 'bench')
+    # h2c 전송은 h2c 대역 서버에, 나머지는 HTTP/1.1 대역 서버에 (카탈로그는 시드가 같아 동일)
+    servers = {
+        h2c: start_standin_server(relics=relics, latency=args.latency, h2c=h2c)
+        for h2c in {transport == TRANSPORT_H2C for transport in args.transports}
+    }
+    relic_ids = [relic['id'] for relic in next(iter(servers.values())).state.catalog[:args.requests]]
+
+    print(f"relic/detail {len(relic_ids)}건, 동시성 {args.concurrency}, 서버 지연 {args.latency * 1000:.0f}ms")
+    for transport in args.transports:
+        h2c = transport == TRANSPORT_H2C
+        result = run_transport(transport, servers[h2c], relic_ids, args.concurrency)
+        print(
+            f"  {transport:6s} ({'h2c' if h2c else 'HTTP/1.1'} 서버) 성공 {result['ok']} / {result['elapsed']:.2f}초 "
+            f"({result['rps']}건/초) p50 {result['p50']}ms p90 {result['p90']}ms p99 {result['p99']}ms "
+            f"연결 {result['connections']}개 {result.get('versions', '')}"
+            + (f" GOAWAY 재전송 {result['goaway_retries']}" if result.get('goaway_retries') else '')
+        )
+    for server in servers.values():
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,9 @@
 #!/usr/bin/env python3
 
 import json
-import requests
-import time
-import sys
+import os
 
-# 국립중앙박물관 e뮤지엄 Open API 서비스키
-SERVICE_KEY = "YcIMxgSOiCBtw1UZ2MksofNXaiqbyUY8w%2FJAKpLS9tb6xwUXQD5dcCevW9yJvBCLjnpTa9lmu1nWjmMefTzvDw%3D%3D"
-BASE_URL = "https://www.emuseum.go.kr/openapi/relic"
+from museum_engine import MuseumEngine
 
 # 우리가 가진 소장품번호들 (첫 10개만 테스트)
 inventory_numbers = [
@@ -15,76 +11,30 @@ inventory_numbers = [
     "신수1794", "신수2580", "영남대2", "신수120", "공주633"
 ]
 
-def find_relic_id(item_no):
-    """소장품번호로 유물 ID 찾기"""
-    url = f"{BASE_URL}/list?serviceKey={SERVICE_KEY}&manageNo={item_no}&numOfRows=1&returnType=json"
-    try:
-        response = requests.get(url, timeout=15)
-        data = response.json()
-        items = data.get("response", {}).get("body", {}).get("items", [])
-        if items:
-            return items[0].get("id")
-    except Exception as e:
-        print(f"Error finding ID for {item_no}: {e}")
-    return None
-
-def fetch_detail(relic_id):
-    """유물 상세 정보 가져오기"""
-    url = f"{BASE_URL}/detail?serviceKey={SERVICE_KEY}&id={relic_id}&returnType=json"
-    try:
-        response = requests.get(url, timeout=15)
-        data = response.json()
-        return data.get("response", {}).get("body", {}).get("items", [{}])[0]
-    except Exception as e:
-        print(f"Error fetching detail for {relic_id}: {e}")
-    return {}
-
-results = []
+# 단계별 동시 작업 수
+WORKERS = int(os.getenv("MUSEUM_PIPELINE_WORKERS", 4))
 
 print("국립중앙박물관 Open API에서 실제 이미지 URL 가져오는 중...")
 
-for i, item_no in enumerate(inventory_numbers):
-    print(f"[{i+1}/{len(inventory_numbers)}] {item_no} 검색 중...")
-    
-    # 1. 유물 ID 찾기
-    relic_id = find_relic_id(item_no)
-    if not relic_id:
-        print(f"  → ID를 찾을 수 없습니다: {item_no}")
-        continue
-    
-    # 2. 상세 정보 가져오기
-    detail = fetch_detail(relic_id)
-    if not detail:
-        print(f"  → 상세 정보를 가져올 수 없습니다: {item_no}")
-        continue
-    
-    # 3. 이미지 URL 추출
-    image_url = ""
-    image_list = detail.get("imageList", [])
-    for img in image_list:
-        if "thumbnail" not in img.get("imgUrl", ""):  # 원본 이미지 우선
-            image_url = img.get("imgUrl", "")
-            break
-    
-    if not image_url and image_list:  # 원본이 없으면 썸네일이라도
-        image_url = image_list[0].get("imgUrl", "")
-    
-    result = {
-        "inventory_number": item_no,
-        "relic_id": relic_id,
-        "title": detail.get("name", ""),
-        "period": detail.get("era", ""),
-        "material": detail.get("material", ""),
-        "dimensions": detail.get("size", ""),
-        "description": detail.get("description", ""),
-        "image_url": image_url
+# ID 확인 → 상세 조회 → 이미지 선택은 수집 엔진이 공유 클라이언트로 처리
+# (같은 작업: python museum_harvest.py images 암사123 본관11377 ...)
+with MuseumEngine(workers=WORKERS) as engine:
+    outcomes = engine.images({"title": "", "inventory": item_no} for item_no in inventory_numbers)
+    print(f"파이프라인 통계: {engine.last_stats}")
+
+results = [
+    {
+        "inventory_number": outcome["inventory"],
+        "relic_id": outcome["relic_id"],
+        "title": outcome["api_data"]["name"],
+        "period": outcome["api_data"]["era"],
+        "material": outcome["api_data"]["material"],
+        "dimensions": outcome["api_data"]["size"],
+        "description": outcome["api_data"]["description"],
+        "image_url": outcome["api_data"]["imageUrl"],
     }
-    
-    results.append(result)
-    print(f"  → 성공: {detail.get('name', '')} ({image_url[:50]}...)")
-    
-    # API 호출 제한 고려
-    time.sleep(0.5)
+    for outcome in outcomes if "api_data" in outcome
+]
 
 # 결과 저장
 with open("museum_images.json", "w", encoding="utf-8") as f:
@@ -98,4 +48,4 @@ for result in results:
     if result['image_url']:
         print(f"  이미지: {result['image_url']}")
     else:
-        print(f"  이미지: 없음")
\ No newline at end of file
+        print(f"  이미지: 없음")
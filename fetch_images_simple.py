@@ -1,13 +1,8 @@
 #!/usr/bin/env python3
 
-import urllib.request
-import urllib.parse
 import json
-import time
 
-# 국립중앙박물관 e뮤지엄 Open API 서비스키
-SERVICE_KEY = "YcIMxgSOiCBtw1UZ2MksofNXaiqbyUY8w%2FJAKpLS9tb6xwUXQD5dcCevW9yJvBCLjnpTa9lmu1nWjmMefTzvDw%3D%3D"
-BASE_URL = "https://www.emuseum.go.kr/openapi/relic"
+from museum_engine import MuseumEngine
 
 # 실제 소장품번호 몇 개만 테스트
 test_items = [
@@ -18,108 +13,41 @@ test_items = [
     {"inventory": "부여5333", "title": "백제금동대향로"}
 ]
 
-def fetch_url(url):
-    """URL에서 JSON 데이터 가져오기"""
-    try:
-        with urllib.request.urlopen(url, timeout=15) as response:
-            return json.loads(response.read().decode('utf-8'))
-    except Exception as e:
-        print(f"URL 요청 실패: {e}")
-        return None
-
-def find_relic_id(item_no):
-    """소장품번호로 유물 ID 찾기"""
-    encoded_item = urllib.parse.quote(item_no)
-    url = f"{BASE_URL}/list?serviceKey={SERVICE_KEY}&manageNo={encoded_item}&numOfRows=1&returnType=json"
-    
-    data = fetch_url(url)
-    if data:
-        try:
-            items = data["response"]["body"]["items"]
-            if items:
-                return items[0]["id"]
-        except (KeyError, IndexError):
-            pass
-    return None
-
-def fetch_detail(relic_id):
-    """유물 상세 정보 가져오기"""
-    url = f"{BASE_URL}/detail?serviceKey={SERVICE_KEY}&id={relic_id}&returnType=json"
-    
-    data = fetch_url(url)
-    if data:
-        try:
-            return data["response"]["body"]["items"][0]
-        except (KeyError, IndexError):
-            pass
-    return {}
-
 print("국립중앙박물관 Open API 테스트 중...")
 
-results = []
+# 호출 간격은 sleep 대신 엔진이 공유하는 토큰 버킷이 맞춘다
+with MuseumEngine() as engine:
+    outcomes = engine.images(test_items)
 
-for i, item in enumerate(test_items):
-    item_no = item["inventory"]
-    expected_title = item["title"]
-    
-    print(f"\n[{i+1}/{len(test_items)}] {item_no} ({expected_title}) 검색 중...")
-    
-    # 1. 유물 ID 찾기
-    relic_id = find_relic_id(item_no)
-    if not relic_id:
-        print(f"  → ID를 찾을 수 없습니다")
-        continue
-    
-    print(f"  → 유물 ID: {relic_id}")
-    
-    # 2. 상세 정보 가져오기
-    detail = fetch_detail(relic_id)
-    if not detail:
-        print(f"  → 상세 정보를 가져올 수 없습니다")
+results = []
+for i, outcome in enumerate(outcomes):
+    print(f"\n[{i+1}/{len(test_items)}] {outcome['inventory']} ({outcome['title']})")
+    if "api_data" not in outcome:
+        print(f"  → {outcome['error']}")
         continue
-    
-    # 3. 정보 추출
-    title = detail.get("name", "")
-    period = detail.get("era", "")
-    material = detail.get("material", "")
-    description = detail.get("description", "")
-    
-    # 4. 이미지 URL 찾기
-    image_url = ""
-    image_list = detail.get("imageList", [])
-    
-    for img in image_list:
-        img_url = img.get("imgUrl", "")
-        if img_url and "thumbnail" not in img_url.lower():
-            image_url = img_url
-            break
-    
-    if not image_url and image_list:
-        image_url = image_list[0].get("imgUrl", "")
-    
+
+    detail = outcome["api_data"]
+    description = detail["description"]
     result = {
-        "inventory_number": item_no,
-        "expected_title": expected_title,
-        "actual_title": title,
-        "period": period,
-        "material": material,
+        "inventory_number": outcome["inventory"],
+        "expected_title": outcome["title"],
+        "actual_title": detail["name"],
+        "period": detail["era"],
+        "material": detail["material"],
         "description": description[:200] + "..." if len(description) > 200 else description,
-        "image_url": image_url,
-        "relic_id": relic_id
+        "image_url": detail["imageUrl"],
+        "relic_id": outcome["relic_id"]
     }
-    
     results.append(result)
-    
-    print(f"  → 제목: {title}")
-    print(f"  → 시대: {period}")
-    print(f"  → 재질: {material}")
-    if image_url:
-        print(f"  → 이미지: {image_url[:80]}...")
+
+    print(f"  → 유물 ID: {outcome['relic_id']}")
+    print(f"  → 제목: {result['actual_title']}")
+    print(f"  → 시대: {result['period']}")
+    print(f"  → 재질: {result['material']}")
+    if result["image_url"]:
+        print(f"  → 이미지: {result['image_url'][:80]}...")
     else:
         print(f"  → 이미지: 없음")
-    
-    # API 호출 제한 고려
-    time.sleep(1)
 
 # 결과 저장
 with open("api_test_results.json", "w", encoding="utf-8") as f:
@@ -138,4 +66,3 @@ if image_count > 0:
     for result in results:
         if result["image_url"]:
             print(f"- {result['actual_title']} ({result['inventory_number']})")
-            print(f"  {result['image_url']}")
\ No newline at end of file
@@ -1,14 +1,8 @@
 #!/usr/bin/env python3
 
-import requests
 import json
-import time
-import urllib.parse
-import xml.etree.ElementTree as ET
 
-# 올바른 API 키 (디코딩된 버전)
-SERVICE_KEY = "YcIMxgSOiCBtw1UZ2MksofNXaiqbyUY8w/JAKpLS9tb6xwUXQD5dcCevW9yJvBCLjnpTa9lmu1nWjmMefTzvDw=="
-BASE_URL = "https://www.emuseum.go.kr/openapi"
+from museum_engine import MuseumEngine
 
 # 처음 20개 작품으로 테스트
 TEST_ARTWORKS = [
@@ -34,210 +28,28 @@ TEST_ARTWORKS = [
     {"id": 79, "title": "이성계호적", "inventory": "신수 6267"}
 ]
 
-def search_relic_by_name(title):
-    """작품명으로 유물 검색"""
-    encoded_title = urllib.parse.quote(title)
-    url = f"{BASE_URL}/relic/list"
-    params = {
-        'serviceKey': SERVICE_KEY,
-        'name': encoded_title,
-        'numOfRows': 10,
-        'pageNo': 1,
-        'returnType': 'json'
-    }
-    
-    try:
-        print(f"검색: {title}")
-        response = requests.get(url, params=params, timeout=15)
-        
-        # XML 응답을 파싱
-        root = ET.fromstring(response.text)
-        
-        result_code = root.find('resultCode')
-        total_count = root.find('totalCount')
-        
-        print(f"  Result Code: {result_code.text if result_code is not None else 'None'}")
-        print(f"  Total Count: {total_count.text if total_count is not None else 'None'}")
-        
-        if total_count is not None and int(total_count.text) > 0:
-            # items 찾기
-            items_elem = root.find('items')
-            if items_elem is not None:
-                results = []
-                for item in items_elem:
-                    item_data = {}
-                    for child in item:
-                        item_data[child.tag] = child.text if child.text else ''
-                    results.append(item_data)
-                    
-                    print(f"    후보: {item_data.get('name', '')} (ID: {item_data.get('id', '')}, 소장품: {item_data.get('collection', '')})")
-                
-                return results
-        
-        return []
-        
-    except Exception as e:
-        print(f"  검색 실패: {e}")
-        return []
-
-def get_relic_detail(relic_id):
-    """유물 상세 정보 조회"""
-    url = f"{BASE_URL}/relic/detail"
-    params = {
-        'serviceKey': SERVICE_KEY,
-        'id': relic_id,
-        'returnType': 'json'
-    }
-    
-    try:
-        print(f"    상세 조회: {relic_id}")
-        response = requests.get(url, params=params, timeout=15)
-        
-        # XML 응답을 파싱
-        root = ET.fromstring(response.text)
-        
-        # items 찾기
-        items_elem = root.find('items')
-        if items_elem is not None and len(items_elem) > 0:
-            item = items_elem[0]
-            
-            detail_data = {}
-            images = []
-            
-            for child in item:
-                if child.tag == 'imageList':
-                    # 이미지 리스트 파싱
-                    for img_item in child:
-                        img_data = {}
-                        for img_child in img_item:
-                            img_data[img_child.tag] = img_child.text if img_child.text else ''
-                        images.append(img_data)
-                else:
-                    detail_data[child.tag] = child.text if child.text else ''
-            
-            # 최적의 이미지 URL 선택
-            best_image_url = ""
-            if images:
-                first_image = images[0]
-                # 우선순위: 원본 > 중형 썸네일 > 소형 썸네일
-                for url_key in ['imgOriUri', 'imgThumUriM', 'imgThumUriS', 'imgUrl']:
-                    if url_key in first_image and first_image[url_key]:
-                        best_image_url = first_image[url_key]
-                        print(f"      선택된 이미지: {url_key} = {best_image_url}")
-                        break
-            
-            return {
-                'name': detail_data.get('name', ''),
-                'collection': detail_data.get('collection', ''),
-                'era': detail_data.get('era', ''),
-                'material': detail_data.get('material', ''),
-                'size': detail_data.get('size', ''),
-                'description': detail_data.get('description', ''),
-                'designation': detail_data.get('designation', ''),
-                'imageUrl': best_image_url,
-                'imageCount': len(images),
-                'allImages': images
-            }
-        
-        return None
-        
-    except Exception as e:
-        print(f"    상세 조회 실패: {e}")
-        return None
-
-def find_best_match(artwork, search_results):
-    """검색 결과에서 최적의 매칭 찾기"""
-    if not search_results:
-        return None
-    
-    # 1순위: 소장품번호 매칭
-    for result in search_results:
-        result_collection = result.get('collection', '')
-        if artwork['inventory'] in result_collection or result_collection in artwork['inventory']:
-            print(f"    ✓ 소장품번호 매칭: {result.get('id', '')}")
-            return result
-    
-    # 2순위: 작품명 매칭
-    for result in search_results:
-        result_name = result.get('name', '')
-        if artwork['title'] in result_name or result_name in artwork['title']:
-            print(f"    ✓ 작품명 매칭: {result.get('id', '')}")
-            return result
-    
-    # 3순위: 첫 번째 결과
-    print(f"    → 첫 번째 결과 사용: {search_results[0].get('id', '')}")
-    return search_results[0]
+def to_result(outcome):
+    """엔진 결과 → {'artwork', 'relic_id', 'api_data', 'error'} 형식"""
+    artwork = {key: outcome[key] for key in ('id', 'title', 'inventory')}
+    result = {'artwork': artwork}
+    for key in ('relic_id', 'api_data', 'error'):
+        if key in outcome:
+            result[key] = outcome[key]
+    return result
 
 def main():
     print("=== 국립중앙박물관 실제 이미지 수집 (최종) ===")
-    print(f"API Key: {SERVICE_KEY[:20]}...")
     print(f"테스트 작품: {len(TEST_ARTWORKS)}개")
     print()
     
-    successful_results = []
-    failed_results = []
+    # 검색·매칭 → 상세 조회를 단계별로 동시에 진행하고, 실패도 끝까지 흘려보내 분류한다
+    # 1위 후보에 이미지가 없으면 미리 받아 둔 차순위 후보(최대 3개)를 쓴다
+    with MuseumEngine(speculative=3) as engine:
+        outcomes = [to_result(outcome) for outcome in engine.images(TEST_ARTWORKS)]
+        print(f"\n파이프라인 통계: {engine.last_stats}")
     
-    for artwork in TEST_ARTWORKS:
-        print(f"\n[{artwork['id']}] {artwork['title']}")
-        print(f"소장품번호: {artwork['inventory']}")
-        
-        # 1단계: 작품명으로 검색
-        search_results = search_relic_by_name(artwork['title'])
-        
-        if not search_results:
-            print("  ✗ 검색 결과 없음")
-            failed_results.append({
-                'artwork': artwork,
-                'error': '검색 결과 없음'
-            })
-            continue
-        
-        # 2단계: 최적 매칭 찾기
-        best_match = find_best_match(artwork, search_results)
-        
-        if not best_match or not best_match.get('id'):
-            print("  ✗ 적절한 매칭 없음")
-            failed_results.append({
-                'artwork': artwork,
-                'error': '적절한 매칭 없음'
-            })
-            continue
-        
-        # 3단계: 상세 정보 조회
-        detail_info = get_relic_detail(best_match['id'])
-        
-        if not detail_info:
-            print("  ✗ 상세 정보 조회 실패")
-            failed_results.append({
-                'artwork': artwork,
-                'relic_id': best_match['id'],
-                'error': '상세 정보 조회 실패'
-            })
-            continue
-        
-        # 4단계: 결과 저장
-        if detail_info['imageUrl']:
-            print(f"  ✓ 성공! 이미지 URL 확보")
-            print(f"    API 작품명: {detail_info['name']}")
-            print(f"    이미지: {detail_info['imageUrl']}")
-            
-            successful_results.append({
-                'artwork': artwork,
-                'relic_id': best_match['id'],
-                'api_data': detail_info
-            })
-        else:
-            print("  △ 상세 정보는 있으나 이미지 없음")
-            failed_results.append({
-                'artwork': artwork,
-                'relic_id': best_match['id'],
-                'api_data': detail_info,
-                'error': '이미지 없음'
-            })
-        
-        # API 호출 간격
-        time.sleep(1)
-        print("-" * 60)
+    successful_results = [outcome for outcome in outcomes if 'error' not in outcome]
+    failed_results = [outcome for outcome in outcomes if 'error' in outcome]
     
     # 결과 저장
     result_data = {
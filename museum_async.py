@@ -0,0 +1,384 @@
+"""
+국립박물관 Open API 비동기 클라이언트
+
+MuseumAPIClient 와 같은 메서드(search_relics, get_relic_detail,
+get_relic_detail_by_title)를 asyncio 로 제공하고, 동시에 진행되는 요청 수를
+제한한 채 여러 건을 한꺼번에 처리하는 gather 계열 배치 API를 더한다.
+
+사용 예:
+    async with AsyncMuseumAPIClient(max_in_flight=8) as client:
+        details = await client.get_relic_details_by_title(["빗살무늬토기", "금관"])
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Tuple, Union
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from museum_concurrency import (
+    ERROR_CONNECTION,
+    ERROR_TIMEOUT,
+    ERROR_XML,
+    AIMDController,
+    AIMDSlot,
+    classify_status,
+)
+from museum_cache import CacheEntry, ResponseCache, get_shared_cache
+from museum_decode import DecodeError, decode_response
+from museum_memo import DEFAULT_MEMO_SIZE, AsyncMemoizer
+from museum_rate_limit import TokenBucket, get_shared_rate_limiter
+from museum_retry import CircuitOpenError, RetryController
+from museum_sync import SyncState, artwork_key, list_fingerprint
+from update_artworks import (
+    DEFAULT_PAGE_SIZE,
+    MuseumAPIClient,
+    RelicPageError,
+    apply_api_detail,
+    apply_delta,
+    build_list_params,
+    extract_page,
+    next_relic_page,
+    resolve_list_item,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_IN_FLIGHT = 8
+
+
+class AsyncMuseumAPIClient:
+    """국립박물관 API 비동기 클라이언트"""
+
+    _get_service_key = MuseumAPIClient._get_service_key
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        session: Optional["aiohttp.ClientSession"] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        adaptive: bool = False,
+        controller: Optional[AIMDController] = None,
+        cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        retry: Optional[RetryController] = None,
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "aiohttp 라이브러리가 설치되지 않았습니다. "
+                "'pip install aiohttp' 명령으로 설치하세요."
+            )
+        self.service_key = self._get_service_key()
+        self.endpoint = "www.emuseum.go.kr/openapi"
+        # MUSEUM_API_BASE_URL 로 로컬 대역 서버(museum_standin.py) 등을 가리킬 수 있다
+        self.base_url = os.getenv('MUSEUM_API_BASE_URL', f"https://{self.endpoint}")
+        self.timeout = 15
+        self.max_in_flight = max_in_flight
+        self._session = session
+        self._owns_session = session is None
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        # adaptive 이면 max_in_flight 를 상한으로 동시 요청 창을 AIMD 로 조절
+        if controller is None and adaptive:
+            controller = AIMDController(max_window=max_in_flight)
+        self.controller = controller
+        self.cache = (cache or get_shared_cache()) if use_cache else None
+        self.memo = AsyncMemoizer(memo_size)
+        self.retry = retry or RetryController()
+
+    async def __aenter__(self) -> "AsyncMuseumAPIClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def _get_session(self) -> "aiohttp.ClientSession":
+        """이벤트 루프 안에서 keep-alive 세션을 지연 생성"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight, keepalive_timeout=30)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self._owns_session = True
+        return self._session
+
+    async def close(self) -> None:
+        """직접 만든 세션이면 닫는다"""
+        if self._owns_session and self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[AIMDSlot]:
+        """요청 하나를 실행할 자리 확보 (적응형이면 AIMD 창, 아니면 고정 세마포어)"""
+        if self.controller is not None:
+            async with self.controller.slot() as slot:
+                yield slot
+        else:
+            async with self._in_flight:
+                yield AIMDSlot()
+
+    def metrics(self) -> Dict[str, Any]:
+        """현재 동시성 설정과 관측값"""
+        if self.controller is not None:
+            metrics = {'adaptive': True, **self.controller.metrics()}
+        else:
+            metrics = {'adaptive': False, 'window': self.max_in_flight}
+        metrics['memo'] = self.memo.stats()
+        metrics['retry'] = self.retry.stats()
+        return metrics
+
+    async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """공통 API 요청 메서드
+
+        일시적인 오류는 오류 종류별 정책에 따라 백오프 후 다시 시도한다.
+        서킷 브레이커가 열려 있으면 CircuitOpenError 를 그대로 올린다.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        params['serviceKey'] = self.service_key
+        params['returnType'] = 'json'
+
+        cached = self.cache.get(endpoint, params) if self.cache else None
+        if cached and cached.fresh:
+            logger.info(f"캐시 적중: {endpoint} - {params}")
+            return cached.data
+        headers = cached.conditional_headers() if cached and self.cache.revalidate else {}
+
+        attempt = 0
+        while True:
+            attempt += 1
+            self.retry.before_attempt()
+            data, error = await self._send_once(url, endpoint, params, headers, cached)
+            delay = self.retry.after_attempt(error, attempt)
+            if delay is None:
+                return data
+            logger.warning(f"{error} 오류 - {delay:.1f}초 후 재시도 ({attempt}회 실패): {endpoint}")
+            await asyncio.sleep(delay)
+
+    async def _send_once(self, url: str, endpoint: str, params: Dict[str, Any], headers: Dict[str, str], cached: Optional[CacheEntry]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """요청 한 번 전송. (데이터, 오류 분류) 반환"""
+        async with self._slot() as slot:
+            try:
+                await self.rate_limiter.acquire_async()
+                slot.start()
+                logger.info(f"API 요청: {endpoint} - {params}")
+                async with self._get_session().get(url, params=params, headers=headers) as response:
+                    slot.error = classify_status(response.status)
+                    response.raise_for_status()
+                    logger.info(f"응답 상태: {response.status}")
+                    if response.status == 304 and cached:
+                        logger.info("캐시 재검증 성공 (304 Not Modified)")
+                        self.cache.refresh(endpoint, params)
+                        return cached.data, None
+                    content = await response.read()
+                    content_type = response.headers.get('Content-Type')
+                    etag = response.headers.get('ETag')
+                    last_modified = response.headers.get('Last-Modified')
+
+                try:
+                    data = decode_response(content, content_type)
+                    if self.cache:
+                        self.cache.set(endpoint, params, data, etag=etag, last_modified=last_modified)
+                    return data, None
+                except DecodeError as e:
+                    if e.api_error:
+                        slot.error = ERROR_XML
+                    logger.error(f"응답 파싱 실패: {e}")
+                    logger.error(f"응답 내용: {content[:500].decode('utf-8', 'replace')}...")
+
+            except asyncio.TimeoutError:
+                slot.error = ERROR_TIMEOUT
+                logger.error(f"요청 시간 초과 ({self.timeout}초)")
+            except aiohttp.ClientConnectionError:
+                slot.error = ERROR_CONNECTION
+                logger.error("연결 오류 - 네트워크 상태를 확인하세요")
+            except aiohttp.ClientError as e:
+                logger.error(f"HTTP 요청 오류: {e}")
+            except Exception as e:
+                logger.error(f"예상치 못한 오류: {e}")
+
+        return None, slot.error
+
+    async def get_code_list(self) -> Optional[Dict[str, Any]]:
+        """코드 목록 조회 - 소장품 분류 코드 확인"""
+        return await self._make_request("code/list", {})
+
+    async def search_relics(self, keyword: str = "", page: int = 1, size: int = 10) -> Optional[Dict[str, Any]]:
+        """소장품 목록 조회"""
+        params = {
+            'pageNo': page,
+            'numOfRows': size
+        }
+        if keyword:
+            params['keyword'] = keyword
+
+        return await self.memo.call(
+            ('relic/list', keyword, page, size),
+            lambda: self._make_request("relic/list", params),
+        )
+
+    async def get_relic_detail(self, relic_id: str) -> Optional[Dict[str, Any]]:
+        """소장품 상세 정보 조회"""
+        params = {'id': relic_id}
+        return await self.memo.call(
+            ('relic/detail', relic_id),
+            lambda: self._make_request("relic/detail", params),
+        )
+
+    async def iter_relics(
+        self,
+        query: Union[str, Dict[str, Any], None] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_items: Optional[int] = None,
+        start_page: int = 1,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """relic/list 전체 결과를 한 건씩 돌려주는 비동기 제너레이터 (다음 페이지 선요청)"""
+        params = build_list_params(query)
+
+        async def fetch_page(page: int, size: int) -> Dict[str, Any]:
+            data = await self._make_request("relic/list", dict(params, pageNo=page, numOfRows=size))
+            if data is None:
+                raise RelicPageError(f"relic/list {page} 페이지 조회 실패")
+            return data
+
+        def fetch(page: int, size: int) -> "asyncio.Task[Dict[str, Any]]":
+            return asyncio.ensure_future(fetch_page(page, size))
+
+        pending: Optional[asyncio.Task] = fetch(start_page, page_size)
+        page, size = start_page, page_size
+        yielded = 0
+        try:
+            while pending is not None:
+                total, items = extract_page(await pending)
+                pending = None
+                following = next_relic_page(page, size, len(items), total)
+                if following is not None and (max_items is None or yielded + len(items) < max_items):
+                    pending = fetch(*following)
+                for item in items:
+                    if max_items is not None and yielded >= max_items:
+                        return
+                    yield item
+                    yielded += 1
+                if following is not None:
+                    page, size = following
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def get_relic_detail_by_title(self, title: str) -> Optional[Dict[str, Any]]:
+        """제목으로 소장품 상세 정보 조회"""
+        logger.info(f"제목으로 소장품 검색: {title}")
+        search_results = await self.search_relics(keyword=title, size=1)
+
+        if search_results and 'response' in search_results and 'body' in search_results['response'] and 'items' in search_results['response']['body']:
+            items = search_results['response']['body']['items']
+            if items:
+                relic_id = items[0].get('id')
+                if relic_id:
+                    logger.info(f"검색된 유물 ID: {relic_id} (제목: {title})")
+                    return await self.get_relic_detail(relic_id)
+                else:
+                    logger.warning(f"검색 결과에 ID가 없습니다: {title}")
+            else:
+                logger.warning(f"검색 결과가 없습니다: {title}")
+        else:
+            logger.warning(f"API 응답 형식이 예상과 다릅니다 (제목 검색): {title}")
+        return None
+
+    async def gather(self, aws: Iterable[Awaitable[Any]], limit: Optional[int] = None, return_exceptions: bool = False) -> List[Any]:
+        """여러 작업을 최대 limit 개까지 동시에 실행하고 입력 순서대로 결과 반환
+
+        limit 을 생략하면 클라이언트의 max_in_flight 를 사용한다.
+        """
+        semaphore = asyncio.Semaphore(limit or self.max_in_flight)
+
+        async def _run(aw: Awaitable[Any]) -> Any:
+            async with semaphore:
+                return await aw
+
+        return await asyncio.gather(*(_run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+    async def get_relic_details(self, relic_ids: Iterable[str], limit: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """여러 유물 ID의 상세 정보를 동시에 조회"""
+        return await self.gather((self.get_relic_detail(rid) for rid in relic_ids), limit=limit)
+
+    async def get_relic_details_by_title(self, titles: Iterable[str], limit: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """여러 제목의 상세 정보를 동시에 조회"""
+        return await self.gather((self.get_relic_detail_by_title(title) for title in titles), limit=limit)
+
+
+async def sync_artwork_delta_async(artwork: dict, api_client: AsyncMuseumAPIClient, sync_state: SyncState) -> bool:
+    """목록 지문이 바뀐 작품만 상세 조회해 반영 (비동기)"""
+    title = artwork.get('title', '')
+    item = resolve_list_item(await api_client.search_relics(keyword=title, size=1), title)
+    if item is None:
+        return False
+    if not sync_state.needs_detail(artwork_key(artwork), str(item['id']), list_fingerprint(item)):
+        return False
+    return apply_delta(artwork, item, await api_client.get_relic_detail(str(item['id'])), sync_state)
+
+
+async def update_artworks_data_from_api_async(
+    artworks_data: list,
+    api_client: AsyncMuseumAPIClient,
+    sync_state: Optional[SyncState] = None,
+) -> list:
+    """API를 통해 작품 데이터를 동시에 업데이트합니다. sync_state 를 주면 변경분만 반영합니다.
+
+    sync_state 는 저장하지 않는다 (artworks.json 을 쓴 뒤 호출자가 save()).
+    """
+    titles = [artwork.get('title', '') for artwork in artworks_data]
+    print(f"{len(titles)}개 작품을 최대 {api_client.max_in_flight}건씩 동시에 조회합니다...")
+    if sync_state is not None:
+        results = await api_client.gather(
+            (sync_artwork_delta_async(artwork, api_client, sync_state) for artwork in artworks_data),
+            return_exceptions=True,
+        )
+    else:
+        results = await api_client.gather(
+            (api_client.get_relic_detail_by_title(title) for title in titles),
+            return_exceptions=True,
+        )
+
+    updated_count = 0
+    skipped_count = 0
+    for i, (artwork, result) in enumerate(zip(artworks_data, results)):
+        print(f"[{i+1}/{len(artworks_data)}] 작품 업데이트 중: {artwork.get('title', '제목 없음')}")
+        if isinstance(result, CircuitOpenError):
+            skipped_count += 1
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        if sync_state is not None:
+            updated_count += bool(result)
+        elif apply_api_detail(artwork, result):
+            updated_count += 1
+
+    if skipped_count:
+        print(f"API 장애로 서킷 브레이커가 열려 {skipped_count}개 작품은 이번 실행에서 건너뛰었습니다.")
+
+    print(f"총 {updated_count}개의 작품 정보가 API를 통해 업데이트되었습니다.")
+    if sync_state is not None:
+        print(f"변경분 동기화: {sync_state.stats()}")
+    print(f"동시성 지표: {api_client.metrics()}")
+    return artworks_data
+
+
+def run_update_artworks_async(
+    artworks_data: list,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    adaptive: bool = False,
+    sync_state: Optional[SyncState] = None,
+) -> list:
+    """동기 코드에서 비동기 업데이트를 실행"""
+    async def _main() -> list:
+        async with AsyncMuseumAPIClient(max_in_flight=max_in_flight, adaptive=adaptive) as client:
+            return await update_artworks_data_from_api_async(artworks_data, client, sync_state=sync_state)
+
+    return asyncio.run(_main())
@@ -0,0 +1,229 @@
+"""
+국립박물관 Open API 응답 디스크 캐시
+
+relic/list, relic/detail, code/list 응답을 SQLite 파일 하나에 저장해
+다음 실행에서는 만료된 항목만 네트워크로 다시 가져오게 한다.
+
+- 키: 엔드포인트 + 정규화한 파라미터 (serviceKey 는 제외)
+- 엔드포인트별 TTL
+- 항목 수/용량 상한을 넘으면 가장 오래 안 쓴 항목부터 삭제 (LRU).
+  항목 수와 용량은 메모리에서 누적해 세므로 저장할 때마다 테이블 전체를 훑지 않는다
+- 만료된 항목에 ETag / Last-Modified 가 있으면 조건부 요청으로 재검증
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+DEFAULT_CACHE_PATH = os.path.join('.museum_cache', 'responses.sqlite')
+
+# 엔드포인트별 유효 기간 (초)
+DEFAULT_TTLS = {
+    'relic/list': 24 * 3600,
+    'relic/detail': 7 * 24 * 3600,
+    'code/list': 30 * 24 * 3600,
+}
+DEFAULT_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 200_000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# 캐시 키에서 뺄 파라미터 (인증 정보는 응답 내용과 무관)
+EXCLUDED_PARAMS = frozenset({'serviceKey'})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    endpoint      TEXT NOT NULL,
+    body          TEXT NOT NULL,
+    size          INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    stored_at     REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+"""
+
+
+def make_cache_key(endpoint: str, params: Dict[str, Any]) -> str:
+    """엔드포인트와 정규화한 파라미터로 캐시 키 생성"""
+    normalized = sorted(
+        (str(k), str(v).strip())
+        for k, v in params.items()
+        if k not in EXCLUDED_PARAMS and v is not None
+    )
+    return f"{endpoint.strip('/')}?{urlencode(normalized)}"
+
+
+class CacheEntry:
+    """캐시에서 꺼낸 응답 하나"""
+
+    __slots__ = ('data', 'fresh', 'etag', 'last_modified')
+
+    def __init__(self, data: Dict[str, Any], fresh: bool, etag: Optional[str], last_modified: Optional[str]):
+        self.data = data
+        self.fresh = fresh
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """재검증 요청에 붙일 헤더"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """SQLite 기반 API 응답 캐시"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        revalidate: bool = True,
+    ):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.revalidate = revalidate
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+        self._count, self._bytes = self._totals()
+
+    def _totals(self) -> Tuple[int, int]:
+        """파일 전체의 (항목 수, 용량). 열 때와 정리할 때만 센다"""
+        return self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses').fetchone()
+
+    def ttl_for(self, endpoint: str) -> float:
+        return self.ttls.get(endpoint.strip('/'), self.default_ttl)
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[CacheEntry]:
+        """캐시 조회. 만료된 항목도 fresh=False 로 돌려준다 (재검증용)"""
+        key = make_cache_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+
+        body, etag, last_modified, stored_at = row
+        fresh = now - stored_at < self.ttl_for(endpoint)
+        if fresh:
+            self.hits += 1
+        else:
+            self.stale += 1
+        return CacheEntry(json.loads(body), fresh, etag, last_modified)
+
+    def set(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        data: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """응답 저장 후 필요하면 오래 안 쓴 항목 정리"""
+        key = make_cache_key(endpoint, params)
+        body = json.dumps(data, ensure_ascii=False)
+        now = time.time()
+        size = len(body.encode('utf-8'))
+        with self._lock:
+            old = self._conn.execute('SELECT size FROM responses WHERE key = ?', (key,)).fetchone()
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, endpoint.strip('/'), body, size, etag, last_modified, now, now),
+            )
+            if old is None:
+                self._count += 1
+                self._bytes += size
+            else:
+                self._bytes += size - old[0]
+            if self._count > self.max_entries or self._bytes > self.max_bytes:
+                self._evict()
+
+    def refresh(self, endpoint: str, params: Dict[str, Any]) -> None:
+        """304 Not Modified 로 재검증된 항목의 저장 시각 갱신"""
+        key = make_cache_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'UPDATE responses SET stored_at = ?, accessed_at = ? WHERE key = ?', (now, now, key)
+            )
+
+    def _evict(self) -> None:
+        # 다른 프로세스가 같은 파일에 쓴 만큼 누적값이 어긋났을 수 있으니 정리 전에 다시 센다
+        count, total = self._totals()
+        if count > self.max_entries or total > self.max_bytes:
+            # 상한의 90% 까지 줄여 매번 정리하지 않도록 한다
+            target_count = int(self.max_entries * 0.9)
+            target_bytes = int(self.max_bytes * 0.9)
+            doomed = []
+            for key, size in self._conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+                if count <= target_count and total <= target_bytes:
+                    break
+                doomed.append((key,))
+                count -= 1
+                total -= size
+            self._conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+        self._count, self._bytes = count, total
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """엔드포인트 하나 또는 전체 캐시 비우기"""
+        with self._lock:
+            if endpoint:
+                self._conn.execute('DELETE FROM responses WHERE endpoint = ?', (endpoint.strip('/'),))
+            else:
+                self._conn.execute('DELETE FROM responses')
+            self._count, self._bytes = self._totals()
+
+    def stats(self) -> Dict[str, int]:
+        """이번 실행의 적중/미스 횟수와 저장된 항목 수·용량"""
+        return {'hits': self.hits, 'stale': self.stale, 'misses': self.misses, 'entries': self._count, 'bytes': self._bytes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> Optional[ResponseCache]:
+    """프로세스 전체에서 공유하는 응답 캐시 반환
+
+    MUSEUM_API_CACHE=0 이면 캐시를 쓰지 않고 None 을 돌려준다.
+    MUSEUM_API_CACHE_PATH 로 캐시 파일 위치를 바꿀 수 있다.
+    """
+    global _shared_cache
+    if os.getenv('MUSEUM_API_CACHE', '1') == '0':
+        return None
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                _shared_cache = ResponseCache(os.getenv('MUSEUM_API_CACHE_PATH', DEFAULT_CACHE_PATH))
+    return _shared_cache
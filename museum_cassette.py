@@ -0,0 +1,131 @@
+"""
+국립박물관 Open API 응답 녹화/재생 (cassette)
+
+실제 API 응답을 cassette 파일(JSON)에 녹화해 두었다가, 키 없이도 같은 응답을
+재생해 수집 스크립트를 오프라인에서 결정적으로 측정·검증할 수 있게 한다.
+
+- requests 기반 클라이언트: CassetteAdapter 를 세션에 장착
+  (MUSEUM_API_CASSETTE, MUSEUM_API_CASSETTE_MODE=record|replay 설정 시 공유 세션에 자동 장착)
+- 그 밖의 클라이언트(비동기 등): museum_standin.py --cassette 로 재생 서버를 띄워 사용
+
+cassette 키는 응답 캐시와 같은 규칙(엔드포인트 + 정규화한 파라미터, serviceKey 제외)이라
+녹화 파일에 API 키가 남지 않는다.
+"""
+
+import io
+import json
+import os
+import threading
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from museum_cache import make_cache_key
+
+CASSETTE_VERSION = 1
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+
+# 녹화할 응답 헤더
+RECORDED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class CassetteMissError(requests.exceptions.RequestException):
+    """재생 모드에서 cassette 에 없는 요청
+
+    다시 보내도 결과가 같으므로 재시도 대상인 ConnectionError/Timeout 이 아니라
+    RequestException 을 바로 상속한다.
+    """
+
+
+def endpoint_from_path(path: str) -> str:
+    """/openapi/relic/list → relic/list"""
+    path = path.strip('/')
+    if 'openapi/' in path:
+        path = path.split('openapi/', 1)[1]
+    return path
+
+
+def request_key(url: str) -> str:
+    """요청 URL 을 cassette 키로 변환"""
+    parts = urlsplit(url)
+    params = dict(parse_qsl(parts.query, keep_blank_values=True))
+    return make_cache_key(endpoint_from_path(parts.path), params)
+
+
+class Cassette:
+    """녹화된 응답 묶음"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.interactions = json.load(f).get('interactions', {})
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.interactions.get(key)
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: str) -> None:
+        with self._lock:
+            self.interactions[key] = {'status': status, 'headers': headers, 'body': body}
+            self._save()
+
+    def _save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': CASSETTE_VERSION, 'interactions': self.interactions}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class CassetteAdapter(HTTPAdapter):
+    """requests 전송 계층에서 응답을 녹화하거나 재생하는 어댑터"""
+
+    def __init__(self, cassette: Cassette, mode: str = MODE_REPLAY, **kwargs):
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"알 수 없는 cassette 모드: {mode}")
+        super().__init__(**kwargs)
+        self.cassette = cassette
+        self.mode = mode
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        key = request_key(request.url)
+        if self.mode == MODE_REPLAY:
+            recorded = self.cassette.get(key)
+            if recorded is None:
+                raise CassetteMissError(f"cassette 에 녹화되지 않은 요청입니다: {key}", request=request)
+            return self._build_response(request, recorded)
+
+        response = super().send(request, **kwargs)
+        headers = {name: response.headers[name] for name in RECORDED_HEADERS if name in response.headers}
+        self.cassette.put(key, response.status_code, headers, response.text)
+        return response
+
+    def _build_response(self, request: requests.PreparedRequest, recorded: Dict[str, Any]) -> requests.Response:
+        body = recorded['body'].encode('utf-8')
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.headers = CaseInsensitiveDict(recorded.get('headers', {}))
+        # stream=True 로 받아도 iter_content 가 본문을 다시 나눠 주도록 이미 읽은 응답으로 만든다
+        response._content = body
+        response._content_consumed = True
+        response.raw = io.BytesIO(body)
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        response.reason = 'OK' if response.status_code < 400 else 'Error'
+        return response
+
+
+def install_cassette(session: requests.Session, path: str, mode: str = MODE_REPLAY, **adapter_kwargs) -> CassetteAdapter:
+    """세션의 http/https 전송을 cassette 어댑터로 교체"""
+    adapter = CassetteAdapter(Cassette(path), mode, **adapter_kwargs)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return adapter
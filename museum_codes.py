@@ -0,0 +1,169 @@
+"""
+code/list 코드표 로컬 사본과 relic/list 검색 조건 빌더
+
+스크립트마다 name, keyword, manageNo 를 제각각 보내고 code/list 는 필요할 때 받아 버려서,
+박물관·시대·재질 조건을 서버에 넘기지 못하고 넓은 검색 결과를 여러 페이지 받아 걸러 왔다.
+
+코드표(박물관 PS01…, 시대, 재질)는 거의 바뀌지 않으므로 한 번 받아 JSON 파일로 두고
+TTL 이 지났을 때만 다시 받는다. 내용 해시(revision)로 코드표가 바뀌었는지 알 수 있다.
+build_query 는 작품 필터({'title', 'inventory', 'museum', 'era', 'material'})를
+코드표로 relic/list 파라미터로 바꾸고, 코드로 바꾸지 못한 조건만 따로 돌려준다.
+
+    codes = CodeTables()
+    codes.refresh(client)                                    # 없거나 오래됐을 때만 code/list 호출
+    params, leftover = build_query({'title': '매병', 'museum': '국립중앙박물관', 'era': '고려'}, codes)
+    # params = {'name': '매병', 'museumCode': 'PS01001001', 'nationalityCode': 'PC07'}
+    items = filter_items(items, leftover)                    # 남은 조건은 목록 항목에서 거른다
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from museum_match import normalize_title
+from museum_sync import content_hash
+from update_artworks import extract_page
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CODE_PATH = '.museum_cache/codes.json'
+CODES_VERSION = 1
+DEFAULT_CODE_TTL = 7 * 24 * 3600   # 7일
+
+# 필터 이름 → (code/list 그룹, relic/list 파라미터, 목록 항목의 이름 필드)
+CODE_FILTERS = {
+    'museum': ('museum', 'museumCode', 'museumName'),
+    'era': ('era', 'nationalityCode', 'era'),
+    'material': ('material', 'materialCode', 'material'),
+}
+
+
+class CodeTables:
+    """code/list 코드표 (그룹 → {코드: 이름}, JSON 파일)"""
+
+    def __init__(self, path: str = DEFAULT_CODE_PATH, ttl: float = DEFAULT_CODE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.groups: Dict[str, Dict[str, str]] = {}
+        self.revision = ''      # 코드표 내용 해시 (코드가 추가·변경되면 바뀜)
+        self.fetched_at = 0.0
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('version') == CODES_VERSION:
+                self.groups = state.get('groups', {})
+                self.revision = state.get('revision', '')
+                self.fetched_at = state.get('fetchedAt', 0.0)
+
+    def is_stale(self) -> bool:
+        return not self.groups or time.time() - self.fetched_at > self.ttl
+
+    def refresh(self, client: Any, force: bool = False) -> bool:
+        """코드표가 없거나 오래됐으면(force 면 항상) code/list 를 다시 받는다. 내용이 바뀌었으면 True
+
+        받지 못하면 기존 사본을 그대로 쓴다.
+        """
+        if not force and not self.is_stale():
+            return False
+        _, items = extract_page(client.get_code_list())
+        if not items:
+            logger.warning("code/list 를 받지 못해 기존 코드표를 사용합니다")
+            return False
+        groups: Dict[str, Dict[str, str]] = defaultdict(dict)
+        for item in items:
+            if item.get('code'):
+                groups[str(item.get('groupCode') or '')][str(item['code'])] = str(item.get('name') or '')
+        revision = content_hash(groups)[:16]
+        changed = revision != self.revision
+        with self._lock:
+            self.groups, self.revision, self.fetched_at = dict(groups), revision, time.time()
+        self.save()
+        if changed:
+            logger.info(f"코드표 갱신: {sum(len(codes) for codes in self.groups.values())}개 (revision {revision})")
+        return changed
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': CODES_VERSION, 'revision': self.revision, 'fetchedAt': self.fetched_at, 'groups': self.groups},
+                    f, ensure_ascii=False, indent=2,
+                )
+            os.replace(tmp_path, self.path)
+
+    def lookup(self, group: str, value: str) -> Optional[str]:
+        """코드 또는 이름 → 코드
+
+        코드 그대로, 이름 완전 일치, 앞부분 일치('고려' → 고려시대), 부분 일치('경주' → 국립경주박물관)
+        순으로 찾는다. 한 단계에서 여러 개가 걸리면 어느 것인지 알 수 없으므로 None.
+        """
+        codes = self.groups.get(group, {})
+        if value in codes:
+            return value
+        wanted = normalize_title(value)
+        if not wanted:
+            return None
+        names = {code: normalize_title(name) for code, name in codes.items()}
+        for matches in (
+            lambda name: name == wanted,
+            lambda name: name.startswith(wanted),
+            lambda name: wanted in name,
+        ):
+            found = [code for code, name in names.items() if matches(name)]
+            if found:
+                return found[0] if len(found) == 1 else None
+        return None
+
+    def name(self, group: str, code: str) -> str:
+        return self.groups.get(group, {}).get(code, '')
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'revision': self.revision,
+            'fetchedAt': self.fetched_at,
+            'groups': {group: len(codes) for group, codes in self.groups.items()},
+        }
+
+
+def build_query(filters: Dict[str, Any], codes: Optional[CodeTables] = None) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """작품 필터 → (relic/list 파라미터, 서버에 넘기지 못한 필터)
+
+    - title(name, keyword) → name
+    - inventory(manageNo) → manageNo (첫 번호, 공백 제거)
+    - museum / era / material → 코드표의 museumCode / nationalityCode / materialCode
+    """
+    params: Dict[str, Any] = {}
+    leftover: Dict[str, str] = {}
+    title = filters.get('title') or filters.get('name') or filters.get('keyword')
+    if title:
+        params['name'] = str(title).strip()
+    inventory = filters.get('inventory') or filters.get('manageNo')
+    if inventory:
+        params['manageNo'] = str(inventory).split(',')[0].replace(' ', '')
+    for key, (group, param, _) in CODE_FILTERS.items():
+        value = filters.get(key)
+        if not value:
+            continue
+        code = codes.lookup(group, str(value)) if codes is not None else None
+        if code:
+            params[param] = code
+        else:
+            leftover[key] = str(value)
+    return params, leftover
+
+
+def filter_items(items: Iterable[Dict[str, Any]], leftover: Dict[str, str]) -> List[Dict[str, Any]]:
+    """서버에 넘기지 못한 필터를 목록 항목의 이름 필드(부분 일치)로 적용"""
+    conditions = [(CODE_FILTERS[key][2], normalize_title(value)) for key, value in leftover.items()]
+    return [
+        item for item in items
+        if all(wanted in normalize_title(item.get(field)) for field, wanted in conditions)
+    ]
@@ -0,0 +1,196 @@
+"""
+관측된 지연 시간과 오류로 동시 요청 수를 조절하는 AIMD 제어기
+
+e뮤지엄 Open API 는 시간대에 따라 느려지거나 오류 페이지를 XML 로 돌려준다.
+고정된 동시성은 너무 소심하거나 스로틀링을 유발하므로,
+- 최근 p95 지연과 오류율이 건강하면 창(window)을 더하기로 키우고 (additive increase)
+- 시간 초과, 429/5xx, XML 오류 응답이 오면 곱하기로 줄인다 (multiplicative decrease).
+
+지연 표본은 slot.start() 부터 자리를 돌려줄 때까지, 즉 HTTP 왕복만 잰다.
+토큰 버킷 대기까지 넣으면 스로틀링 자체가 지연으로 보여 창이 쓸데없이 줄어든다.
+비동기 클라이언트는 slot(), 스레드로 도는 MuseumAPIClient(엔진, harvest)는 sync_slot() 을 쓴다.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional
+
+# 오류 분류
+ERROR_TIMEOUT = 'timeout'
+ERROR_THROTTLED = 'throttled'       # HTTP 429
+ERROR_SERVER = 'server'             # HTTP 5xx
+ERROR_XML = 'xml_error'             # 200 이지만 본문이 XML 오류 메시지
+ERROR_CONNECTION = 'connection'
+
+# 이 오류들이 관측되면 즉시 창을 줄인다
+BACKOFF_ERRORS = frozenset({ERROR_TIMEOUT, ERROR_THROTTLED, ERROR_SERVER, ERROR_XML})
+
+
+def classify_status(status: int) -> Optional[str]:
+    """HTTP 상태 코드를 오류 분류로 변환 (정상이면 None)"""
+    if status == 429:
+        return ERROR_THROTTLED
+    if status >= 500:
+        return ERROR_SERVER
+    return None
+
+
+class AIMDController:
+    """동시 요청 창을 AIMD 방식으로 조절하는 제어기"""
+
+    def __init__(
+        self,
+        initial_window: int = 2,
+        min_window: int = 1,
+        max_window: int = 32,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        latency_target: float = 3.0,
+        error_rate_threshold: float = 0.05,
+        sample_size: int = 100,
+    ):
+        self.min_window = min_window
+        self.max_window = max_window
+        self.window = float(min(max(initial_window, min_window), max_window))
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target          # p95 목표 (초)
+        self.error_rate_threshold = error_rate_threshold
+
+        self._latencies: Deque[float] = deque(maxlen=sample_size)
+        self._outcomes: Deque[bool] = deque(maxlen=sample_size)   # True = 오류
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._threads = threading.Condition()   # sync_slot 대기용
+        self._lock = threading.Lock()            # record 는 여러 스레드에서 불린다
+        self._last_decrease = 0.0
+        self._errors: Dict[str, int] = {}
+        self._increases = 0
+        self._decreases = 0
+        self._completed = 0
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator["AIMDSlot"]:
+        """창 안에서 요청 하나를 실행할 자리 확보
+
+        사용 예:
+            async with controller.slot() as slot:
+                ...
+                slot.error = ERROR_THROTTLED
+        """
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self._in_flight < int(self.window))
+            self._in_flight += 1
+
+        slot = AIMDSlot()
+        try:
+            yield slot
+        except asyncio.TimeoutError:
+            slot.error = ERROR_TIMEOUT
+            raise
+        finally:
+            self.record(slot.latency(), slot.error)
+            async with condition:
+                self._in_flight -= 1
+                condition.notify_all()
+
+    @contextmanager
+    def sync_slot(self) -> Iterator["AIMDSlot"]:
+        """스레드용 slot(). 창이 찰 때까지 호출한 스레드를 막는다"""
+        with self._threads:
+            self._threads.wait_for(lambda: self._in_flight < int(self.window))
+            self._in_flight += 1
+
+        slot = AIMDSlot()
+        try:
+            yield slot
+        finally:
+            self.record(slot.latency(), slot.error)
+            with self._threads:
+                self._in_flight -= 1
+                self._threads.notify_all()
+
+    def record(self, latency: Optional[float], error: Optional[str] = None) -> None:
+        """응답 하나의 결과를 반영해 창 크기를 조정 (latency 가 None 이면 요청을 보내기 전에 끝난 것)"""
+        with self._lock:
+            self._completed += 1
+            if latency is not None:
+                self._latencies.append(latency)
+            self._outcomes.append(error is not None)
+            if error is not None:
+                self._errors[error] = self._errors.get(error, 0) + 1
+
+            if error in BACKOFF_ERRORS or self.p95_latency() > self.latency_target:
+                self._decrease()
+            elif error is None and self.error_rate() <= self.error_rate_threshold:
+                # 창 하나 분량의 응답이 돌아올 때마다 increase 만큼 늘어나도록 나눠서 더한다
+                self.window = min(self.max_window, self.window + self.increase / self.window)
+                self._increases += 1
+
+    def _decrease(self) -> None:
+        # 한 번의 혼잡에 연달아 응답한 요청들이 창을 바닥까지 줄이지 않도록
+        # 최근 지연 시간만큼은 다시 줄이지 않는다
+        now = time.monotonic()
+        if now - self._last_decrease < max(self.p95_latency(), 0.1):
+            return
+        self._last_decrease = now
+        self.window = max(float(self.min_window), self.window * self.decrease_factor)
+        self._decreases += 1
+
+    def p95_latency(self) -> float:
+        """최근 표본의 p95 지연 (초)"""
+        return _percentile(list(self._latencies), 0.95)
+
+    def error_rate(self) -> float:
+        """최근 표본의 오류율"""
+        if not self._outcomes:
+            return 0.0
+        return sum(self._outcomes) / len(self._outcomes)
+
+    def metrics(self) -> Dict[str, Any]:
+        """현재 창 크기와 관측값"""
+        return {
+            'window': int(self.window),
+            'window_exact': round(self.window, 2),
+            'in_flight': self._in_flight,
+            'p95_latency': round(self.p95_latency(), 3),
+            'error_rate': round(self.error_rate(), 3),
+            'completed': self._completed,
+            'increases': self._increases,
+            'decreases': self._decreases,
+            'errors': dict(self._errors),
+        }
+
+
+class AIMDSlot:
+    """slot() 안에서 요청 결과(오류 분류)와 HTTP 왕복 시작 시각을 기록하는 자리"""
+
+    __slots__ = ('error', 'started')
+
+    def __init__(self):
+        self.error: Optional[str] = None
+        self.started: Optional[float] = None
+
+    def start(self) -> None:
+        """토큰을 받은 뒤 요청을 보내기 직전에 호출 (여기서부터 지연을 잰다)"""
+        self.started = time.monotonic()
+
+    def latency(self) -> Optional[float]:
+        return time.monotonic() - self.started if self.started is not None else None
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values.sort()
+    index = min(len(values) - 1, int(q * len(values)))
+    return values[index]
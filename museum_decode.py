@@ -0,0 +1,360 @@
+"""
+국립박물관 Open API 응답 디코더
+
+포털은 returnType=json 을 요청해도 XML 로 응답하는 경우가 있어, 지금까지는
+response.json() 이 실패하면 ET.fromstring(response.text) 로 다시 파싱했다.
+여기서는 본문 첫 바이트(필요하면 Content-Type)를 한 번만 보고 형식을 정한 뒤
+JSON 과 XML 을 같은 구조로 변환한다.
+
+    {'response': {'header': {'resultCode': ..., 'resultMsg': ...},
+                  'body': {'totalCount': int, 'pageNo': ..., 'numOfRows': ..., 'items': [dict, ...]}}}
+
+XML 은 iterparse 로 item 단위로 읽고 다 읽은 요소는 바로 비워,
+큰 목록 페이지도 트리 전체를 만들지 않는다. 오류 본문(cmmMsgHeader/errMsg,
+정상이 아닌 resultCode)은 DecodeError(api_error=True) 로 알린다.
+
+iter_response_items 는 소켓에서 받는 조각(chunk)을 바로 읽어 items 를 한 건씩
+돌려준다. 페이지 전체가 도착하기 전에 첫 항목 처리를 시작할 수 있고,
+최대 메모리가 페이지 크기에 비례하지 않는다.
+"""
+
+import codecs
+import io
+import json
+import xml.etree.ElementTree as ET
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+FORMAT_JSON = 'json'
+FORMAT_XML = 'xml'
+
+# 공공데이터 Open API 에서 정상을 뜻하는 resultCode 값들
+SUCCESS_RESULT_CODES = frozenset({'0', '00', '0000', 'INFO-000'})
+
+HEADER_FIELDS = ('resultCode', 'resultMsg')
+INTEGER_FIELDS = ('totalCount', 'pageNo', 'numOfRows')
+ERROR_HEADER_TAG = 'cmmMsgHeader'
+
+# 자식이 모두 이 태그이면 목록으로 본다 (<imageList><image>..</image></imageList> 등)
+LIST_ITEM_TAGS = frozenset({'item', 'image', 'list'})
+# 비어 있어도 목록으로 보는 필드
+LIST_FIELDS = frozenset({'imageList'})
+
+_BOM = b'\xef\xbb\xbf'
+
+
+class DecodeError(ValueError):
+    """응답을 해석할 수 없음. api_error 가 True 이면 API 가 돌려준 오류 본문"""
+
+    def __init__(self, message: str, api_error: bool = False):
+        super().__init__(message)
+        self.api_error = api_error
+
+
+def sniff_format(content: bytes, content_type: Optional[str] = None) -> str:
+    """본문 첫 글자로 JSON/XML 판별 (비어 있으면 Content-Type 참고)"""
+    head = content[:64].lstrip(_BOM).lstrip()
+    if head[:1] in (b'{', b'['):
+        return FORMAT_JSON
+    if head[:1] == b'<':
+        return FORMAT_XML
+    if content_type and 'xml' in content_type.lower():
+        return FORMAT_XML
+    return FORMAT_JSON
+
+
+def _to_int(value: Any) -> Any:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def element_to_value(element: ET.Element) -> Any:
+    """XML 요소를 JSON 응답과 같은 모양의 값으로 변환"""
+    children = list(element)
+    if not children:
+        if element.tag in LIST_FIELDS:
+            return []
+        return element.text.strip() if element.text else ''
+    tags = {child.tag for child in children}
+    if len(tags) == 1 and tags <= LIST_ITEM_TAGS:
+        return [element_to_value(child) for child in children]
+    return {child.tag: element_to_value(child) for child in children}
+
+
+def normalize_items(items: Any) -> List[Dict[str, Any]]:
+    """items 를 항상 dict 목록으로 ({'item': [...]} 또는 단일 dict 도 허용)"""
+    if not items:
+        return []
+    if isinstance(items, dict):
+        items = items.get('item', [items])
+    if isinstance(items, dict):
+        return [items]
+    return list(items)
+
+
+def normalize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """imageList 가 {'list': [...]} 로 오는 JSON 응답도 XML 과 같은 목록으로 맞춘다"""
+    images = item.get('imageList')
+    if isinstance(images, dict):
+        item['imageList'] = normalize_items(images.get('list', images.get('image', [])))
+    return item
+
+
+def _build(header: Dict[str, Any], body: Dict[str, Any], items: List[Dict[str, Any]]) -> Dict[str, Any]:
+    for key in INTEGER_FIELDS:
+        if key in body:
+            body[key] = _to_int(body[key])
+    body['items'] = [normalize_item(item) for item in items]
+    return {'response': {'header': header, 'body': body}}
+
+
+def _check_result_code(header: Dict[str, Any]) -> None:
+    code = header.get('resultCode')
+    if code not in (None, '') and str(code).strip() not in SUCCESS_RESULT_CODES:
+        raise DecodeError(f"API 오류 응답: {code} {header.get('resultMsg', '')}".strip(), api_error=True)
+
+
+def iter_xml_items(
+    source: Union[bytes, BinaryIO],
+    on_field: Optional[Callable[[str, Any], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """XML 응답에서 <items> 아래 item 을 하나씩 돌려준다
+
+    items 밖의 단순 필드(resultCode, totalCount 등)는 on_field(tag, value) 로 알린다.
+    처리한 item 은 곧바로 비워 메모리가 페이지 크기에 비례하지 않는다.
+    """
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    in_items = False
+    parents: List[ET.Element] = []
+    try:
+        for event, element in ET.iterparse(stream, events=('start', 'end')):
+            if event == 'start':
+                parents.append(element)
+                if element.tag == 'items':
+                    in_items = True
+                continue
+
+            parents.pop()
+            if element.tag == ERROR_HEADER_TAG or (
+                element.tag == 'errMsg' and not (parents and parents[-1].tag == ERROR_HEADER_TAG)
+            ):
+                message = element.findtext('errMsg') or element.text or ''
+                reason = element.findtext('returnAuthMsg') or ''
+                raise DecodeError(f"API 오류 응답: {message.strip()} {reason}".strip(), api_error=True)
+            if element.tag == 'items':
+                in_items = False
+                element.clear()
+            elif in_items and parents and parents[-1].tag == 'items':
+                yield element_to_value(element)
+                element.clear()
+                parents[-1].remove(element)
+            elif not in_items and on_field is not None and len(element) == 0:
+                on_field(element.tag, element.text.strip() if element.text else '')
+    except ET.ParseError as e:
+        raise DecodeError(f"XML 파싱 실패: {e}") from e
+
+
+def decode_xml(source: Union[bytes, BinaryIO]) -> Dict[str, Any]:
+    header: Dict[str, Any] = {}
+    body: Dict[str, Any] = {}
+
+    def on_field(tag: str, value: Any) -> None:
+        (header if tag in HEADER_FIELDS else body)[tag] = value
+
+    items = list(iter_xml_items(source, on_field))
+    _check_result_code(header)
+    return _build(header, body, items)
+
+
+def decode_json(content: bytes) -> Dict[str, Any]:
+    try:
+        data = json.loads(content.lstrip(_BOM).decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise DecodeError(f"JSON 파싱 실패: {e}") from e
+    if not isinstance(data, dict):
+        raise DecodeError("JSON 응답 형식이 예상과 다릅니다")
+    response = data.get('response', data)
+    header = dict(response.get('header') or {})
+    body = dict(response.get('body') or {})
+    _check_result_code(header)
+    return _build(header, body, normalize_items(body.get('items')))
+
+
+def decode_response(content: bytes, content_type: Optional[str] = None) -> Dict[str, Any]:
+    """응답 본문을 형식에 관계없이 정규화된 dict 로 변환"""
+    if sniff_format(content, content_type) == FORMAT_XML:
+        return decode_xml(content)
+    return decode_json(content)
+
+
+# 스트리밍 JSON 에서 들어가 볼 객체 경로와 items 위치
+_JSON_CONTAINERS = frozenset({(), ('response',), ('response', 'body'), ('response', 'header'), ('body',), ('header',)})
+_JSON_ITEMS_PATHS = frozenset({('response', 'body', 'items'), ('body', 'items'), ('items',)})
+_WHITESPACE = ' \t\r\n'
+
+
+class _ChunkText:
+    """바이트 조각 스트림 위의 점진적 텍스트 버퍼"""
+
+    def __init__(self, chunks: Iterator[bytes], first: bytes = b''):
+        self._chunks = chunks
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.buf = self._decoder.decode(first.lstrip(_BOM) if first else b'')
+        self.pos = 0
+        self.eof = False
+        self._json = json.JSONDecoder()
+
+    def fill(self) -> bool:
+        """조각 하나를 더 읽는다. 더 없으면 False"""
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            # 소비한 앞부분은 버려 버퍼가 커지지 않게 한다
+            self.buf = self.buf[self.pos:] + self._decoder.decode(chunk)
+            self.pos = 0
+            return True
+        self.buf = self.buf[self.pos:] + self._decoder.decode(b'', final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self) -> Optional[str]:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if char is None or char not in chars:
+            raise DecodeError(f"JSON 파싱 실패: '{chars}' 가 필요하지만 {char!r} 를 만났습니다")
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """다음 JSON 값 하나를 읽는다 (조각 경계에 걸리면 더 받아 다시 시도)"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if self.fill():
+                    continue
+                raise DecodeError(f"JSON 파싱 실패: {e}") from e
+            # 숫자가 조각 끝에서 잘렸을 수 있으므로 뒤에 글자가 더 있어야 확정
+            if end < len(self.buf) or self.eof or not self.fill():
+                self.pos = end
+                return value
+
+
+def _walk_json_object(text: _ChunkText, path: Tuple[str, ...], on_field: Callable[[Tuple[str, ...], Any], None]) -> Iterator[Dict[str, Any]]:
+    text.expect('{')
+    if text.peek() == '}':
+        text.pos += 1
+        return
+    while True:
+        key = text.value()
+        if not isinstance(key, str):
+            raise DecodeError("JSON 파싱 실패: 객체 키가 문자열이 아닙니다")
+        text.expect(':')
+        child = path + (key,)
+        if child in _JSON_ITEMS_PATHS and text.peek() == '[':
+            text.pos += 1
+            if text.peek() == ']':
+                text.pos += 1
+            else:
+                while True:
+                    item = text.value()
+                    if isinstance(item, dict):
+                        yield normalize_item(item)
+                    if text.expect(',]') == ']':
+                        break
+        elif child in _JSON_ITEMS_PATHS:
+            # {"item": [...]} 형태는 통째로 읽어 정규화
+            for item in normalize_items(text.value()):
+                yield normalize_item(item)
+        elif child in _JSON_CONTAINERS and text.peek() == '{':
+            yield from _walk_json_object(text, child, on_field)
+        else:
+            on_field(child, text.value())
+        if text.expect(',}') == '}':
+            return
+
+
+def iter_json_items(
+    chunks: Iterable[bytes],
+    on_field: Optional[Callable[[str, Any], None]] = None,
+    first: bytes = b'',
+) -> Iterator[Dict[str, Any]]:
+    """JSON 응답 조각에서 response.body.items 의 항목을 하나씩 돌려준다
+
+    header/body 의 다른 필드는 on_field(name, value) 로 알린다.
+    resultCode 가 정상이 아니면 그 자리에서 DecodeError(api_error=True).
+    """
+    text = _ChunkText(iter(chunks), first)
+
+    def field(path: Tuple[str, ...], value: Any) -> None:
+        name = path[-1]
+        if name == 'resultCode':
+            _check_result_code({'resultCode': value})
+        if on_field is not None:
+            on_field(name, _to_int(value) if name in INTEGER_FIELDS else value)
+
+    if text.peek() != '{':
+        raise DecodeError("JSON 응답 형식이 예상과 다릅니다")
+    yield from _walk_json_object(text, (), field)
+
+
+class _ChunkReader(io.RawIOBase):
+    """바이트 조각 반복자를 iterparse 가 읽을 수 있는 파일 객체로 감싼다"""
+
+    def __init__(self, chunks: Iterator[bytes], first: bytes = b''):
+        self._chunks = chunks
+        self._pending = first
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def iter_response_items(
+    chunks: Iterable[bytes],
+    content_type: Optional[str] = None,
+    on_field: Optional[Callable[[str, Any], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """응답 본문 조각을 형식에 관계없이 item 단위로 스트리밍 파싱"""
+    chunks = iter(chunks)
+    first = b''
+    for chunk in chunks:
+        first += chunk
+        if first.lstrip(_BOM).strip():
+            break
+    if sniff_format(first, content_type) == FORMAT_XML:
+        header: Dict[str, Any] = {}
+
+        def xml_field(tag: str, value: Any) -> None:
+            if tag == 'resultCode':
+                header['resultCode'] = value
+                _check_result_code(header)
+            if on_field is not None:
+                on_field(tag, _to_int(value) if tag in INTEGER_FIELDS else value)
+
+        yield from iter_xml_items(io.BufferedReader(_ChunkReader(chunks, first)), xml_field)
+    else:
+        yield from iter_json_items(chunks, on_field, first)
@@ -0,0 +1,635 @@
+"""
+수집 엔진 (resolve / fetch / images / update / export 공통)
+
+fetch_images.py, final_image_fetcher.py 등 스크립트마다 따로 있던
+소장품번호·작품명 → 유물 ID 확인, 상세 조회, 대표 이미지 선택 로직을 한곳에 모았다.
+엔진은 MuseumAPIClient 하나를 공유하므로 모든 작업이 같은 커넥션 풀, 응답 캐시,
+토큰 버킷, 재시도 정책, 실행 중 메모를 쓰고, 작품 단위 작업은 Pipeline 으로 동시에 처리한다.
+
+    engine = MuseumEngine(workers=8)
+    outcomes = engine.images([{'id': 1, 'title': '빗살무늬토기', 'inventory': '암사123'}])
+
+speculative=k 를 주면 검색 직후 상위 k개 후보의 상세를 동시에 받아, 1위 후보에 이미지가 없을 때
+다시 검색·조회하지 않고 이미지가 있는 다음 후보를 바로 쓴다 (낭비되는 호출 수는 speculative_budget 로 제한).
+
+images / update 에 작품 목록 대신 museum_priority.PriorityScheduler 를 넘기면 대표 작품, 국보·보물,
+오래된 작품 순으로 파이프라인에 들어가고 last_stats['priority'] 에 등급별 완료 수가 남는다.
+
+소장품번호가 많을 때는 resolve_batch 가 소장 구분(본관, 신수, 부여 …)별로 큰 목록 페이지를 받아
+원하는 번호 전체와 한 번에 맞추고, 남은 작품만 하나씩 검색한다.
+
+명령줄에서는 museum_harvest.py 의 하위 명령(resolve, fetch, images, update, export)으로 쓴다.
+"""
+
+import csv
+import itertools
+import json
+import logging
+import math
+import os
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from museum_codes import CodeTables, build_query, filter_items
+from museum_match import MIN_SCORE, CandidateIndex, Match, inventory_prefix, split_inventory
+from museum_pipeline import Pipeline, Stage, StageFailure
+from museum_priority import PriorityScheduler
+from museum_records import ImageRef, Relic, artworks_to_json
+from museum_resolution import FAILURE_DETAIL_FAILED, FAILURE_NO_IMAGE, FAILURE_NOT_FOUND, ResolutionCache
+from museum_retry import CircuitOpenError
+from museum_sync import SyncState
+from museum_transport import TRANSPORT_HTTP1, transport_stats
+from update_artworks import DEFAULT_PAGE_SIZE, MuseumAPIClient, apply_api_detail, extract_page, update_artwork
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+SEARCH_SIZE = 10
+
+# 일괄 확인: 같은 소장 구분에서 이만큼 이상 찾을 때만 목록을 통째로 받는다
+BATCH_PAGE_SIZE = DEFAULT_PAGE_SIZE
+BATCH_MAX_PAGES = 20
+BATCH_MIN_GROUP = 2
+# 우선순위 스케줄러에서 한 번에 꺼내 일괄 확인할 작품 수 (작을수록 time_budget 이 정확하고,
+# 묶음마다 다시 받는 소장 구분 목록은 클라이언트 메모가 재사용한다)
+SCHEDULED_BATCH_SIZE = 50
+
+# 추측 상세 조회: 엔진 하나가 쓸 수 있는 추가 상세 호출 수 (취소된 요청은 돌려받음)
+SPECULATIVE_BUDGET = 50
+
+# 파이프라인 안에서만 쓰고 결과에서는 빼는 키
+_INTERNAL_KEYS = ('item', 'candidates')
+
+# images 결과의 status (실패 status 는 확인 결과 저장소의 실패 이유와 같다)
+STATUS_SUCCESS = 'success'
+STATUS_NO_IMAGE = FAILURE_NO_IMAGE
+STATUS_NOT_FOUND = FAILURE_NOT_FOUND
+STATUS_DETAIL_FAILED = FAILURE_DETAIL_FAILED
+# 단계 함수가 예외를 낸 작업 (확인 결과 저장소에 기록하지 않는다)
+STATUS_ERROR = 'error'
+
+
+def make_target(artwork: Dict[str, Any]) -> Dict[str, Any]:
+    """artworks.json 항목 → 엔진 작업 대상 {'id', 'title', 'inventory', 'museum', 'featured', 'culturalProperty'}
+
+    featured, culturalProperty 는 우선순위 스케줄러가 작업의 등급을 가리는 데 쓴다.
+    """
+    return {
+        'id': artwork.get('id'),
+        'title': artwork.get('title', ''),
+        'inventory': artwork.get('inventoryNumber') or artwork.get('inventory') or '',
+        'museum': artwork.get('museum') or '',
+        'featured': bool(artwork.get('featured')),
+        'culturalProperty': artwork.get('culturalProperty') or '',
+    }
+
+
+def summarize_detail(relic: Relic) -> Dict[str, Any]:
+    """상세 정보 요약 (대표 이미지는 원본 > 중형 > 소형 썸네일 순)"""
+    images = relic.images or ()
+    return {
+        'name': relic.name or '',
+        'collection': relic.collection or '',
+        'era': relic.era or '',
+        'material': relic.material or '',
+        'size': relic.size or '',
+        'description': relic.description or '',
+        'designation': relic.designation or '',
+        'imageUrl': relic.best_image_url(),
+        'imageCount': len(images),
+        'allImages': [image.to_dict() if isinstance(image, ImageRef) else image for image in images],
+    }
+
+
+class MuseumEngine:
+    """공유 클라이언트 + 단계별 동시 처리"""
+
+    def __init__(
+        self,
+        client: Optional[MuseumAPIClient] = None,
+        workers: int = DEFAULT_WORKERS,
+        resolutions: Optional[ResolutionCache] = None,
+        codes: Optional[CodeTables] = None,
+        speculative: int = 0,
+        speculative_budget: int = SPECULATIVE_BUDGET,
+    ):
+        self.client = client or MuseumAPIClient()
+        self.workers = max(1, workers)
+        # 지난 실행에서 확인한 유물 ID (있으면 relic/list 검색을 건너뜀)
+        self.resolutions = resolutions
+        # 박물관·시대·재질 조건을 서버 파라미터로 바꿀 코드표
+        self.codes = codes
+        # 상세를 미리 받아 둘 상위 후보 수 (1 이하면 끔)
+        self.speculative = speculative
+        self.speculative_budget = speculative_budget
+        self.speculation = {'launched': 0, 'cancelled': 0, 'wasted': 0, 'promoted': 0, 'over_budget': 0}
+        self._speculation_lock = threading.Lock()
+        self._speculation_pool: Optional[ThreadPoolExecutor] = None
+        self.last_stats: Dict[str, Any] = {}
+
+    def close(self) -> None:
+        if self._speculation_pool is not None:
+            self._speculation_pool.shutdown(wait=False, cancel_futures=True)
+        self.client.close()
+
+    def __enter__(self) -> 'MuseumEngine':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _run(self, stages: List[Stage], source: Iterable[Any], scheduler: Optional[PriorityScheduler] = None) -> List[Any]:
+        if scheduler is not None:
+            # 첫 단계 앞 큐를 작게 두어야 큐에서 꺼내는 시점이 실제 처리 시점에 가깝다 (time_budget, 우선순위)
+            stages[0].queue_size = min(stages[0].queue_size, stages[0].workers)
+        pipeline = Pipeline(stages)
+        try:
+            results = pipeline.run(source)
+            if scheduler is not None:
+                # 마지막 단계 앞에서 실패한 작업은 track() 으로 감싼 단계를 거치지 않으므로 여기서 센다
+                for result in results:
+                    if isinstance(result, StageFailure) and result.stage != stages[-1].name:
+                        scheduler.complete(result.item, False)
+            return results
+        finally:
+            self.last_stats = pipeline.stats()
+            if scheduler is not None:
+                self.last_stats['priority'] = scheduler.stats()
+            if self.resolutions is not None:
+                self.resolutions.save()
+                self.last_stats['resolutions'] = self.resolutions.stats()
+            transport = transport_stats(self.client.session)
+            if transport['transport'] != TRANSPORT_HTTP1:
+                self.last_stats['transport'] = transport
+            if self.client.hedger is not None:
+                self.last_stats['hedge'] = self.client.hedger.stats()
+            if self.client.controller is not None:
+                self.last_stats['concurrency'] = self.client.controller.metrics()
+            if self.speculative > 1:
+                self.last_stats['speculative'] = dict(self.speculation, budget=self.speculative_budget)
+
+    @staticmethod
+    def _failed_job(result: Any) -> Any:
+        """StageFailure 를 그 작업의 오류 결과로 (다른 결과는 그대로)"""
+        if not isinstance(result, StageFailure):
+            return result
+        job = result.item if isinstance(result.item, dict) else {}
+        job = {key: value for key, value in job.items() if key not in _INTERNAL_KEYS and key != 'relic'}
+        return dict(job, error=f"{result.stage} 단계 오류: {result.error}", status=STATUS_ERROR)
+
+    # ── 단일 작업 ──────────────────────────────────────────────
+
+    def search(self, query: Dict[str, Any], size: int = SEARCH_SIZE) -> List[Dict[str, Any]]:
+        """relic/list 검색 결과 항목 목록"""
+        _, items = extract_page(self.client.list_relics(query, size=size))
+        return items
+
+    def query(self, filters: Dict[str, Any], size: int = SEARCH_SIZE, page: int = 1) -> List[Dict[str, Any]]:
+        """작품 필터(title, inventory, museum, era, material)로 검색
+
+        코드표로 바꿀 수 있는 조건은 서버에 넘기고, 바꾸지 못한 조건만 받은 항목에서 거른다.
+        """
+        if self.codes is not None:
+            self.codes.refresh(self.client)
+        params, leftover = build_query(filters, self.codes)
+        _, items = extract_page(self.client.list_relics(params, page=page, size=size))
+        return filter_items(items, leftover) if leftover else items
+
+    def resolve(self, target: Dict[str, Any]) -> Dict[str, Any]:
+        """작업 대상의 유물 ID 확인
+
+        저장된 확인 결과가 있으면 그대로 쓰고(matched_by='cache'), 찾지 못했던 기록이 있으면
+        만료될 때까지 검색하지 않는다(skipped=True). 둘 다 없으면
+        소장품번호가 있을 때 manageNo 로 먼저 찾고, 없거나 맞는 후보가 없으면 작품명으로 검색한다.
+        결과에는 relic_id, matched_by, score, item(목록 항목)이 붙고 실패하면 error 가 붙는다.
+        """
+        return self._cached_resolution(target) or self._remember(target, self._search_relic(target))
+
+    def _cached_resolution(self, target: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.resolutions is None:
+            return None
+        record = self.resolutions.get(target)
+        if record is not None:
+            return dict(target, relic_id=record['relicId'], matched_by='cache', score=record['confidence'])
+        if self.resolutions.get_failure(target, (STATUS_NOT_FOUND,)) is not None:
+            return dict(target, error='검색 결과 없음 (기록된 실패)', status=STATUS_NOT_FOUND, skipped=True)
+        return None
+
+    def _remember(self, target: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
+        if self.resolutions is not None:
+            if 'relic_id' in job:
+                self.resolutions.put(target, job['relic_id'], job['score'], job['matched_by'])
+            elif not job.get('request_failed'):
+                # 요청이 실패한 경우는 결과 0건이 아니므로 기록하지 않고 다음 실행에서 다시 검색한다
+                self.resolutions.put_failure(target, STATUS_NOT_FOUND)
+        return job
+
+    def _search_relic(self, target: Dict[str, Any]) -> Dict[str, Any]:
+        queries = []
+        if split_inventory(target.get('inventory')):
+            queries.append({'inventory': target['inventory']})
+        if target.get('title'):
+            queries.append({'title': target['title']})
+        request_failed = False
+        for query in queries:
+            params, _ = build_query(query)
+            data = self.client.list_relics(params, size=SEARCH_SIZE)
+            if data is None:
+                request_failed = True
+                continue
+            job = self._pick(target, extract_page(data)[1])
+            if job is not None:
+                return job
+        if request_failed:
+            return dict(target, error='검색 요청 실패', status=STATUS_NOT_FOUND, request_failed=True)
+        return dict(target, error='검색 결과 없음', status=STATUS_NOT_FOUND)
+
+    def _pick(self, target: Dict[str, Any], items: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """검색 결과에서 1위 후보를 골라 작업으로 (추측 조회를 켜면 같은 방법으로 맞은 차순위 후보도 붙인다)"""
+        if not items:
+            return None
+        matches = CandidateIndex(items).match(target, k=max(1, self.speculative))
+        # 1위(소장품번호 일치가 있으면 그 후보)가 점수 미달이면 이름만 같은 차순위로 넘어가지 않는다
+        if not matches or matches[0].score < MIN_SCORE or not matches[0].item.get('id'):
+            return None
+        best = matches[0]
+        job = dict(target, relic_id=best.item['id'], matched_by=best.matched_by, score=best.score, item=best.item)
+        # 소장품번호로 찾았으면 다른 번호의 같은 이름 유물로 넘어가지 않는다
+        candidates = [best] + [
+            match for match in matches[1:]
+            if match.matched_by == best.matched_by and match.score >= MIN_SCORE and match.item.get('id')
+        ]
+        if len(candidates) > 1:
+            job['candidates'] = candidates
+        return job
+
+    def fetch(self, relic_id: str, item: Optional[Dict[str, Any]] = None) -> Optional[Relic]:
+        """상세 정보를 Relic 레코드로 (목록 항목이 있으면 합친다)"""
+        return self._fetch_detail(relic_id, item)[0]
+
+    def _fetch_detail(self, relic_id: str, item: Optional[Dict[str, Any]] = None) -> Tuple[Optional[Relic], bool]:
+        """(Relic, 요청 실패 여부). 응답은 왔지만 항목이 없으면 (None, False)"""
+        data = self.client.get_relic_detail(str(relic_id))
+        if data is None:
+            return None, True
+        _, items = extract_page(data)
+        if not items:
+            return None, False
+        return Relic.from_dict(dict(item or {}, **items[0])), False
+
+    # ── 파이프라인 단계 ────────────────────────────────────────
+
+    def _record_failure(self, job: Dict[str, Any], reason: str) -> None:
+        if self.resolutions is not None:
+            self.resolutions.put_failure(job, reason, job.get('relic_id'))
+
+    def _known_failure(self, target: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        # 상세 정보·이미지가 없던 유물은 기록이 만료될 때까지 다시 조회하지 않는다
+        if self.resolutions is None:
+            return None
+        failure = self.resolutions.get_failure(target, (STATUS_DETAIL_FAILED, STATUS_NO_IMAGE))
+        if failure is None:
+            return None
+        error = '상세 정보 조회 실패' if failure['reason'] == STATUS_DETAIL_FAILED else '이미지 없음'
+        return dict(target, relic_id=failure['relicId'], error=f"{error} (기록된 실패)",
+                    status=failure['reason'], skipped=True)
+
+    def _resolve_stage(self, target: Dict[str, Any]) -> Dict[str, Any]:
+        job = self._known_failure(target) or self.resolve(target)
+        if 'error' in job and not job.get('skipped'):
+            print(f"  ✗ {job['error']}: {target.get('title') or target.get('inventory')}")
+        return job
+
+    def _reserve_speculation(self, wanted: int) -> int:
+        with self._speculation_lock:
+            granted = max(0, min(wanted, self.speculative_budget - self.speculation['launched']))
+            self.speculation['launched'] += granted
+            if granted < wanted:
+                self.speculation['over_budget'] += 1
+            return granted
+
+    def _fetch_speculative(self, job: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Relic], bool]:
+        """상위 후보의 상세를 동시에 받아 이미지가 있는 가장 높은 순위 후보를 고른다
+
+        순위대로 결과를 기다리다 이미지가 있는 후보가 나오면 그보다 낮은 후보 중 아직 보내지 않은
+        요청은 취소한다. 이미지가 있는 후보가 없으면 상세를 받은 가장 높은 순위 후보를 쓴다.
+        (작업, Relic, 요청 실패 여부)를 돌려준다.
+        """
+        candidates: List[Match] = job['candidates']
+        candidates = candidates[:1 + self._reserve_speculation(len(candidates) - 1)]
+        if len(candidates) == 1:
+            relic, request_failed = self._fetch_detail(job['relic_id'], job.get('item'))
+            return job, relic, request_failed
+        if self._speculation_pool is None:
+            with self._speculation_lock:
+                if self._speculation_pool is None:
+                    self._speculation_pool = ThreadPoolExecutor(max_workers=self.workers * self.speculative)
+        futures = [self._speculation_pool.submit(self._fetch_detail, match.item['id'], match.item) for match in candidates]
+        chosen: Optional[Tuple[int, Relic]] = None
+        request_failed = False
+        try:
+            for rank, future in enumerate(futures):
+                relic, failed = future.result()
+                request_failed = request_failed or failed
+                if relic is None:
+                    continue
+                if chosen is None or relic.images:
+                    chosen = (rank, relic)
+                if relic.images:
+                    break
+        finally:
+            cancelled = sum(1 for future in futures if future.cancel())
+            with self._speculation_lock:
+                self.speculation['launched'] -= cancelled   # 보내지 않은 요청은 예산에서 빼지 않는다
+                self.speculation['cancelled'] += cancelled
+                # 쓴 후보 하나를 뺀 나머지가 낭비 (쓸 후보가 없었으면 보낸 요청 전부)
+                self.speculation['wasted'] += len(futures) - cancelled - (chosen is not None)
+        if chosen is None:
+            return job, None, request_failed
+        rank, relic = chosen
+        if rank > 0:
+            winner = candidates[rank]
+            with self._speculation_lock:
+                self.speculation['promoted'] += 1
+            job = self._remember(job, dict(
+                job, relic_id=winner.item['id'], matched_by=winner.matched_by, score=winner.score, item=winner.item,
+            ))
+        return job, relic, False
+
+    def _detail_stage(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        if 'error' in job:
+            return job
+        if job.get('candidates'):
+            job, relic, request_failed = self._fetch_speculative(job)
+        else:
+            relic, request_failed = self._fetch_detail(job['relic_id'], job.get('item'))
+        if relic is None and request_failed:
+            # 요청 실패(응답 없음·5xx)는 상세가 없는 것과 다르므로 실패 기록을 남기지 않는다
+            print(f"  ✗ 상세 정보 요청 실패: {job.get('title') or job['relic_id']}")
+            return dict(job, error='상세 정보 요청 실패', status=STATUS_DETAIL_FAILED, request_failed=True)
+        if relic is None:
+            print(f"  ✗ 상세 정보 조회 실패: {job.get('title') or job['relic_id']}")
+            self._record_failure(job, STATUS_DETAIL_FAILED)
+            return dict(job, error='상세 정보 조회 실패', status=STATUS_DETAIL_FAILED)
+        return dict(job, relic=relic)
+
+    def _image_stage(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        job = {key: value for key, value in job.items() if key not in _INTERNAL_KEYS}
+        relic = job.pop('relic', None)
+        if relic is None:
+            return job
+        api_data = summarize_detail(relic)
+        if api_data['imageUrl']:
+            print(f"  ✓ {job.get('title') or relic.name} → {api_data['imageUrl'][:80]}")
+            if self.resolutions is not None:
+                self.resolutions.clear_failure(job)
+            return dict(job, status=STATUS_SUCCESS, api_data=api_data)
+        print(f"  △ 상세 정보는 있으나 이미지 없음: {job.get('title') or relic.name}")
+        self._record_failure(job, STATUS_NO_IMAGE)
+        return dict(job, status=STATUS_NO_IMAGE, error='이미지 없음', api_data=api_data)
+
+    # ── 일괄 작업 ──────────────────────────────────────────────
+
+    def _list_group(self, prefix: str, page_size: int, max_pages: int) -> Optional[List[Dict[str, Any]]]:
+        """manageNo=prefix 목록 전체 (max_pages 를 넘으면 None)"""
+        total, items = extract_page(self.client.list_relics({'manageNo': prefix}, page=1, size=page_size))
+        if not items or total <= len(items):
+            return items
+        # 서버가 페이지 크기를 줄여 줄 수 있으므로 실제로 받은 건수로 페이지 수를 계산한다
+        pages = math.ceil(total / len(items))
+        if pages > max_pages:
+            logger.info(f"{prefix}: {total}건({pages}페이지)은 너무 많아 개별 검색으로 넘김")
+            return None
+        size = len(items)
+        items = list(items)   # 첫 페이지 목록은 메모에 들어 있는 객체이므로 복사해서 늘린다
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            rest = executor.map(
+                lambda page: extract_page(self.client.list_relics({'manageNo': prefix}, page=page, size=size))[1],
+                range(2, pages + 1),
+            )
+            for page_items in rest:
+                items.extend(page_items)
+        return items
+
+    def resolve_batch(
+        self,
+        targets: Iterable[Dict[str, Any]],
+        page_size: int = BATCH_PAGE_SIZE,
+        max_pages: int = BATCH_MAX_PAGES,
+    ) -> List[Dict[str, Any]]:
+        """소장 구분별 목록을 받아 소장품번호를 한 번에 맞추는 일괄 확인 (입력 순서 유지)
+
+        저장된 확인 결과를 먼저 쓰고, 남은 작품을 소장품번호 접두어(본관, 신수 …)로 묶는다.
+        BATCH_MIN_GROUP 개 이상인 묶음은 manageNo=접두어 목록을 최대 max_pages 페이지까지 받아
+        CandidateIndex 로 소장품번호가 일치하는 후보를 고른다. 번호로 찾지 못한 작품,
+        번호가 없는 작품, 목록이 너무 큰 묶음만 resolve 로 하나씩 검색한다.
+        결과는 resolve 와 같은 형태이고 last_stats['batch'] 에 묶음·페이지·일치 수가 남는다.
+        """
+        targets = list(targets)
+        jobs: List[Optional[Dict[str, Any]]] = [self._cached_resolution(target) for target in targets]
+        groups: Dict[str, List[int]] = defaultdict(list)
+        for i, target in enumerate(targets):
+            inventories = split_inventory(target.get('inventory'))
+            if jobs[i] is None and inventories:
+                groups[inventory_prefix(inventories[0])].append(i)
+
+        batch = {'groups': 0, 'listed': 0, 'joined': 0, 'leftovers': 0}
+        for prefix, members in groups.items():
+            if not prefix or len(members) < BATCH_MIN_GROUP:
+                continue
+            items = self._list_group(prefix, page_size, max_pages)
+            if items is None:
+                continue
+            batch['groups'] += 1
+            batch['listed'] += len(items)
+            index = CandidateIndex(items)
+            for i in members:
+                match = index.best(targets[i])
+                if match is not None and match.matched_by == 'inventory' and match.item.get('id'):
+                    jobs[i] = self._remember(targets[i], dict(
+                        targets[i], relic_id=match.item['id'], matched_by=match.matched_by,
+                        score=match.score, item=match.item,
+                    ))
+                    batch['joined'] += 1
+
+        leftovers = [i for i, job in enumerate(jobs) if job is None]
+        batch['leftovers'] = len(leftovers)
+        searched = self._run(
+            [Stage('resolve', lambda target: self._remember(target, self._search_relic(target)), workers=self.workers)],
+            [targets[i] for i in leftovers],
+        )
+        for i, job in zip(leftovers, searched):
+            jobs[i] = self._failed_job(job)
+        self.last_stats['batch'] = batch
+        return jobs
+
+    def resolve_all(self, targets: Iterable[Dict[str, Any]], batch: bool = False) -> List[Dict[str, Any]]:
+        """작업 대상마다 유물 ID 확인 (입력 순서 유지, batch=True 면 resolve_batch)"""
+        if batch:
+            jobs = self.resolve_batch(targets)
+        else:
+            jobs = [self._failed_job(job) for job in self._run([Stage('resolve', self._resolve_stage, workers=self.workers)], targets)]
+        return [{key: value for key, value in job.items() if key not in _INTERNAL_KEYS} for job in jobs]
+
+    def fetch_all(self, relic_ids: Iterable[str]) -> List[Relic]:
+        """유물 ID 목록의 상세 정보 (실패한 ID 는 빠짐)"""
+        relics = self._run([Stage('detail', self.fetch, workers=self.workers)], relic_ids)
+        return [relic for relic in relics if not isinstance(relic, StageFailure)]
+
+    def images(self, targets: Iterable[Dict[str, Any]], batch: bool = False) -> List[Dict[str, Any]]:
+        """ID 확인 → 상세 조회 → 대표 이미지 선택. 실패도 status/error 와 함께 돌려준다 (입력 순서 유지)
+
+        단계 함수가 예외를 낸 작업은 status=STATUS_ERROR 로 남는다.
+
+        batch=True 면 ID 확인을 resolve_batch 로 먼저 끝내고 상세 조회를 이어서 한다.
+        targets 가 PriorityScheduler 면 이미지를 고른 작업을 등급별 완료로 센다.
+        """
+        scheduler = targets if isinstance(targets, PriorityScheduler) else None
+        image_stage = self._image_stage
+        if scheduler is not None:
+            image_stage = scheduler.track(image_stage, ok=lambda outcome: 'error' not in outcome)
+        if not batch:
+            outcomes = self._run([
+                Stage('resolve', self._resolve_stage, workers=self.workers),
+                Stage('detail', self._detail_stage, workers=self.workers),
+                Stage('image', image_stage),
+            ], targets, scheduler)
+            return [self._failed_job(outcome) for outcome in outcomes]
+
+        batch_stats: Dict[str, int] = defaultdict(int)
+        if scheduler is not None:
+            # 큐를 한꺼번에 비우면 우선순위와 time_budget 이 의미가 없으므로 한 묶음씩 꺼내 확인한다
+            jobs: Iterable[Dict[str, Any]] = self._iter_scheduled_batches(scheduler, batch_stats)
+        else:
+            jobs = self._resolve_known_batch(list(targets), batch_stats)
+        outcomes = self._run([
+            Stage('detail', self._detail_stage, workers=self.workers),
+            Stage('image', image_stage),
+        ], jobs, scheduler)
+        self.last_stats['batch'] = dict(batch_stats)
+        return [self._failed_job(outcome) for outcome in outcomes]
+
+    def _resolve_known_batch(self, targets: List[Dict[str, Any]], batch_stats: Dict[str, int]) -> List[Dict[str, Any]]:
+        """기록된 실패는 건너뛰고 나머지를 resolve_batch 로 확인 (입력 순서 유지, 묶음 통계는 batch_stats 에 더함)"""
+        jobs = [self._known_failure(target) for target in targets]
+        pending = [i for i, job in enumerate(jobs) if job is None]
+        for i, job in zip(pending, self.resolve_batch([targets[i] for i in pending])):
+            if 'error' in job and not job.get('skipped'):
+                print(f"  ✗ {job['error']}: {job.get('title') or job.get('inventory')}")
+            jobs[i] = job
+        for key, value in self.last_stats.get('batch', {}).items():
+            batch_stats[key] += value
+        return jobs
+
+    def _iter_scheduled_batches(self, scheduler: PriorityScheduler, batch_stats: Dict[str, int]) -> Iterator[Dict[str, Any]]:
+        """스케줄러에서 SCHEDULED_BATCH_SIZE 개씩 꺼내 일괄 확인한 작업 (limit/time_budget 에 걸리면 멈춤)"""
+        while True:
+            chunk = list(itertools.islice(scheduler, SCHEDULED_BATCH_SIZE))
+            if not chunk:
+                return
+            yield from self._resolve_known_batch(chunk, batch_stats)
+
+    def update(self, artworks: Iterable[Any], sync_state: Optional[SyncState] = None) -> int:
+        """작품 데이터를 API 정보로 갱신하고 바뀐 작품 수를 반환 (artworks 는 제자리에서 수정)
+
+        sync_state 가 있으면 목록 지문 비교가 필요하므로 변경분 동기화 경로로,
+        없으면 resolve(저장된 확인 결과 우선) → 상세 조회로 갱신한다.
+        artworks 가 PriorityScheduler 면 예외 없이 끝난 작품을 등급별 완료로 센다.
+        sync_state 는 저장하지 않으므로 artworks.json 을 쓴 뒤 호출자가 save() 한다.
+        서킷 브레이커가 열려 중간에 멈춰도 그때까지 바뀐 작품 수를 돌려준다
+        (last_stats['update'] 에 changed / interrupted).
+        """
+        # 파이프라인이 예외로 끝나면 결과 목록을 받지 못하므로 바뀐 작품 수는 단계 안에서 센다
+        counts = {'changed': 0}
+        lock = threading.Lock()
+
+        def update_stage(artwork: Any) -> Optional[bool]:
+            print(f"작품 업데이트 중: {artwork.get('title', '제목 없음')}")
+            if sync_state is not None:
+                changed = update_artwork(artwork, self.client, sync_state)
+            else:
+                job = self.resolve(make_target(artwork))
+                if 'error' in job:
+                    print(f"  {job['error']}: {artwork.get('title', '제목 없음')}")
+                    return None
+                changed = apply_api_detail(artwork, self.client.get_relic_detail(str(job['relic_id'])))
+            if changed:
+                with lock:
+                    counts['changed'] += 1
+            return changed
+
+        interrupted = False
+        try:
+            scheduler = artworks if isinstance(artworks, PriorityScheduler) else None
+            stage = scheduler.track(update_stage) if scheduler is not None else update_stage
+            self._run([Stage('update', stage, workers=self.workers)], artworks, scheduler)
+        except CircuitOpenError as e:
+            interrupted = True
+            print(f"  {e} - 이번 실행의 나머지 작품은 건너뜁니다 (그때까지 {counts['changed']}개 갱신).")
+        self.last_stats['update'] = dict(counts, interrupted=interrupted)
+        return counts['changed']
+
+
+# ── 입출력 ─────────────────────────────────────────────────────
+
+def load_records(path: str) -> List[Dict[str, Any]]:
+    """JSON(목록 또는 images 결과) / JSONL 파일을 dict 목록으로 읽는다"""
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        data = json.load(f)
+    if isinstance(data, dict):
+        # final_image_fetcher 형식 {'successful': [...], 'failed': [...]}
+        return list(data.get('successful', [])) + list(data.get('failed', []))
+    return data
+
+
+def _flatten(record: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+    """CSV 용: 중첩 dict 는 a.b 열로 펼치고 목록은 JSON 문자열로"""
+    flat: Dict[str, Any] = {}
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (list, tuple)):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+def export_records(records: Iterable[Any], path: str, fields: Optional[List[str]] = None) -> int:
+    """레코드를 확장자(.json / .jsonl / .csv)에 맞춰 저장하고 건수를 반환"""
+    rows = artworks_to_json(records)
+    if fields:
+        rows = [{field: row.get(field) for field in fields} for row in rows]
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    if path.endswith('.csv'):
+        flat = [_flatten(row) for row in rows]
+        columns: List[str] = list(fields or [])
+        if not columns:
+            for row in flat:
+                columns.extend(key for key in row if key not in columns)
+        with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(flat)
+    elif path.endswith('.jsonl'):
+        with open(path, 'w', encoding='utf-8') as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+    return len(rows)
+
+
+def iter_relic_ids(records: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """resolve 결과나 harvest 결과에서 유물 ID 를 뽑는다"""
+    for record in records:
+        relic_id = record.get('relic_id') or record.get('id')
+        if relic_id and 'error' not in record:
+            yield str(relic_id)
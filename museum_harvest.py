@@ -0,0 +1,650 @@
+"""
+국립박물관 Open API 전체 소장품 수집 (harvest)
+
+relic/list 를 처음부터 끝까지 넘기며 유물마다 relic/detail 을 받아
+JSONL 파일에 한 줄씩 바로 기록한다. 몇 시간짜리 수집이 중간에 죽어도
+체크포인트(다음 페이지 커서 + 현재 페이지에서 끝난 ID + 출력 파일 오프셋)에서
+정확히 이어서 진행할 수 있다.
+
+    python museum_harvest.py harvest --all
+    python museum_harvest.py harvest --all --resume      # 중단된 지점부터
+    python museum_harvest.py harvest --query 백자 --max-items 500
+    python museum_harvest.py harvest --museum 국립중앙박물관 --era 고려 --material 청동   # 코드표로 서버에서 거름
+
+체크포인트는 페이지가 끝날 때마다, 그리고 --checkpoint-every 건마다 원자적으로 저장한다.
+마지막 체크포인트 뒤에 기록된 줄은 재개 시 잘라내고 다시 받으므로 중복이나 누락이 없다.
+
+작품 단위 작업도 같은 명령에서 수집 엔진(museum_engine.py)으로 처리한다.
+
+    python museum_harvest.py resolve 암사123 본관11377      # 소장품번호 → 유물 ID
+    python museum_harvest.py resolve --batch               # 소장 구분별 목록을 받아 한 번에 맞춤
+    python museum_harvest.py images --limit 20             # artworks.json 작품의 대표 이미지
+    python museum_harvest.py images --speculative 3        # 상위 3개 후보 상세를 미리 받아 둠
+    python museum_harvest.py fetch --input harvest/resolved.json
+    python museum_harvest.py update --delta                # artworks.json 갱신
+    python museum_harvest.py update --time-budget 600      # 대표 작품·국보·보물부터 10분 동안만
+    python museum_harvest.py export harvest/relics.jsonl --output harvest/relics.csv
+    python museum_harvest.py match --relics harvest/relics.jsonl   # 수집 결과와 작품 일괄 매칭 (API 호출 없음)
+    python museum_harvest.py codes --refresh               # code/list 코드표 로컬 사본 갱신
+
+images, update 는 대표 작품(featured) → 국보·보물 → 오래 갱신하지 않은 작품 순으로 처리하고
+등급별 완료 수를 알려 준다 (--no-priority 면 파일 순서).
+
+모든 하위 명령이 같은 클라이언트 설정(--workers, --rate, --burst, --no-cache, --transport, --adaptive, --hedge)을 쓴다.
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+from museum_codes import DEFAULT_CODE_PATH, CodeTables, build_query
+from museum_concurrency import AIMDController
+from museum_engine import (
+    DEFAULT_WORKERS,
+    SPECULATIVE_BUDGET,
+    MuseumEngine,
+    export_records,
+    iter_relic_ids,
+    load_records,
+    make_target,
+)
+from museum_hedge import DEFAULT_HEDGE_RATIO, Hedger
+from museum_match import MIN_SCORE, CandidateIndex
+from museum_priority import PriorityScheduler, format_priority_stats, make_priority
+from museum_rate_limit import DEFAULT_BURST, TokenBucket
+from museum_records import Relic
+from museum_resolution import (
+    DEFAULT_RESOLUTION_PATH,
+    FAILURE_DETAIL_FAILED,
+    FAILURE_NO_IMAGE,
+    FAILURE_NOT_FOUND,
+    ResolutionCache,
+)
+from museum_retry import CircuitOpenError
+from museum_sync import DEFAULT_SYNC_STATE_PATH, SyncState, artwork_key
+from museum_transport import TRANSPORTS
+from update_artworks import (
+    ARTWORKS_JSON_PATH,
+    DEFAULT_PAGE_SIZE,
+    MuseumAPIClient,
+    RelicPage,
+    RelicPageError,
+    build_list_params,
+    extract_page,
+    next_relic_page,
+    read_artworks_from_json,
+    write_artworks_to_json,
+)
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+DEFAULT_OUTPUT_PATH = 'harvest/relics.jsonl'
+DEFAULT_CHECKPOINT_EVERY = 50
+DEFAULT_RESOLVED_PATH = 'harvest/resolved.json'
+DEFAULT_DETAILS_PATH = 'harvest/details.jsonl'
+DEFAULT_IMAGES_PATH = 'harvest/images.json'
+DEFAULT_MATCHES_PATH = 'harvest/matches.json'
+
+
+def checkpoint_path_for(output_path: str) -> str:
+    return f"{output_path}.checkpoint.json"
+
+
+class HarvestCheckpoint:
+    """수집 진행 상태
+
+    next_page 는 아직 끝나지 않은 페이지 번호, next_size 는 그 페이지를 요청할 numOfRows
+    (서버가 page_size 를 줄여 보냈으면 줄어든 크기)이고, page_done_ids 는 그 페이지에서
+    이미 기록한 유물 ID 이다. output_offset 은 체크포인트 시점의 출력 파일 크기,
+    total 은 마지막으로 받은 totalCount.
+    """
+
+    def __init__(self, path: str, query: Dict[str, Any], page_size: int):
+        self.path = path
+        self.query = query
+        self.page_size = page_size
+        self.next_page = 1
+        self.next_size = page_size
+        self.total: Optional[int] = None
+        self.page_done_ids: Set[str] = set()
+        self.output_offset = 0
+        self.written = 0
+        self.failed_ids: List[str] = []
+        self.completed = False
+
+    @classmethod
+    def load(cls, path: str) -> 'HarvestCheckpoint':
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        checkpoint = cls(path, state['query'], state['page_size'])
+        checkpoint.next_page = state['next_page']
+        checkpoint.next_size = state.get('next_size', checkpoint.page_size)
+        checkpoint.total = state.get('total')
+        checkpoint.page_done_ids = set(state.get('page_done_ids', []))
+        checkpoint.output_offset = state['output_offset']
+        checkpoint.written = state.get('written', 0)
+        checkpoint.failed_ids = state.get('failed_ids', [])
+        checkpoint.completed = state.get('completed', False)
+        return checkpoint
+
+    def save(self) -> None:
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'query': self.query,
+            'page_size': self.page_size,
+            'next_page': self.next_page,
+            'next_size': self.next_size,
+            'total': self.total,
+            'page_done_ids': sorted(self.page_done_ids),
+            'output_offset': self.output_offset,
+            'written': self.written,
+            'failed_ids': self.failed_ids,
+            'completed': self.completed,
+            'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+class Harvester:
+    """relic/list → relic/detail → JSONL 스트리밍 수집기"""
+
+    def __init__(
+        self,
+        client: MuseumAPIClient,
+        output_path: str = DEFAULT_OUTPUT_PATH,
+        query: Optional[Dict[str, Any]] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        details: bool = True,
+        workers: int = 4,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        checkpoint_path: Optional[str] = None,
+        stream: bool = False,
+    ):
+        self.client = client
+        self.output_path = output_path
+        self.query = build_list_params(query)
+        self.page_size = page_size
+        self.details = details
+        self.workers = max(1, workers)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_path = checkpoint_path or checkpoint_path_for(output_path)
+        self.stream = stream
+
+    def _open_checkpoint(self, resume: bool) -> HarvestCheckpoint:
+        if resume and os.path.exists(self.checkpoint_path):
+            checkpoint = HarvestCheckpoint.load(self.checkpoint_path)
+            if checkpoint.query != self.query or checkpoint.page_size != self.page_size:
+                raise ValueError(
+                    f"체크포인트의 조건(query={checkpoint.query}, page_size={checkpoint.page_size})이 "
+                    f"현재 실행과 다릅니다. --resume 없이 새로 시작하세요."
+                )
+            return checkpoint
+        if os.path.exists(self.output_path) and os.path.getsize(self.output_path) > 0 and not resume:
+            raise FileExistsError(f"{self.output_path} 가 이미 있습니다. 이어서 받으려면 --resume 을 사용하세요.")
+        return HarvestCheckpoint(self.checkpoint_path, self.query, self.page_size)
+
+    def _fetch_detail(self, item: Dict[str, Any]) -> Optional[Relic]:
+        detail = self.client.get_relic_detail(str(item['id']))
+        _, items = extract_page(detail)
+        if not items:
+            return None
+        return Relic.from_dict(dict(item, **items[0]))
+
+    def _with_details(self, executor: ThreadPoolExecutor, items: List[Dict[str, Any]], checkpoint: HarvestCheckpoint) -> Iterator[Relic]:
+        """목록 순서를 유지하며 상세 정보를 합친 Relic 레코드를 돌려준다"""
+        if not self.details:
+            for item in items:
+                yield Relic.from_dict(item)
+            return
+        futures = [(item, executor.submit(self._fetch_detail, item)) for item in items]
+        try:
+            for item, future in futures:
+                record = future.result()
+                if record is None:
+                    logger.warning(f"상세 조회 실패, 목록 정보만 기록: {item['id']}")
+                    if str(item['id']) not in checkpoint.failed_ids:
+                        checkpoint.failed_ids.append(str(item['id']))
+                    record = Relic.from_dict(item)
+                yield record
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+    def _pages(self, checkpoint: HarvestCheckpoint) -> Iterator[RelicPage]:
+        """체크포인트의 다음 페이지부터 서버가 실제로 보낸 페이지 단위로"""
+        return self.client.iter_relic_pages(
+            self.query, page_size=checkpoint.next_size, start_page=checkpoint.next_page, stream=self.stream,
+        )
+
+    def run(self, resume: bool = False, max_items: Optional[int] = None) -> HarvestCheckpoint:
+        """수집 실행. max_items 는 이어받은 분량을 포함한 전체 기록 상한"""
+        checkpoint = self._open_checkpoint(resume)
+        if checkpoint.completed:
+            print(f"이미 완료된 수집입니다: {checkpoint.written}건 ({self.output_path})")
+            return checkpoint
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.output_path)), exist_ok=True)
+        if checkpoint.written:
+            print(f"{checkpoint.next_page} 페이지부터 이어서 수집합니다 (기록 {checkpoint.written}건)")
+
+        started = time.monotonic()
+        start_written = checkpoint.written
+        with open(self.output_path, 'ab') as out:
+            # 마지막 체크포인트 이후에 기록된 줄은 버리고 다시 받는다
+            out.truncate(checkpoint.output_offset)
+            out.seek(checkpoint.output_offset)
+
+            def commit() -> None:
+                out.flush()
+                os.fsync(out.fileno())
+                checkpoint.save()
+
+            executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='harvest-detail')
+            try:
+                since_commit = 0
+                for page in self._pages(checkpoint):
+                    checkpoint.total = page.total
+                    pending = [item for item in page.items if str(item['id']) not in checkpoint.page_done_ids]
+                    if max_items is not None:
+                        pending = pending[:max(0, max_items - checkpoint.written)]
+                    for relic in self._with_details(executor, pending, checkpoint):
+                        out.write(json.dumps(relic.to_dict(), ensure_ascii=False).encode('utf-8') + b'\n')
+                        # 줄 기록과 상태 갱신 사이에 중단되면 오프셋이 이전 값이라 그 줄은 재개 시 잘린다
+                        checkpoint.page_done_ids.add(str(relic.id))
+                        checkpoint.written += 1
+                        checkpoint.output_offset = out.tell()
+                        since_commit += 1
+                        if since_commit >= self.checkpoint_every:
+                            commit()
+                            since_commit = 0
+                    if max_items is not None and checkpoint.written >= max_items:
+                        break
+                    checkpoint.next_page, checkpoint.next_size = (
+                        next_relic_page(page.page, page.size, len(page.items), page.total) or (page.page + 1, page.size)
+                    )
+                    checkpoint.page_done_ids.clear()
+                    commit()
+                    since_commit = 0
+                    elapsed = time.monotonic() - started
+                    rate = (checkpoint.written - start_written) / elapsed if elapsed else 0.0
+                    window = f", 동시성 창 {self.client.controller.metrics()['window']}" if self.client.controller else ''
+                    print(f"  {page.page} 페이지 완료 - 누적 {checkpoint.written}건 ({rate:.1f}건/초{window})")
+                else:
+                    # 서버가 페이지를 덜 보내고 끝났으면 완료로 표시하지 않는다 (--resume 으로 다시 받음)
+                    checkpoint.completed = checkpoint.total is not None and checkpoint.written >= checkpoint.total
+                    if not checkpoint.completed:
+                        print(f"목록이 totalCount({checkpoint.total})보다 먼저 끝났습니다: {checkpoint.written}건 기록")
+            except (KeyboardInterrupt, CircuitOpenError, RelicPageError) as e:
+                commit()
+                reason = '사용자 중단' if isinstance(e, KeyboardInterrupt) else str(e)
+                print(f"수집 중단({reason}): {checkpoint.written}건 기록, --resume 으로 이어서 받을 수 있습니다.")
+                if isinstance(e, KeyboardInterrupt):
+                    raise
+                return checkpoint
+            finally:
+                executor.shutdown(wait=False, cancel_futures=True)
+            commit()
+
+        print(f"수집 {'완료' if checkpoint.completed else '일시 정지'}: {checkpoint.written}건 → {self.output_path}")
+        if checkpoint.failed_ids:
+            print(f"  상세 조회 실패 {len(checkpoint.failed_ids)}건 (목록 정보만 기록, 체크포인트의 failed_ids 참고)")
+        return checkpoint
+
+
+def harvest_query(args: argparse.Namespace, client: MuseumAPIClient) -> Any:
+    """--query 와 박물관·시대·재질 조건 → Harvester 검색 조건 (코드로 바꾸지 못하면 ValueError)"""
+    filters = {'museum': args.museum, 'era': args.era, 'material': args.material}
+    if not any(filters.values()):
+        return args.query
+    codes = CodeTables(args.codes)
+    codes.refresh(client)
+    params, leftover = build_query(dict(filters, title=args.query), codes)
+    if leftover:
+        raise ValueError(f"코드표에서 찾지 못한 조건: {leftover} (codes 명령으로 코드를 확인하세요)")
+    return params
+
+
+def cmd_harvest(args: argparse.Namespace) -> int:
+    if not args.all and not (args.query or args.museum or args.era or args.material):
+        print("--all 또는 --query/--museum/--era/--material 중 하나를 지정하세요.")
+        return 2
+    client = make_client(args)
+    try:
+        query = None if args.all else harvest_query(args, client)
+    except ValueError as e:
+        print(f"오류: {e}")
+        client.close()
+        return 2
+    harvester = Harvester(
+        client,
+        output_path=args.output,
+        query=query,
+        page_size=args.page_size,
+        details=not args.no_details,
+        workers=args.workers,
+        checkpoint_every=args.checkpoint_every,
+        stream=args.stream,
+    )
+    try:
+        checkpoint = harvester.run(resume=args.resume, max_items=args.max_items)
+    except (FileExistsError, ValueError) as e:
+        print(f"오류: {e}")
+        return 2
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if client.hedger is not None:
+            print(f"헤지 통계: {client.hedger.stats()}")
+        if client.controller is not None:
+            print(f"동시성 창: {client.controller.metrics()}")
+        client.close()
+    return 0 if checkpoint.completed or args.max_items else 1
+
+
+def make_client(args: argparse.Namespace) -> MuseumAPIClient:
+    """공통 옵션으로 클라이언트 생성 (--rate 가 없으면 실행 전체의 공유 토큰 버킷)"""
+    rate_limiter = TokenBucket(args.rate, args.burst) if args.rate else None
+    hedger = Hedger(max_ratio=args.hedge_ratio) if args.hedge else None
+    # --adaptive 면 --workers 를 상한으로 동시 요청 수를 AIMD 창으로 조절
+    controller = AIMDController(max_window=args.workers) if args.adaptive else None
+    return MuseumAPIClient(rate_limiter=rate_limiter, use_cache=not args.no_cache, hedger=hedger,
+                           transport=args.transport, controller=controller)
+
+
+def make_engine(args: argparse.Namespace) -> MuseumEngine:
+    """공통 옵션으로 엔진 생성 (resolve/images/update 는 저장된 유물 ID 확인 결과를 사용)"""
+    resolutions = None
+    if getattr(args, 'resolutions', None) and not args.no_resolutions:
+        resolutions = ResolutionCache(args.resolutions)
+        if args.retry_failures:
+            cleared = resolutions.clear_failures(None if args.retry_failures == 'all' else args.retry_failures)
+            print(f"기록된 실패 {cleared}건을 지우고 다시 시도합니다.")
+    return MuseumEngine(
+        make_client(args),
+        workers=args.workers,
+        resolutions=resolutions,
+        speculative=getattr(args, 'speculative', 0),
+        speculative_budget=getattr(args, 'speculative_budget', SPECULATIVE_BUDGET),
+    )
+
+
+def load_targets(args: argparse.Namespace, limit: bool = True) -> List[Dict[str, Any]]:
+    """명령줄의 소장품번호, 없으면 artworks.json 작품을 작업 대상으로 (limit=False 면 --limit 을 적용하지 않음)"""
+    if args.items:
+        targets = [{'id': None, 'title': '', 'inventory': item} for item in args.items]
+    else:
+        targets = [make_target(artwork) for artwork in read_artworks_from_json(args.artworks)]
+    return targets[:args.limit] if limit and args.limit else targets
+
+
+def schedule(args: argparse.Namespace, items: List[Any], last_refreshed: Optional[Callable[[Any], float]] = None) -> PriorityScheduler:
+    """작업을 우선순위 큐에 넣는다 (--limit 은 우선순위가 높은 것부터 센다, --no-priority 면 파일 순서)"""
+    priority = None if args.no_priority else make_priority(last_refreshed)
+    return PriorityScheduler(items, priority, limit=args.limit, time_budget=args.time_budget)
+
+
+def print_summary(outcomes: List[Dict[str, Any]], engine: MuseumEngine, output: str) -> None:
+    counts: Dict[str, int] = {}
+    for outcome in outcomes:
+        status = outcome.get('status', 'resolved' if 'error' not in outcome else 'failed')
+        counts[status] = counts.get(status, 0) + 1
+    print(f"처리 {len(outcomes)}건 {counts} → {output}")
+    skipped: Dict[str, int] = {}
+    for outcome in outcomes:
+        if outcome.get('skipped'):
+            skipped[outcome['status']] = skipped.get(outcome['status'], 0) + 1
+    if skipped:
+        print(f"기록된 실패로 건너뜀 {sum(skipped.values())}건 {skipped} (--retry-failures 로 다시 시도)")
+    print(f"파이프라인 통계: {engine.last_stats}")
+    print_priority(engine)
+
+
+def print_priority(engine: MuseumEngine) -> None:
+    if 'priority' in engine.last_stats:
+        print(f"우선순위 등급별 완료: {format_priority_stats(engine.last_stats['priority'])}")
+
+
+def cmd_resolve(args: argparse.Namespace) -> int:
+    with make_engine(args) as engine:
+        resolved = engine.resolve_all(load_targets(args), batch=args.batch)
+        export_records(resolved, args.output)
+        print_summary(resolved, engine, args.output)
+    return 0 if all('error' not in job for job in resolved) else 1
+
+
+def cmd_fetch(args: argparse.Namespace) -> int:
+    relic_ids = list(args.ids)
+    if args.input:
+        relic_ids.extend(iter_relic_ids(load_records(args.input)))
+    if not relic_ids:
+        print("유물 ID 또는 --input 을 지정하세요.")
+        return 2
+    with make_engine(args) as engine:
+        relics = engine.fetch_all(dict.fromkeys(relic_ids))
+        export_records(relics, args.output)
+        print(f"상세 정보 {len(relics)}/{len(set(relic_ids))}건 → {args.output}")
+        print(f"파이프라인 통계: {engine.last_stats}")
+    return 0 if len(relics) == len(set(relic_ids)) else 1
+
+
+def cmd_images(args: argparse.Namespace) -> int:
+    with make_engine(args) as engine:
+        resolutions = engine.resolutions
+        targets = schedule(args, load_targets(args, limit=False), resolutions.resolved_at if resolutions is not None else None)
+        outcomes = engine.images(targets, batch=args.batch)
+        export_records(outcomes, args.output)
+        print_summary(outcomes, engine, args.output)
+    return 0
+
+
+def cmd_update(args: argparse.Namespace) -> int:
+    artworks = read_artworks_from_json(args.artworks)
+    if not artworks:
+        print("작품 데이터를 읽지 못했습니다.")
+        return 2
+    sync_state = SyncState(args.sync_state) if args.delta else None
+    with make_engine(args) as engine:
+        # 마지막 갱신 시각: 변경분 동기화 상태, 없으면 유물 ID 확인 시각
+        last_refreshed = None
+        if sync_state is not None:
+            last_refreshed = lambda artwork: sync_state.synced_at(artwork_key(artwork))
+        elif engine.resolutions is not None:
+            last_refreshed = engine.resolutions.resolved_at
+        changed = engine.update(schedule(args, artworks, last_refreshed), sync_state=sync_state)
+        interrupted = engine.last_stats['update']['interrupted']
+        print(f"총 {changed}개의 작품 정보가 API를 통해 업데이트되었습니다{' (서킷 브레이커로 중단)' if interrupted else ''}.")
+        print_priority(engine)
+        if sync_state is not None:
+            print(f"변경분 동기화: {sync_state.stats()}")
+    # 동기화 상태는 작품 파일을 쓴 뒤에 저장한다 (쓰기에 실패하면 다음 실행에서 다시 반영)
+    write_artworks_to_json(args.output or args.artworks, artworks)
+    if sync_state is not None:
+        sync_state.save()
+    return 1 if interrupted else 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    fields = [field.strip() for field in args.fields.split(',')] if args.fields else None
+    count = export_records(load_records(args.input), args.output, fields)
+    print(f"{count}건 → {args.output}")
+    return 0
+
+
+def cmd_codes(args: argparse.Namespace) -> int:
+    codes = CodeTables(args.codes)
+    client = make_client(args)
+    try:
+        changed = codes.refresh(client, force=args.refresh)
+    finally:
+        client.close()
+    if not codes.groups:
+        print("코드표를 받지 못했습니다.")
+        return 1
+    print(f"코드표 {args.codes} (revision {codes.revision}{', 갱신됨' if changed else ''})")
+    for group, table in codes.groups.items():
+        print(f"\n[{group}] {len(table)}개")
+        for code, name in table.items():
+            print(f"  {code}  {name}")
+    return 0
+
+
+def cmd_match(args: argparse.Namespace) -> int:
+    candidates = load_records(args.relics)
+    index = CandidateIndex(candidates)
+    targets = load_targets(args)
+    started = time.monotonic()
+    results = []
+    for target, matches in zip(targets, index.match_many(targets, k=args.top_k)):
+        best = matches[0] if matches and matches[0].score >= args.min_score else None
+        results.append(dict(
+            target,
+            relic_id=best.item.get('id') if best else None,
+            candidates=[
+                {
+                    'relic_id': match.item.get('id'),
+                    'name': match.item.get('name'),
+                    'collection': match.item.get('collection'),
+                    'score': match.score,
+                    'matched_by': match.matched_by,
+                }
+                for match in matches
+            ],
+        ))
+    elapsed = time.monotonic() - started
+    export_records(results, args.output)
+    matched = sum(1 for result in results if result['relic_id'])
+    print(f"후보 {len(candidates)}건 중 작품 {matched}/{len(results)}건 매칭 ({elapsed:.2f}초) → {args.output}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="국립박물관 Open API 수집")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # 모든 하위 명령이 공유하는 클라이언트/동시성 설정
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="단계별 동시 작업 수")
+    common.add_argument('--rate', type=float, help="초당 요청 수 (기본: MUSEUM_API_RATE 공유 토큰 버킷)")
+    common.add_argument('--burst', type=int, default=DEFAULT_BURST, help="--rate 와 함께 쓰는 최대 연속 요청 수")
+    common.add_argument('--no-cache', action='store_true', help="응답 캐시를 쓰지 않음")
+    common.add_argument('--transport', choices=TRANSPORTS,
+                        help="HTTP 전송 방식 (기본: MUSEUM_API_TRANSPORT 또는 http1, http2/h2c 는 httpx[http2] 필요)")
+    common.add_argument('--adaptive', action='store_true',
+                        help="지연·오류에 따라 동시 요청 수를 AIMD 로 조절 (--workers 가 상한)")
+    common.add_argument('--hedge', action='store_true', help="p90 안에 오지 않은 상세 조회를 한 번 더 보내 먼저 온 응답 사용")
+    common.add_argument('--hedge-ratio', type=float, default=DEFAULT_HEDGE_RATIO,
+                        help=f"전체 요청 대비 헤지 요청 상한 (기본 {DEFAULT_HEDGE_RATIO})")
+
+    # 유물 ID 확인 결과 저장소
+    resolution = argparse.ArgumentParser(add_help=False)
+    resolution.add_argument('--resolutions', default=DEFAULT_RESOLUTION_PATH,
+                            help=f"유물 ID 확인 결과 파일 (기본 {DEFAULT_RESOLUTION_PATH})")
+    resolution.add_argument('--no-resolutions', action='store_true', help="저장된 확인 결과를 쓰지 않고 모두 다시 검색")
+    resolution.add_argument('--retry-failures', nargs='?', const='all',
+                            choices=['all', FAILURE_NOT_FOUND, FAILURE_DETAIL_FAILED, FAILURE_NO_IMAGE],
+                            help="기록된 실패(찾지 못함/상세 실패/이미지 없음)를 지우고 다시 시도")
+
+    # 작업 대상: 소장품번호 인자 또는 artworks.json
+    targets = argparse.ArgumentParser(add_help=False)
+    targets.add_argument('items', nargs='*', help="소장품번호 (생략하면 --artworks 의 작품 전체)")
+    targets.add_argument('--artworks', default=ARTWORKS_JSON_PATH, help=f"작품 데이터 (기본 {ARTWORKS_JSON_PATH})")
+    targets.add_argument('--limit', type=int, help="이 수만큼만 처리 (images 는 우선순위가 높은 것부터)")
+
+    # 우선순위 스케줄링 (images / update)
+    scheduling = argparse.ArgumentParser(add_help=False)
+    scheduling.add_argument('--no-priority', action='store_true',
+                            help="대표 작품 → 국보·보물 → 오래된 작품 순이 아니라 파일 순서대로 처리")
+    scheduling.add_argument('--time-budget', type=float, metavar='SECONDS',
+                            help="이 시간이 지나면 새 작품을 더 꺼내지 않음 (남은 작품은 다음 실행에서)")
+
+    # 일괄 확인 (resolve / images)
+    batching = argparse.ArgumentParser(add_help=False)
+    batching.add_argument('--batch', action='store_true',
+                          help="소장 구분(본관, 신수 …)별 목록 페이지로 소장품번호를 한 번에 확인하고 남은 작품만 개별 검색")
+
+    harvest = subparsers.add_parser('harvest', parents=[common], help="소장품 목록 + 상세 정보를 JSONL 로 수집")
+    harvest.add_argument('--all', action='store_true', help="전체 소장품 수집")
+    harvest.add_argument('--query', help="검색어로 범위를 좁혀 수집")
+    harvest.add_argument('--museum', help="박물관 이름 또는 코드 (코드표로 museumCode 변환)")
+    harvest.add_argument('--era', help="시대 이름 또는 코드 (코드표로 nationalityCode 변환)")
+    harvest.add_argument('--material', help="재질 이름 또는 코드 (코드표로 materialCode 변환)")
+    harvest.add_argument('--codes', default=DEFAULT_CODE_PATH, help=f"코드표 사본 경로 (기본 {DEFAULT_CODE_PATH})")
+    harvest.add_argument('--output', default=DEFAULT_OUTPUT_PATH, help=f"출력 JSONL 경로 (기본 {DEFAULT_OUTPUT_PATH})")
+    harvest.add_argument('--resume', action='store_true', help="체크포인트에서 이어서 수집")
+    harvest.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help="relic/list numOfRows")
+    harvest.add_argument('--no-details', action='store_true', help="relic/detail 없이 목록 정보만 기록")
+    harvest.add_argument('--stream', action='store_true',
+                         help="목록 페이지를 받는 대로 파싱 (큰 --page-size 에서 메모리 절약, 캐시 미사용)")
+    harvest.add_argument('--max-items', type=int, help="최대 기록 건수 (시험 수집용)")
+    harvest.add_argument('--checkpoint-every', type=int, default=DEFAULT_CHECKPOINT_EVERY,
+                         help="페이지 중간에도 이 건수마다 체크포인트 저장")
+    harvest.set_defaults(func=cmd_harvest)
+
+    resolve = subparsers.add_parser('resolve', parents=[common, resolution, targets, batching], help="소장품번호/작품명 → 유물 ID")
+    resolve.add_argument('--output', default=DEFAULT_RESOLVED_PATH, help=f"출력 경로 (기본 {DEFAULT_RESOLVED_PATH})")
+    resolve.set_defaults(func=cmd_resolve)
+
+    fetch = subparsers.add_parser('fetch', parents=[common], help="유물 ID 의 상세 정보 수집")
+    fetch.add_argument('ids', nargs='*', help="유물 ID")
+    fetch.add_argument('--input', help="resolve 결과 등 relic_id/id 가 있는 JSON/JSONL")
+    fetch.add_argument('--output', default=DEFAULT_DETAILS_PATH, help=f"출력 경로 (기본 {DEFAULT_DETAILS_PATH})")
+    fetch.set_defaults(func=cmd_fetch)
+
+    images = subparsers.add_parser('images', parents=[common, resolution, targets, batching, scheduling],
+                                   help="ID 확인 → 상세 조회 → 대표 이미지 선택")
+    images.add_argument('--speculative', type=int, default=0, metavar='K',
+                        help="검색 직후 상위 K개 후보의 상세를 동시에 받아 이미지가 있는 후보를 고름")
+    images.add_argument('--speculative-budget', type=int, default=SPECULATIVE_BUDGET,
+                        help=f"--speculative 가 쓸 수 있는 추가 상세 호출 수 (기본 {SPECULATIVE_BUDGET})")
+    images.add_argument('--output', default=DEFAULT_IMAGES_PATH, help=f"출력 경로 (기본 {DEFAULT_IMAGES_PATH})")
+    images.set_defaults(func=cmd_images)
+
+    update = subparsers.add_parser('update', parents=[common, resolution, scheduling], help="artworks.json 을 API 정보로 갱신")
+    update.add_argument('--artworks', default=ARTWORKS_JSON_PATH, help=f"작품 데이터 (기본 {ARTWORKS_JSON_PATH})")
+    update.add_argument('--output', help="저장 경로 (기본: --artworks 에 덮어씀)")
+    update.add_argument('--limit', type=int, help="우선순위가 높은 것부터 이 수만큼만 갱신")
+    update.add_argument('--delta', action='store_true', help="목록 정보가 바뀐 작품만 상세 조회하고 달라진 필드만 반영")
+    update.add_argument('--sync-state', default=DEFAULT_SYNC_STATE_PATH,
+                        help=f"--delta 동기화 상태 파일 (기본 {DEFAULT_SYNC_STATE_PATH})")
+    update.set_defaults(func=cmd_update)
+
+    match = subparsers.add_parser('match', parents=[targets], help="수집 결과(JSONL)에서 작품 후보를 일괄 매칭")
+    match.add_argument('--relics', default=DEFAULT_OUTPUT_PATH, help=f"후보 유물 (harvest 결과, 기본 {DEFAULT_OUTPUT_PATH})")
+    match.add_argument('--top-k', type=int, default=3, help="작품마다 기록할 후보 수")
+    match.add_argument('--min-score', type=float, default=MIN_SCORE, help="relic_id 로 확정할 최소 점수")
+    match.add_argument('--output', default=DEFAULT_MATCHES_PATH, help=f"출력 경로 (기본 {DEFAULT_MATCHES_PATH})")
+    match.set_defaults(func=cmd_match)
+
+    codes = subparsers.add_parser('codes', parents=[common], help="code/list 코드표(박물관·시대·재질) 확인")
+    codes.add_argument('--codes', default=DEFAULT_CODE_PATH, help=f"코드표 사본 경로 (기본 {DEFAULT_CODE_PATH})")
+    codes.add_argument('--refresh', action='store_true', help="TTL 과 관계없이 다시 받음")
+    codes.set_defaults(func=cmd_codes)
+
+    export = subparsers.add_parser('export', help="JSON/JSONL 결과를 JSON, JSONL, CSV 로 변환")
+    export.add_argument('input', help="harvest/fetch/images 결과 또는 artworks.json")
+    export.add_argument('--output', required=True, help="출력 경로 (확장자로 형식 결정: .json / .jsonl / .csv)")
+    export.add_argument('--fields', help="내보낼 필드 (쉼표 구분, 기본 전체)")
+    export.set_defaults(func=cmd_export)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+"""
+relic/detail 헤지 요청 (hedged request)
+
+상세 조회 대부분은 금방 끝나지만 몇 건이 느리게 응답하면(최대 timeout 15초) 전체 실행 시간이
+그 몇 건에 끌려간다. 헤지를 켜면 요청이 최근 지연 분포의 p90 안에 끝나지 않을 때
+같은 요청을 한 번 더 보내고 먼저 온 응답을 쓴다. 늦은 쪽 응답은 버린다.
+
+헤지 요청도 클라이언트의 토큰 버킷과 재시도 정책을 그대로 거치고,
+전체 요청 대비 헤지 비율은 max_ratio(기본 10%)를 넘지 않는다.
+지연 표본이 min_samples 만큼 쌓이기 전에는 헤지하지 않고 호출한 스레드에서 바로 실행한다.
+지연 표본은 언제나 원래 요청의 지연이다 (헤지가 이겨도 원래 요청이 끝날 때 기록).
+
+    client = MuseumAPIClient(hedger=Hedger())
+    client.get_relic_detail(relic_id)
+    client.hedger.stats()     # requests, hedged, hedge_wins, denied, delay, p50/p90/p99
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Deque, Dict, Optional, TypeVar
+
+from museum_pipeline import percentile
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+HEDGED_ENDPOINTS = ('relic/detail',)
+DEFAULT_HEDGE_PERCENTILE = 0.9
+DEFAULT_HEDGE_RATIO = 0.1       # 전체 요청 대비 헤지 요청 상한
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 500            # 지연 분포를 계산할 최근 요청 수
+DEFAULT_HEDGE_WORKERS = 64
+MIN_HEDGE_DELAY = 0.02          # 초
+
+
+class Hedger:
+    """최근 지연 분포의 분위수를 넘긴 요청만 한 번 더 보낸다"""
+
+    def __init__(
+        self,
+        hedge_percentile: float = DEFAULT_HEDGE_PERCENTILE,
+        max_ratio: float = DEFAULT_HEDGE_RATIO,
+        min_samples: int = DEFAULT_MIN_SAMPLES,
+        window: int = DEFAULT_WINDOW,
+        workers: int = DEFAULT_HEDGE_WORKERS,
+    ):
+        self.hedge_percentile = hedge_percentile
+        self.max_ratio = max_ratio
+        self.min_samples = min_samples
+        self.samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='hedge')
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0    # 헤지 요청이 먼저 응답한 수
+        self.denied = 0        # 분위수를 넘겼지만 예산 때문에 보내지 않은 수
+
+    def delay(self) -> Optional[float]:
+        """헤지를 보낼 대기 시간 (표본이 부족하면 None)"""
+        with self._lock:
+            if len(self.samples) < self.min_samples:
+                return None
+            return max(MIN_HEDGE_DELAY, percentile(sorted(self.samples), self.hedge_percentile))
+
+    def _allow(self) -> bool:
+        with self._lock:
+            if self.hedged + 1 > self.max_ratio * self.requests:
+                self.denied += 1
+                return False
+            self.hedged += 1
+            return True
+
+    def _record(self, started: float) -> None:
+        with self._lock:
+            self.samples.append(time.monotonic() - started)
+
+    def call(self, fn: Callable[[], Optional[T]]) -> Optional[T]:
+        """fn 을 실행하고, delay() 안에 끝나지 않으면 한 번 더 실행해 먼저 온 결과(None 이 아닌 것)를 돌려준다"""
+        with self._lock:
+            self.requests += 1
+        delay = self.delay()
+        started = time.monotonic()
+        if delay is None:
+            # 표본이 모자라 헤지할 수 없으면 스레드 풀을 거치지 않는다
+            try:
+                return fn()
+            finally:
+                self._record(started)
+
+        primary = self._pool.submit(fn)
+        # 지연 표본은 원래 요청이 끝난 시각으로 남긴다. 헤지가 이겨도 느린 원래 요청의 지연이
+        # 분포에 들어가야 p90 이 실제보다 낮아져 헤지가 늘어나는 악순환이 생기지 않는다
+        primary.add_done_callback(lambda _: self._record(started))
+        if wait([primary], timeout=delay).done or not self._allow():
+            return primary.result()
+
+        logger.info(f"헤지 요청 전송 ({delay:.3f}초 초과)")
+        hedge = self._pool.submit(fn)
+        pending = {primary, hedge}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return result
+        return None
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = sorted(self.samples)
+            return {
+                'requests': self.requests,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'denied': self.denied,
+                'delay': round(max(MIN_HEDGE_DELAY, percentile(samples, self.hedge_percentile)), 3) if len(samples) >= self.min_samples else None,
+                'p50': round(percentile(samples, 0.5), 3),
+                'p90': round(percentile(samples, 0.9), 3),
+                'p99': round(percentile(samples, 0.99), 3),
+            }
@@ -0,0 +1,220 @@
+"""
+후보 매칭 인덱스
+
+작품(소장품번호, 작품명)을 relic/list 후보와 맞출 때 후보마다
+`inventory in collection`, `title in name` 을 차례로 검사하고 없으면 첫 결과를 쓰던 방식은
+후보가 많으면 느리고, 부분 문자열만 겹쳐도(예: '방울' ⊂ '청동 방울') 엉뚱한 유물을 고른다.
+
+여기서는 후보 집합에 대해 한 번만 인덱스를 만든다.
+- 정규화한 소장품번호 → 후보 (해시 인덱스)
+- 정규화한 국문/영문 명칭의 문자 n-gram → 후보 (역색인)
+
+조회는 대상의 소장품번호와 n-gram 에 걸리는 후보만 보고 점수를 매겨 상위 k개를 돌려준다.
+명칭 유사도는 n-gram 집합의 Dice 계수이고, 소장품번호가 일치한 후보는 작품명이 유물 명칭에
+포함되는 정도(포함도)도 함께 본다. 소장품번호가 일치한 후보는 점수와 관계없이
+명칭으로만 찾은 후보보다 앞에 선다('금관' 으로 검색해도 본관11377 의 '황남대총 북분 금관' 이
+이름이 똑같은 다른 '금관' 보다 먼저).
+
+    index = CandidateIndex(items)                 # relic/list 항목 또는 harvest 결과
+    matches = index.match({'title': '빗살무늬토기', 'inventory': '암사123'}, k=3)
+    best = index.best(target)                     # MIN_SCORE 이상인 1위 또는 None
+    results = index.match_many(targets, k=3)      # 작품 여러 개를 한 번에
+
+정확도/처리량 비교: python bench_match.py
+"""
+
+import heapq
+import itertools
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+NGRAM_SIZE = 2
+MIN_SCORE = 0.7          # best() 가 받아들이는 최소 점수
+CANDIDATE_SCORE = 0.3    # match() 가 명칭 후보로 고려하는 최소 유사도
+INVENTORY_WEIGHT = 0.6   # 소장품번호 일치 시 기본 점수 (나머지는 명칭 유사도·포함도로 채움)
+UNREGISTERED = '미등록'
+
+_SPACES = re.compile(r'\s+')
+_DIGITS = re.compile(r'\d+')
+_NON_WORD = re.compile(r'[^\w]+')
+_PREFIX = re.compile(r'\D+')
+
+
+class Match(NamedTuple):
+    item: Dict[str, Any]
+    score: float
+    matched_by: str      # 'inventory' / 'title'
+
+
+def normalize_inventory(value: Optional[str]) -> str:
+    """소장품번호 정규화: '본관 02426' → '본관2426', 'm 67' → 'M67'"""
+    if not value:
+        return ''
+    text = _SPACES.sub('', unicodedata.normalize('NFKC', str(value))).upper()
+    return _DIGITS.sub(lambda m: m.group().lstrip('0') or '0', text)
+
+
+def split_inventory(value: Optional[str]) -> List[str]:
+    """'본관11377, 본관10824' 처럼 여러 번호가 들어 있는 값을 정규화해 나눈다"""
+    if not value:
+        return []
+    parts = (normalize_inventory(part) for part in re.split(r'[,;/]', str(value)))
+    return [part for part in parts if part and part != UNREGISTERED]
+
+
+def inventory_prefix(inventory: str) -> str:
+    """정규화한 소장품번호의 소장 구분 접두어: '본관2426' → '본관', '2426' → ''"""
+    match = _PREFIX.match(inventory)
+    return match.group() if match else ''
+
+
+def normalize_title(value: Optional[str]) -> str:
+    """명칭 정규화: NFKC, 소문자, 공백·문장부호 제거"""
+    if not value:
+        return ''
+    return _NON_WORD.sub('', unicodedata.normalize('NFKC', str(value)).lower()).replace('_', '')
+
+
+def ngrams(text: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """정규화한 문자열의 문자 n-gram (n 보다 짧으면 문자열 자체)"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class _TitleIndex:
+    """정규화한 명칭 → n-gram 역색인
+
+    같은 명칭('토기', '기와' 등)을 가진 후보가 많으므로 명칭 단위로 색인하고
+    명칭마다 후보 번호 목록을 둔다.
+    """
+
+    def __init__(self, n: int):
+        self.n = n
+        self.ids: Dict[str, int] = {}
+        self.grams: List[Set[str]] = []
+        self.items: List[List[int]] = []
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+    def add(self, title: str, index: int) -> int:
+        title_id = self.ids.get(title)
+        if title_id is None:
+            title_id = self.ids[title] = len(self.grams)
+            grams = ngrams(title, self.n)
+            self.grams.append(grams)
+            self.items.append([])
+            for gram in grams:
+                self.postings[gram].append(title_id)
+        self.items[title_id].append(index)
+        return title_id
+
+    def similarity(self, title_id: int, grams: Set[str]) -> float:
+        own = self.grams[title_id]
+        return 2.0 * len(grams & own) / (len(grams) + len(own)) if grams and own else 0.0
+
+    def containment(self, title_id: int, grams: Set[str]) -> float:
+        """대상 명칭의 n-gram 중 이 명칭에 들어 있는 비율 ('금관' ⊂ '황남대총 북분 금관' → 1.0)"""
+        return len(grams & self.grams[title_id]) / len(grams) if grams else 0.0
+
+    def top(self, grams: Set[str], k: int) -> List[Tuple[float, int]]:
+        """Dice 계수 상위 k개 명칭 (점수, 명칭 번호)
+
+        공유 n-gram 수가 많은 명칭부터 보며, 남은 명칭의 Dice 상한(2c / (|A| + c))이
+        현재 k위 점수나 CANDIDATE_SCORE 보다 낮아지면 멈춘다.
+        """
+        if not grams or k <= 0:
+            return []
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        size = len(grams)
+        top: List[Tuple[float, int]] = []   # (점수, -명칭 번호) 최소 힙
+        for title_id, count in shared.most_common():
+            bound = 2.0 * count / (size + count)
+            if bound < CANDIDATE_SCORE or (len(top) == k and bound < top[0][0]):
+                break
+            entry = (2.0 * count / (size + len(self.grams[title_id])), -title_id)
+            if len(top) < k:
+                heapq.heappush(top, entry)
+            elif entry > top[0]:
+                heapq.heapreplace(top, entry)
+        return [(score, -negative) for score, negative in top]
+
+
+class CandidateIndex:
+    """후보 항목의 소장품번호 해시 인덱스 + 명칭 n-gram 역색인"""
+
+    def __init__(self, items: Iterable[Dict[str, Any]] = (), n: int = NGRAM_SIZE):
+        self.items: List[Dict[str, Any]] = []
+        self._titles = _TitleIndex(n)
+        self._titles_en = _TitleIndex(n)
+        self._item_titles: List[Tuple[int, int]] = []      # 후보별 (국문, 영문) 명칭 번호
+        self._by_inventory: Dict[str, List[int]] = defaultdict(list)
+        self.add(items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, items: Iterable[Dict[str, Any]]) -> None:
+        for item in items:
+            index = len(self.items)
+            self.items.append(item)
+            for inventory in split_inventory(item.get('collection')):
+                self._by_inventory[inventory].append(index)
+            self._item_titles.append((
+                self._titles.add(normalize_title(item.get('name')), index),
+                self._titles_en.add(normalize_title(item.get('nameEng')), index),
+            ))
+
+    def match(self, target: Dict[str, Any], k: int = 5) -> List[Match]:
+        """target({'title', 'titleEn', 'inventory'})과 맞는 후보를 최대 k개
+
+        소장품번호로 찾은 후보가 먼저(그 안에서는 점수순), 명칭으로만 찾은 후보가 점수순으로 뒤따른다.
+        """
+        grams = ngrams(normalize_title(target.get('title')), self._titles.n)
+        grams_en = ngrams(normalize_title(target.get('titleEn')), self._titles_en.n)
+        has_title = bool(grams or grams_en)
+
+        scores: Dict[int, Tuple[float, str]] = {}
+        # 소장품번호가 일치하는 후보는 해시 조회로 바로 찾고 명칭으로 순위를 가른다.
+        # 번호가 이미 맞았으므로 작품명이 유물 명칭의 일부('금관')이기만 해도 같은 유물로 본다
+        for inventory in split_inventory(target.get('inventory') or target.get('inventoryNumber')):
+            for index in self._by_inventory.get(inventory, ()):
+                title_id, title_id_en = self._item_titles[index]
+                similarity = max(
+                    self._titles.similarity(title_id, grams), self._titles.containment(title_id, grams),
+                    self._titles_en.similarity(title_id_en, grams_en), self._titles_en.containment(title_id_en, grams_en),
+                )
+                score = INVENTORY_WEIGHT + (1 - INVENTORY_WEIGHT) * similarity if has_title else 1.0
+                scores[index] = (score, 'inventory')
+        # 명칭 후보 (번호로 이미 찾은 후보가 자리를 차지할 수 있으므로 그만큼 더 본다)
+        limit = k + len(scores)
+        for titles, title_grams in ((self._titles, grams), (self._titles_en, grams_en)):
+            picked = 0
+            for score, title_id in sorted(titles.top(title_grams, limit), key=lambda pair: (-pair[0], pair[1])):
+                for index in itertools.islice(titles.items[title_id], limit - picked):
+                    current = scores.get(index, (0.0, ''))
+                    if current[1] != 'inventory' and score > current[0]:
+                        scores[index] = (score, 'title')
+                    picked += 1
+                if picked >= limit:
+                    break
+
+        # 소장품번호로 찾은 후보는 따로 한 등급 위에 둔다 (이름이 똑같은 다른 유물보다 앞)
+        ranked = heapq.nsmallest(k, scores.items(), key=lambda pair: (pair[1][1] != 'inventory', -pair[1][0], pair[0]))
+        return [Match(self.items[index], round(score, 4), matched_by) for index, (score, matched_by) in ranked]
+
+    def best(self, target: Dict[str, Any], min_score: float = MIN_SCORE) -> Optional[Match]:
+        """1위 후보가 min_score 이상이면 그 후보 (없으면 None)
+
+        소장품번호는 맞지만 명칭이 전혀 다른 1위는 받아들이지 않는다. 이때 이름만 같은
+        다른 번호의 유물로 넘어가지도 않는다.
+        """
+        matches = self.match(target, k=1)
+        return matches[0] if matches and matches[0].score >= min_score else None
+
+    def match_many(self, targets: Iterable[Dict[str, Any]], k: int = 5) -> List[List[Match]]:
+        """여러 작품을 같은 인덱스로 한 번에 매칭"""
+        return [self.match(target, k) for target in targets]
@@ -0,0 +1,142 @@
+"""
+실행 중 중복 조회를 없애는 메모이제이션과 single-flight
+
+한 번의 실행 안에서도 같은 유물 ID를 여러 번 조회하는 일이 잦다
+(find_relic_id 뒤의 fetch_detail, 첫 번째 결과로의 대체, 귀걸이/방울처럼
+겹치는 후보 등). 여기서는
+- 크기가 제한된 메모리 LRU 로 이미 받은 응답을 재사용하고
+- 같은 키에 대해 진행 중인 호출이 있으면 새로 보내지 않고 그 결과를 함께 기다린다.
+
+실패(None)는 저장하지 않으므로 다음 호출에서 다시 시도한다.
+반환되는 dict 는 호출자 사이에 공유되므로 수정하지 않아야 한다.
+"""
+
+import asyncio
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+DEFAULT_MEMO_SIZE = 1024
+
+_MISSING = object()
+
+
+class LRUMemo:
+    """스레드 안전한 크기 제한 LRU"""
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0   # 진행 중인 호출에 합류한 횟수
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            value = self._data.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'hits': self.hits, 'misses': self.misses, 'coalesced': self.coalesced, 'size': len(self._data)}
+
+
+class Memoizer(LRUMemo):
+    """LRU + single-flight (스레드용)"""
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        super().__init__(maxsize)
+        self._in_flight: Dict[Hashable, Future] = {}
+        self._flight_lock = threading.Lock()
+
+    def call(self, key: Hashable, fn: Callable[[], Optional[Any]]) -> Optional[Any]:
+        """key 의 결과가 있으면 재사용하고, 없으면 한 번만 fn 을 실행"""
+        value = self.get(key)
+        if value is not _MISSING:
+            return value
+
+        with self._flight_lock:
+            # 앞선 호출이 방금 끝났을 수 있으므로 잠금 안에서 다시 확인
+            with self._lock:
+                value = self._data.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = fn()
+            if value is not None:
+                self.put(key, value)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._flight_lock:
+                self._in_flight.pop(key, None)
+
+
+class AsyncMemoizer(LRUMemo):
+    """LRU + single-flight (asyncio 용)"""
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        super().__init__(maxsize)
+        self._in_flight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+
+    async def call(self, key: Hashable, fn: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        """key 의 결과가 있으면 재사용하고, 없으면 한 번만 fn() 을 기다린다"""
+        value = self.get(key)
+        if value is not _MISSING:
+            return value
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            # 합류한 쪽이 취소되어도 원래 호출은 계속되도록 shield
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await fn()
+            if value is not None:
+                self.put(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없으면 "never retrieved" 경고가 나지 않도록 소비
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(key, None)
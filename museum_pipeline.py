@@ -0,0 +1,244 @@
+"""
+단계별 생산자/소비자 파이프라인
+
+수집 스크립트는 작품마다 ID 확인 → 상세 조회 → 이미지 선택 → 기록을 차례로 한다.
+여기서는 단계 사이에 크기가 제한된 큐를 두고 단계마다 작업 스레드 수를 따로 정해,
+느린 단계가 있어도 다른 단계가 놀지 않고 전체 처리량이 가장 느린 단계의 속도에
+가까워지게 한다. 큐가 차면 앞 단계가 기다리므로(backpressure) 메모리는 일정하다.
+
+    pipeline = Pipeline([
+        Stage('resolve', find_relic_id, workers=4),
+        Stage('detail', fetch_detail, workers=4),
+        Stage('image', select_image),
+    ])
+    results = pipeline.run(inventory_numbers)
+
+단계 함수가 None 을 돌려주면 그 항목은 거기서 빠진다. 예외가 나면 실패로 세고
+그 항목 자리에 StageFailure(단계 이름, 단계 입력, 예외)를 남긴다. 뒤 단계는 StageFailure 를
+함수에 넘기지 않고 그대로 흘려보내므로, 결과 목록을 입력과 짝지을 수 있다. fatal 로 지정한 예외(기본: 서킷 브레이커 열림)는 파이프라인 전체를 멈추고
+run() 에서 다시 던진다.
+"""
+
+import logging
+import math
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from museum_retry import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 32
+
+_DONE = object()
+
+
+def percentile(values: List[float], p: float) -> float:
+    """정렬된 값 목록의 p 분위수 (0 ≤ p ≤ 1, 최근접 순위)"""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, max(0, math.ceil(p * len(values)) - 1))]
+
+
+class StageFailure:
+    """단계 함수가 예외를 낸 항목 (결과 목록에서 그 항목 자리에 들어간다)"""
+
+    __slots__ = ('stage', 'item', 'error')
+
+    def __init__(self, stage: str, item: Any, error: Exception):
+        self.stage = stage
+        self.item = item      # 실패한 단계가 받은 입력
+        self.error = error
+
+    def __repr__(self) -> str:
+        return f"StageFailure({self.stage!r}, {self.error!r})"
+
+
+class Stage:
+    """파이프라인 단계 하나"""
+
+    def __init__(self, name: str, fn: Callable[[Any], Optional[Any]], workers: int = 1, queue_size: int = DEFAULT_QUEUE_SIZE):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.queue_size = queue_size   # 이 단계 입력 큐의 크기
+        self.processed = 0
+        self.dropped = 0
+        self.failed = 0
+        self.busy = 0.0                # 작업 스레드가 fn 안에서 보낸 시간 합계
+        self._lock = threading.Lock()
+
+    def _count(self, outcome: str, elapsed: float) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.busy += elapsed
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.workers,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'busy': round(self.busy, 3),
+        }
+
+
+class Pipeline:
+    """Stage 들을 제한된 큐로 이어 동시에 실행"""
+
+    def __init__(self, stages: List[Stage], fatal: Tuple[Type[BaseException], ...] = (CircuitOpenError,)):
+        if not stages:
+            raise ValueError("단계가 하나 이상 필요합니다")
+        self.stages = stages
+        self.fatal = fatal
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self.elapsed = 0.0
+        # 항목별 단계 처리 시간 합계 (큐 대기 제외)
+        self._service: Dict[int, float] = {}
+        self._service_lock = threading.Lock()
+        self.item_latencies: List[float] = []
+
+    def _put(self, q: "queue.Queue[Any]", value: Any) -> bool:
+        """중단 요청을 확인하며 큐에 넣는다 (큐가 차 있으면 기다림)"""
+        while not self._stop.is_set():
+            try:
+                q.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: "queue.Queue[Any]") -> Any:
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def _feed(self, source: Iterable[Any], q: "queue.Queue[Any]") -> None:
+        try:
+            for index, item in enumerate(source):
+                if not self._put(q, (index, item)):
+                    return
+        except BaseException as e:
+            self._fail(e)
+        finally:
+            for _ in range(self.stages[0].workers):
+                self._put(q, _DONE)
+
+    def _fail(self, error: BaseException) -> None:
+        if self._error is None:
+            self._error = error
+        self._stop.set()
+
+    def _work(self, stage: Stage, inbox: "queue.Queue[Any]", outbox: "queue.Queue[Any]", remaining: List[int], lock: threading.Lock, downstream_workers: int) -> None:
+        try:
+            while True:
+                message = self._get(inbox)
+                if message is _DONE:
+                    return
+                index, item = message
+                if isinstance(item, StageFailure):
+                    # 앞 단계에서 실패한 항목은 결과 자리를 지키도록 그대로 넘긴다
+                    if not self._put(outbox, message):
+                        return
+                    continue
+                started = time.monotonic()
+                try:
+                    try:
+                        result = stage.fn(item)
+                    finally:
+                        with self._service_lock:
+                            self._service[index] = self._service.get(index, 0.0) + time.monotonic() - started
+                except self.fatal as e:
+                    stage._count('failed', time.monotonic() - started)
+                    self._fail(e)
+                    return
+                except Exception as e:
+                    stage._count('failed', time.monotonic() - started)
+                    logger.warning(f"파이프라인 {stage.name} 단계 실패: {e}")
+                    result = StageFailure(stage.name, item, e)
+                    if not self._put(outbox, (index, result)):
+                        return
+                    continue
+                if result is None:
+                    stage._count('dropped', time.monotonic() - started)
+                    continue
+                stage._count('processed', time.monotonic() - started)
+                if not self._put(outbox, (index, result)):
+                    return
+        finally:
+            # 이 단계의 마지막 작업 스레드가 끝나면 다음 단계에 종료를 알린다
+            with lock:
+                remaining[0] -= 1
+                last = remaining[0] == 0
+            if last:
+                for _ in range(downstream_workers):
+                    self._put(outbox, _DONE)
+
+    def run(self, source: Iterable[Any], ordered: bool = True) -> List[Any]:
+        """source 의 항목을 모든 단계에 통과시키고 마지막 단계의 결과 목록을 반환
+
+        예외가 난 항목은 StageFailure 로 남는다. ordered=True 이면 결과를 입력 순서대로 정렬한다.
+        """
+        self._stop.clear()
+        self._error = None
+        self._service = {}
+        started = time.monotonic()
+        queues = [queue.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        results_queue: "queue.Queue[Any]" = queue.Queue()
+        threads = [threading.Thread(target=self._feed, args=(source, queues[0]), name='pipeline-feed', daemon=True)]
+        for i, stage in enumerate(self.stages):
+            outbox = queues[i + 1] if i + 1 < len(self.stages) else results_queue
+            downstream = self.stages[i + 1].workers if i + 1 < len(self.stages) else 1
+            remaining, lock = [stage.workers], threading.Lock()
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work,
+                    args=(stage, queues[i], outbox, remaining, lock, downstream),
+                    name=f'pipeline-{stage.name}-{n}',
+                    daemon=True,
+                ))
+        for thread in threads:
+            thread.start()
+
+        collected: List[Tuple[int, Any]] = []
+        try:
+            while True:
+                message = self._get(results_queue)
+                if message is _DONE:
+                    break
+                collected.append(message)
+        except KeyboardInterrupt:
+            self._stop.set()
+            raise
+        finally:
+            self.elapsed = time.monotonic() - started
+        if self._error is not None:
+            raise self._error
+
+        self.item_latencies = sorted(
+            self._service[index] for index, value in collected if not isinstance(value, StageFailure)
+        )
+        if ordered:
+            collected.sort(key=lambda pair: pair[0])
+        return [value for _, value in collected]
+
+    def stats(self) -> Dict[str, Any]:
+        """단계별 처리 통계 (busy / workers 가 가장 큰 단계가 병목)"""
+        latencies = self.item_latencies
+        return {
+            'elapsed': round(self.elapsed, 3),
+            'stages': {stage.name: stage.stats() for stage in self.stages},
+            # 끝까지 처리된 항목 하나가 모든 단계에서 걸린 시간 (큐 대기 제외)
+            'item_latency': {
+                'p50': round(percentile(latencies, 0.5), 3),
+                'p90': round(percentile(latencies, 0.9), 3),
+                'p99': round(percentile(latencies, 0.99), 3),
+                'max': round(latencies[-1], 3) if latencies else 0.0,
+            },
+        }
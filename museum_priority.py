@@ -0,0 +1,171 @@
+"""
+우선순위 작업 스케줄러 (대표 작품 → 국보·보물 → 오래된 작품 순)
+
+작품 단위 작업(images, update)은 artworks.json 순서대로 처리해 왔기 때문에
+호출 한도나 시간이 다 돼 중간에 멈추면 어떤 작품이 갱신됐는지가 파일 순서에 달려 있었다.
+PriorityScheduler 는 작품을 우선순위 큐(heapq)에 넣고 가장 급한 것부터 파이프라인에 내보내므로
+실행이 중간에 끊겨도 화면에 가장 많이 보이는 작품이 먼저 갱신된다.
+
+기본 우선순위는
+1. featured 가 참인 대표 작품
+2. culturalProperty 가 국보·보물인 작품
+3. 나머지
+이고, 같은 등급 안에서는 마지막으로 갱신한 지 오래된 작품(기록이 없으면 가장 먼저)부터 보낸다.
+
+    priority = make_priority(lambda artwork: sync_state.synced_at(artwork_key(artwork)))
+    scheduler = PriorityScheduler(artworks, priority, limit=50, time_budget=600)
+    engine.update(scheduler)
+    scheduler.stats()   # 등급별 total / dispatched / completed / failed / pending / last_done
+"""
+
+import heapq
+import itertools
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# 우선순위 등급 (앞에 있을수록 먼저)
+CLASS_FEATURED = 'featured'
+CLASS_DESIGNATED = 'designated'   # 국보·보물
+CLASS_OTHER = 'other'
+PRIORITY_CLASSES = (CLASS_FEATURED, CLASS_DESIGNATED, CLASS_OTHER)
+_CLASS_RANK = {name: rank for rank, name in enumerate(PRIORITY_CLASSES)}
+
+_DESIGNATED = re.compile(r'^\s*(국보|보물)')
+
+
+def priority_class(item: Dict[str, Any]) -> str:
+    """작품(또는 make_target 작업)의 우선순위 등급"""
+    if item.get('featured'):
+        return CLASS_FEATURED
+    if _DESIGNATED.match(str(item.get('culturalProperty') or '')):
+        return CLASS_DESIGNATED
+    return CLASS_OTHER
+
+
+def make_priority(last_refreshed: Optional[Callable[[Any], float]] = None) -> Callable[[Any], Tuple[int, float]]:
+    """기본 우선순위 함수 (등급, 마지막 갱신 시각). 값이 작을수록 먼저 나간다
+
+    last_refreshed 는 작품의 마지막 갱신 시각(epoch 초, 기록이 없으면 0)을 돌려주는 함수로,
+    동기화 상태(SyncState.synced_at)나 확인 결과 저장소(ResolutionCache.resolved_at)를 쓴다.
+    """
+    def priority(item: Any) -> Tuple[int, float]:
+        return _CLASS_RANK[priority_class(item)], last_refreshed(item) if last_refreshed else 0.0
+    return priority
+
+
+class PriorityScheduler:
+    """우선순위 큐에서 작업을 꺼내 주는 iterable (Pipeline 의 source 로 쓴다)
+
+    priority 가 None 이면 입력 순서대로 내보낸다 (등급별 통계는 그대로 남는다).
+    limit 건을 내보냈거나 time_budget 초가 지나면 더 꺼내지 않고, 남은 작업은 pending 으로 센다.
+    완료는 track() 으로 감싼 마지막 단계 함수가 complete() 로 알린다.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        priority: Optional[Callable[[Any], Any]] = None,
+        classify: Callable[[Any], str] = priority_class,
+        limit: Optional[int] = None,
+        time_budget: Optional[float] = None,
+    ):
+        self.priority = priority
+        self.classify = classify
+        self.limit = limit
+        self.time_budget = time_budget
+        self.cutoff: Optional[str] = None    # 'limit' / 'time_budget' (끝까지 내보냈으면 None)
+        self._heap: List[Tuple[Any, int, Any]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._started: Optional[float] = None
+        self.classes: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            self.push(item)
+
+    def _class(self, name: str) -> Dict[str, Any]:
+        if name not in self.classes:
+            self.classes[name] = {'total': 0, 'dispatched': 0, 'completed': 0, 'failed': 0, 'last_done': None}
+        return self.classes[name]
+
+    def push(self, item: Any) -> None:
+        """작업 추가 (실행 중에도 넣을 수 있다)"""
+        key = self.priority(item) if self.priority is not None else 0
+        with self._lock:
+            heapq.heappush(self._heap, (key, next(self._seq), item))
+            self._class(self.classify(item))['total'] += 1
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def pop(self) -> Optional[Any]:
+        """가장 급한 작업 (없거나 limit/time_budget 에 걸리면 None)"""
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+            if not self._heap:
+                return None
+            dispatched = sum(counts['dispatched'] for counts in self.classes.values())
+            if self.limit is not None and dispatched >= self.limit:
+                self.cutoff = 'limit'
+                return None
+            if self.time_budget is not None and time.monotonic() - self._started > self.time_budget:
+                self.cutoff = 'time_budget'
+                return None
+            _, _, item = heapq.heappop(self._heap)
+            self._class(self.classify(item))['dispatched'] += 1
+            return item
+
+    def __iter__(self) -> Iterator[Any]:
+        while True:
+            item = self.pop()
+            if item is None:
+                return
+            yield item
+
+    def complete(self, item: Any, ok: bool = True) -> None:
+        """작업 하나가 마지막 단계를 마쳤다 (ok=False 면 실패로 센다)"""
+        with self._lock:
+            counts = self._class(self.classify(item))
+            counts['completed' if ok else 'failed'] += 1
+            if self._started is not None:
+                counts['last_done'] = round(time.monotonic() - self._started, 3)
+
+    def track(self, fn: Callable[[Any], Any], ok: Callable[[Any], bool] = lambda result: result is not None) -> Callable[[Any], Any]:
+        """마지막 단계 함수를 감싸 결과마다 complete() 를 부른다 (예외는 실패로 세고 다시 던짐)"""
+        def tracked(item: Any) -> Any:
+            try:
+                result = fn(item)
+            except BaseException:
+                self.complete(item, False)
+                raise
+            self.complete(item, ok(result))
+            return result
+        return tracked
+
+    def stats(self) -> Dict[str, Any]:
+        """등급별 작업 수 (우선순위 순). pending 은 아직 내보내지 않은 작업"""
+        with self._lock:
+            order = sorted(self.classes, key=lambda name: (_CLASS_RANK.get(name, len(_CLASS_RANK)), name))
+            return {
+                'cutoff': self.cutoff,
+                'classes': {
+                    name: dict(self.classes[name], pending=self.classes[name]['total'] - self.classes[name]['dispatched'])
+                    for name in order
+                },
+            }
+
+
+def format_priority_stats(stats: Dict[str, Any]) -> str:
+    """등급별 완료 현황 한 줄 요약"""
+    parts = []
+    for name, counts in stats['classes'].items():
+        part = f"{name} {counts['completed']}/{counts['total']}"
+        if counts['failed']:
+            part += f" (실패 {counts['failed']})"
+        if counts['last_done'] is not None:
+            part += f" @{counts['last_done']:.1f}s"
+        parts.append(part)
+    suffix = f" - {stats['cutoff']} 에서 멈춤" if stats['cutoff'] else ''
+    return ', '.join(parts) + suffix
@@ -0,0 +1,126 @@
+"""
+국립박물관 Open API 호출 속도 제한 (토큰 버킷)
+
+스크립트마다 흩어져 있던 time.sleep(...) 대신, 모든 요청이 요청 직전에
+토큰을 하나씩 받아 가도록 한다. 요청 자체가 느렸다면 기다리지 않고,
+동시 요청이 늘어나도 초당 호출 수(rate)와 순간 허용량(burst)을 넘지 않는다.
+
+- TokenBucket     : 한 프로세스 안의 스레드/코루틴이 공유
+- FileTokenBucket : 같은 호스트의 여러 워커 프로세스가 잠금 파일로 공유
+"""
+
+import asyncio
+import os
+import struct
+import threading
+import time
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_RATE = 5.0     # 초당 요청 수
+DEFAULT_BURST = 5      # 한 번에 몰아서 보낼 수 있는 최대 요청 수
+
+_STATE_FORMAT = '<dd'  # (남은 토큰, 마지막 갱신 시각)
+_STATE_SIZE = struct.calcsize(_STATE_FORMAT)
+
+
+class TokenBucket:
+    """스레드 안전한 토큰 버킷"""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate 는 0보다 크고 burst 는 1 이상이어야 합니다.")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, tokens: float, updated: float, now: float) -> float:
+        elapsed = max(0.0, now - updated)
+        return min(self.burst, tokens + elapsed * self.rate)
+
+    def _reserve(self, tokens: float = 1.0) -> float:
+        """토큰을 예약하고 사용 가능해질 때까지 기다려야 할 시간(초)을 반환
+
+        토큰이 모자라면 잔량을 음수로 내려 예약해 두므로 대기 순서가 유지된다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = self._refill(self._tokens, self._updated, now) - tokens
+            self._updated = now
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """토큰을 얻을 때까지 블록"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: float = 1.0) -> None:
+        """토큰을 얻을 때까지 대기 (이벤트 루프는 막지 않음)"""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class FileTokenBucket(TokenBucket):
+    """파일에 상태를 두고 여러 프로세스가 함께 쓰는 토큰 버킷
+
+    상태는 16바이트(토큰 잔량, 갱신 시각)뿐이며 flock 으로 보호한다.
+    프로세스 사이에서 공유되어야 하므로 시각은 time.time() 을 쓴다.
+    """
+
+    def __init__(self, path: str, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        if fcntl is None:
+            raise ImportError("FileTokenBucket 은 fcntl 을 지원하는 운영체제에서만 사용할 수 있습니다.")
+        super().__init__(rate, burst)
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+    def _reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                now = time.time()
+                raw = os.pread(fd, _STATE_SIZE, 0)
+                if len(raw) == _STATE_SIZE:
+                    stored, updated = struct.unpack(_STATE_FORMAT, raw)
+                else:
+                    stored, updated = self.burst, now
+                remaining = self._refill(stored, updated, now) - tokens
+                os.pwrite(fd, struct.pack(_STATE_FORMAT, remaining, now), 0)
+            finally:
+                os.close(fd)  # 닫으면 flock 도 풀린다
+        return 0.0 if remaining >= 0 else -remaining / self.rate
+
+
+_shared_limiter: Optional[TokenBucket] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rate_limiter() -> TokenBucket:
+    """프로세스 전체에서 공유하는 속도 제한기 반환
+
+    MUSEUM_API_RATE(초당 요청 수), MUSEUM_API_BURST 로 한도를 정하고,
+    MUSEUM_API_RATE_FILE 을 지정하면 같은 파일을 쓰는 모든 프로세스가
+    한도를 나눠 쓴다.
+    """
+    global _shared_limiter
+    if _shared_limiter is None:
+        with _shared_lock:
+            if _shared_limiter is None:
+                rate = float(os.getenv('MUSEUM_API_RATE', DEFAULT_RATE))
+                burst = int(os.getenv('MUSEUM_API_BURST', DEFAULT_BURST))
+                path = os.getenv('MUSEUM_API_RATE_FILE')
+                if path:
+                    _shared_limiter = FileTokenBucket(path, rate, burst)
+                else:
+                    _shared_limiter = TokenBucket(rate, burst)
+    return _shared_limiter
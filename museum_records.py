@@ -0,0 +1,212 @@
+"""
+유물·이미지·작품 레코드 (__slots__)
+
+수집 결과를 중첩 dict 로 들고 다니면 객체마다 해시 테이블이 붙어
+전체 소장품 규모에서는 메모리 대부분이 키와 빈 슬롯에 쓰인다.
+여기서는 필드가 고정된 __slots__ 레코드와 dict 변환기를 두고,
+값의 종류가 적은 분류 필드(시대, 재질, 박물관, 지정 문화재 등)는 sys.intern 으로
+같은 문자열 객체를 공유하게 한다.
+
+- ImageRef: relic/detail 의 imageList 항목
+- Relic: relic/list, relic/detail 항목 (API 키 이름 그대로 dict 로 왕복)
+- Artwork: src/data/types.ts 의 Artwork (artworks.json 키 이름 그대로 왕복).
+  기존 dict 기반 코드가 그대로 동작하도록 get / [] / update 를 지원한다.
+
+레코드에 없는 키는 extra 에 보관해 dict 로 되돌릴 때 잃지 않는다.
+"""
+
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+_MISSING = object()
+
+
+def intern_field(value: Any) -> Any:
+    """문자열이면 intern 해서 같은 값이 한 객체를 공유하게 한다"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class _Record:
+    """(속성 이름, dict 키, intern 여부) 목록으로 정의하는 slotted 레코드"""
+
+    __slots__ = ('extra',)
+    _FIELDS: Tuple[Tuple[str, str, bool], ...] = ()
+    _BY_KEY: Dict[str, str] = {}
+    _INTERNED: frozenset = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._BY_KEY = {key: attr for attr, key, _ in cls._FIELDS}
+        cls._INTERNED = frozenset(attr for attr, _, interned in cls._FIELDS if interned)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        record = cls.__new__(cls)
+        for attr, key, interned in cls._FIELDS:
+            value = data.get(key)
+            setattr(record, attr, intern_field(value) if interned else value)
+        extra = {key: value for key, value in data.items() if key not in cls._BY_KEY}
+        record.extra = extra or None
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """None 인 필드는 빼고 원래 키 이름의 dict 로 변환"""
+        data = {}
+        for attr, key, _ in self._FIELDS:
+            value = getattr(self, attr)
+            if value is not None:
+                data[key] = value
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        first = self._FIELDS[0][0]
+        return f"{type(self).__name__}({first}={getattr(self, first)!r})"
+
+
+class ImageRef(_Record):
+    """이미지 한 장의 URL 묶음"""
+
+    __slots__ = ('url', 'original', 'thumb_medium', 'thumb_small')
+    _FIELDS = (
+        ('url', 'imgUrl', False),
+        ('original', 'imgOriUri', False),
+        ('thumb_medium', 'imgThumUriM', False),
+        ('thumb_small', 'imgThumUriS', False),
+    )
+
+    def best_url(self) -> str:
+        """원본 > 중형 썸네일 > 소형 썸네일 > imgUrl 순으로 있는 URL"""
+        return self.original or self.thumb_medium or self.thumb_small or self.url or ''
+
+
+class Relic(_Record):
+    """e뮤지엄 유물 한 건"""
+
+    __slots__ = (
+        'id', 'name', 'name_eng', 'collection', 'museum_code', 'museum_name',
+        'era', 'era_name', 'material', 'size', 'standard', 'designation',
+        'description', 'content', 'images', 'copyright',
+    )
+    _FIELDS = (
+        ('id', 'id', False),
+        ('name', 'name', False),
+        ('name_eng', 'nameEng', False),
+        ('collection', 'collection', False),
+        ('museum_code', 'museumCode', True),
+        ('museum_name', 'museumName', True),
+        ('era', 'era', True),
+        ('era_name', 'eraName', True),
+        ('material', 'material', True),
+        ('size', 'size', False),
+        ('standard', 'standard', False),
+        ('designation', 'designation', True),
+        ('description', 'description', False),
+        ('content', 'content', False),
+        ('images', 'imageList', False),
+        ('copyright', 'copyright', False),
+    )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Relic':
+        relic = super().from_dict(data)
+        images = relic.images
+        if images is not None:
+            relic.images = tuple(
+                image if isinstance(image, ImageRef) else ImageRef.from_dict(image)
+                for image in (images if isinstance(images, list) else [images])
+            )
+        return relic
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        if self.images is not None:
+            data['imageList'] = [image.to_dict() for image in self.images]
+        return data
+
+    def best_image_url(self) -> str:
+        return self.images[0].best_url() if self.images else ''
+
+
+class Artwork(_Record):
+    """src/data/types.ts 의 Artwork"""
+
+    __slots__ = (
+        'id', 'title', 'title_en', 'period', 'era', 'category', 'material', 'dimensions',
+        'description', 'detailed_description', 'historical_background', 'artistic_features',
+        'image_url', 'featured', 'cultural_property', 'national_treasure_number',
+        'museum', 'inventory_number', 'significance', 'display_location',
+    )
+    _FIELDS = (
+        ('id', 'id', False),
+        ('title', 'title', False),
+        ('title_en', 'titleEn', False),
+        ('period', 'period', True),
+        ('era', 'era', False),
+        ('category', 'category', True),
+        ('material', 'material', True),
+        ('dimensions', 'dimensions', False),
+        ('description', 'description', False),
+        ('detailed_description', 'detailedDescription', False),
+        ('historical_background', 'historicalBackground', False),
+        ('artistic_features', 'artisticFeatures', False),
+        ('image_url', 'imageUrl', False),
+        ('featured', 'featured', False),
+        ('cultural_property', 'culturalProperty', True),
+        ('national_treasure_number', 'nationalTreasureNumber', False),
+        ('museum', 'museum', True),
+        ('inventory_number', 'inventoryNumber', False),
+        ('significance', 'significance', False),
+        ('display_location', 'displayLocation', True),
+    )
+
+    # dict 기반 코드와의 호환 (artworks.json 키 이름으로 접근)
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self._BY_KEY.get(key)
+        if attr is not None:
+            value = getattr(self, attr)
+            return default if value is None else value
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        attr = self._BY_KEY.get(key)
+        if attr is not None:
+            setattr(self, attr, intern_field(value) if attr in self._INTERNED else value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def update(self, values: Dict[str, Any]) -> None:
+        for key, value in values.items():
+            self[key] = value
+
+
+def load_relics(path: str) -> Iterator[Relic]:
+    """harvest 결과(JSONL)를 Relic 레코드로 읽는다"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield Relic.from_dict(json.loads(line))
+
+
+def artworks_from_json(data: List[Dict[str, Any]]) -> List[Artwork]:
+    return [Artwork.from_dict(item) for item in data]
+
+
+def artworks_to_json(artworks: Iterable[Any]) -> List[Dict[str, Any]]:
+    return [artwork.to_dict() if isinstance(artwork, _Record) else artwork for artwork in artworks]
@@ -0,0 +1,167 @@
+"""
+작품 → 유물 ID 확인 결과 저장소
+
+작품명·소장품번호로 relic/list 를 검색해 유물 ID 를 찾는 단계는 실행마다 같은 답을 낸다
+(빗살무늬토기 → 항상 같은 ID). 확인한 결과를 (명칭, 소장품번호, 박물관) 키로
+매칭 점수·방법·시각과 함께 저장해 두고, 다음 실행에서는 검색 없이 바로 쓴다.
+점수가 낮았거나(min_confidence 미만) 오래된(ttl 초과) 항목만 다시 확인한다.
+
+찾지 못한 작품(미등록 소장품번호, 검색 결과 없음), 상세 정보를 받지 못한 유물,
+이미지가 없는 유물도 이유와 함께 따로 기록해 두고 이유별 TTL 이 지나기 전에는 다시 시도하지 않는다.
+"""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from museum_match import normalize_title, split_inventory
+
+DEFAULT_RESOLUTION_PATH = '.museum_cache/resolutions.json'
+RESOLUTION_VERSION = 2
+DEFAULT_RESOLUTION_TTL = 30 * 24 * 3600   # 30일
+DEFAULT_MIN_CONFIDENCE = 0.9
+
+# 실패 이유별 재시도 전 대기 시간 (초)
+FAILURE_NOT_FOUND = 'not_found'
+FAILURE_DETAIL_FAILED = 'detail_failed'
+FAILURE_NO_IMAGE = 'no_image'
+DEFAULT_FAILURE_TTLS = {
+    FAILURE_NOT_FOUND: 7 * 24 * 3600,
+    FAILURE_NO_IMAGE: 7 * 24 * 3600,
+    FAILURE_DETAIL_FAILED: 24 * 3600,   # 일시적인 장애일 수 있어 짧게
+}
+DEFAULT_FAILURE_TTL = 24 * 3600
+
+
+def resolution_key(target: Dict[str, Any]) -> str:
+    """(명칭, 소장품번호, 박물관) 정규화 키"""
+    title = normalize_title(target.get('title'))
+    inventory = '+'.join(sorted(split_inventory(target.get('inventory') or target.get('inventoryNumber'))))
+    museum = normalize_title(target.get('museum'))
+    return f"{title}|{inventory}|{museum}"
+
+
+class ResolutionCache:
+    """유물 ID 확인 결과 (JSON 파일)"""
+
+    def __init__(
+        self,
+        path: str = DEFAULT_RESOLUTION_PATH,
+        ttl: float = DEFAULT_RESOLUTION_TTL,
+        min_confidence: float = DEFAULT_MIN_CONFIDENCE,
+        failure_ttls: Optional[Dict[str, float]] = None,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.min_confidence = min_confidence
+        self.failure_ttls = dict(DEFAULT_FAILURE_TTLS, **(failure_ttls or {}))
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.failures: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0       # 만료되었거나 점수가 낮아 다시 확인한 수
+        self.stored = 0
+        self.skipped: Dict[str, int] = {}   # 기록된 실패 때문에 건너뛴 수 (이유별)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            self.records = state.get('records', {})
+            self.failures = state.get('failures', {})
+
+    def get(self, target: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """믿을 만한 확인 결과가 있으면 반환, 없거나 다시 확인해야 하면 None"""
+        record = self.records.get(resolution_key(target))
+        with self._lock:
+            if record is None:
+                self.misses += 1
+                return None
+            if time.time() - record.get('resolvedAt', 0) > self.ttl or record.get('confidence', 0.0) < self.min_confidence:
+                self.stale += 1
+                return None
+            self.hits += 1
+        return record
+
+    def resolved_at(self, target: Dict[str, Any]) -> float:
+        """마지막으로 확인한 시각 (epoch 초, 기록이 없으면 0)"""
+        record = self.records.get(resolution_key(target))
+        return record.get('resolvedAt', 0.0) if record else 0.0
+
+    def put(self, target: Dict[str, Any], relic_id: str, confidence: float, matched_by: str) -> None:
+        with self._lock:
+            self.records[resolution_key(target)] = {
+                'relicId': relic_id,
+                'confidence': confidence,
+                'matchedBy': matched_by,
+                'resolvedAt': time.time(),
+            }
+            self.stored += 1
+
+    def get_failure(self, target: Dict[str, Any], reasons: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """만료되지 않은 실패 기록 (reasons 를 주면 그 이유인 것만)"""
+        key = resolution_key(target)
+        record = self.failures.get(key)
+        if record is None or (reasons is not None and record['reason'] not in reasons):
+            return None
+        ttl = self.failure_ttls.get(record['reason'], DEFAULT_FAILURE_TTL)
+        with self._lock:
+            if time.time() - record.get('recordedAt', 0) > ttl:
+                self.failures.pop(key, None)
+                return None
+            self.skipped[record['reason']] = self.skipped.get(record['reason'], 0) + 1
+        return record
+
+    def put_failure(self, target: Dict[str, Any], reason: str, relic_id: Optional[str] = None) -> None:
+        with self._lock:
+            self.failures[resolution_key(target)] = {
+                'reason': reason,
+                'relicId': relic_id,
+                'recordedAt': time.time(),
+            }
+
+    def clear_failure(self, target: Dict[str, Any]) -> None:
+        with self._lock:
+            self.failures.pop(resolution_key(target), None)
+
+    def clear_failures(self, reason: Optional[str] = None) -> int:
+        """실패 기록 삭제 (reason 을 주면 그 이유만). 지운 수를 반환"""
+        with self._lock:
+            keys = [key for key, record in self.failures.items() if reason is None or record['reason'] == reason]
+            for key in keys:
+                del self.failures[key]
+            return len(keys)
+
+    def invalidate(self, target: Dict[str, Any]) -> bool:
+        """작품의 확인 결과와 실패 기록을 모두 지운다"""
+        key = resolution_key(target)
+        with self._lock:
+            found = self.records.pop(key, None) is not None
+            return self.failures.pop(key, None) is not None or found
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(
+                    {'version': RESOLUTION_VERSION, 'records': self.records, 'failures': self.failures},
+                    f, ensure_ascii=False, indent=2,
+                )
+            os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        failures: Dict[str, int] = {}
+        for record in self.failures.values():
+            failures[record['reason']] = failures.get(record['reason'], 0) + 1
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'stale': self.stale,
+            'stored': self.stored,
+            'tracked': len(self.records),
+            'skipped_failures': dict(self.skipped),
+            'failures': failures,
+        }
@@ -0,0 +1,171 @@
+"""
+재시도(지수 백오프 + 지터, 재시도 예산)와 서킷 브레이커
+
+일시적인 시간 초과나 연결 오류 한 번으로 작품이 갱신에서 빠지지 않도록
+오류 종류별 정책에 따라 다시 시도한다. 재시도는 전체 요청 대비 비율(예산)을
+넘지 않고, API 가 명백히 내려가 있으면 서킷 브레이커가 열려 배치 전체를
+빠르게 실패시킨다.
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+from museum_concurrency import (
+    ERROR_CONNECTION,
+    ERROR_SERVER,
+    ERROR_THROTTLED,
+    ERROR_TIMEOUT,
+    ERROR_XML,
+)
+
+
+class CircuitOpenError(Exception):
+    """서킷 브레이커가 열려 요청을 보내지 않음"""
+
+
+class RetryPolicy:
+    """오류 종류 하나에 대한 재시도 정책"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 0.5, max_delay: float = 10.0, multiplier: float = 2.0):
+        self.max_attempts = max_attempts    # 첫 시도를 포함한 최대 시도 횟수
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+
+    def delay(self, attempt: int) -> float:
+        """attempt 번째(1부터) 실패 뒤 기다릴 시간 - full jitter"""
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+
+DEFAULT_RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    ERROR_TIMEOUT: RetryPolicy(max_attempts=3, base_delay=1.0),
+    ERROR_CONNECTION: RetryPolicy(max_attempts=4, base_delay=0.5),
+    ERROR_THROTTLED: RetryPolicy(max_attempts=5, base_delay=2.0, max_delay=30.0),
+    ERROR_SERVER: RetryPolicy(max_attempts=3, base_delay=1.0),
+    ERROR_XML: RetryPolicy(max_attempts=2, base_delay=1.0),
+}
+
+
+class RetryBudget:
+    """재시도가 전체 요청의 일정 비율을 넘지 않도록 하는 예산
+
+    요청 하나마다 ratio 만큼 적립되고 재시도 한 번에 1 을 쓴다.
+    처음에는 min_reserve 만큼 여유를 두어 소규모 실행에서도 재시도할 수 있다.
+    """
+
+    def __init__(self, ratio: float = 0.2, min_reserve: float = 10.0, max_reserve: float = 100.0):
+        self.ratio = ratio
+        self.max_reserve = max_reserve
+        self._balance = min_reserve
+        self._lock = threading.Lock()
+        self.retries = 0
+        self.exhausted = 0
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(self.max_reserve, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """재시도 한 번을 허용하면 True"""
+        with self._lock:
+            if self._balance >= 1.0:
+                self._balance -= 1.0
+                self.retries += 1
+                return True
+            self.exhausted += 1
+            return False
+
+
+class CircuitBreaker:
+    """연속 실패가 쌓이면 일정 시간 요청을 막는 서킷 브레이커
+
+    closed → (재시도까지 끝내 실패한 요청이 연속 failure_threshold 개) → open
+    open → (recovery_timeout 경과) → half_open: 시험 요청 하나만 통과
+    half_open → 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def before_request(self) -> None:
+        """요청 직전 호출. 열려 있으면 CircuitOpenError"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.recovery_timeout:
+                    raise CircuitOpenError(
+                        f"API 장애로 서킷 브레이커가 열려 있습니다 ({self.recovery_timeout:.0f}초 후 재시도)"
+                    )
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    raise CircuitOpenError("서킷 브레이커 시험 요청이 진행 중입니다")
+                self._probing = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probing = False
+            self.state = self.CLOSED
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class RetryController:
+    """정책, 예산, 서킷 브레이커를 묶어 클라이언트가 쓰는 재시도 판단기"""
+
+    def __init__(
+        self,
+        policies: Optional[Dict[str, RetryPolicy]] = None,
+        budget: Optional[RetryBudget] = None,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.policies = dict(DEFAULT_RETRY_POLICIES, **(policies or {}))
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+
+    def before_attempt(self) -> None:
+        """시도 직전: 서킷 확인 후 예산 적립"""
+        self.breaker.before_request()
+        self.budget.deposit()
+
+    def after_attempt(self, error: Optional[str], attempt: int) -> Optional[float]:
+        """시도 결과를 반영하고, 다시 시도해야 하면 대기 시간(초)을, 아니면 None 반환"""
+        policy = self.policies.get(error) if error else None
+        if policy is None:
+            # 정상 응답이거나 재시도 대상이 아닌 오류(4xx, 파싱 실패 등)
+            self.breaker.record_success()
+            return None
+        # 브레이커에는 요청 하나가 끝내 실패했을 때(시도 소진, 예산 부족)만 한 번 센다.
+        # 반 열림 상태의 시험 요청은 다시 시도하지 않고 바로 실패로 알린다
+        if (attempt >= policy.max_attempts or self.breaker.state == CircuitBreaker.HALF_OPEN
+                or not self.budget.withdraw()):
+            self.breaker.record_failure()
+            return None
+        return policy.delay(attempt)
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            'retries': self.budget.retries,
+            'budget_exhausted': self.budget.exhausted,
+            'circuit': self.breaker.state,
+        }
@@ -0,0 +1,526 @@
+#!/usr/bin/env python3
+"""
+e뮤지엄 Open API 로컬 대역(stand-in) 서버
+
+실제 포털과 API 키 없이 수집 스크립트의 처리량과 정확성을 측정하기 위한 서버.
+relic/list, relic/detail, code/list 를 스크립트들이 파싱하는 JSON / XML 두 형식으로
+응답하며, 지연 시간·오류율·페이지 크기를 조절할 수 있다.
+
+카탈로그는 src/data/artworks.json 의 100선 작품(제목·소장품번호 그대로)에
+시드 고정 합성 유물을 더해 만든다. --cassette 를 주면 녹화된 응답을 재생한다.
+
+--h2c 를 주면 HTTP/1.1 대신 평문 HTTP/2(prior knowledge, h2c)로 응답한다. 연결 하나에서
+여러 스트림을 동시에 처리하므로 http2/h2c 전송의 다중화를 TLS 없이 측정할 수 있다 (h2 필요).
+
+사용 예:
+    python museum_standin.py --port 8765 --relics 5000 --latency 0.05 --error-rate 0.01
+    export MUSEUM_API_BASE_URL=http://127.0.0.1:8765/openapi
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import socketserver
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from museum_cassette import Cassette, endpoint_from_path, request_key
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+    import h2.exceptions
+except ImportError:
+    h2 = None
+
+ARTWORKS_JSON_PATH = 'src/data/artworks.json'
+
+FORMAT_AUTO = 'auto'    # returnType 파라미터를 따름
+FORMAT_JSON = 'json'
+FORMAT_XML = 'xml'      # returnType 과 무관하게 XML (실제 포털이 자주 이렇게 응답)
+
+ERROR_MODE_HTTP = 'http'    # 503 응답
+ERROR_MODE_XML = 'xml'      # 200 + XML 오류 본문
+ERROR_MODE_MIXED = 'mixed'
+
+MUSEUMS = [
+    ('PS01001001', '국립중앙박물관'),
+    ('PS01002001', '국립경주박물관'),
+    ('PS01003001', '국립광주박물관'),
+    ('PS01004001', '국립전주박물관'),
+    ('PS01005001', '국립대구박물관'),
+    ('PS01006001', '국립부여박물관'),
+    ('PS01007001', '국립공주박물관'),
+    ('PS01008001', '국립진주박물관'),
+    ('PS01009001', '국립청주박물관'),
+    ('PS01010001', '국립김해박물관'),
+]
+ERAS = [
+    ('PC01', '구석기시대'), ('PC02', '신석기시대'), ('PC03', '청동기시대'), ('PC04', '원삼국시대'),
+    ('PC05', '삼국시대'), ('PC06', '통일신라'), ('PC07', '고려시대'), ('PC08', '조선시대'),
+    ('PC09', '대한제국'), ('PC10', '일제강점기'),
+]
+MATERIALS = [
+    ('PM01', '토기'), ('PM02', '청동'), ('PM03', '금'), ('PM04', '도자기'), ('PM05', '석'),
+    ('PM06', '목'), ('PM07', '지'), ('PM08', '철'), ('PM09', '옥'), ('PM10', '섬유'),
+]
+ERA_NAMES = dict(ERAS)
+MATERIAL_NAMES = dict(MATERIALS)
+INVENTORY_PREFIXES = ['본관', '신수', '덕수', '부여', '공주', '경주', '광주', '기증', '구입']
+SYNTHETIC_NAMES = [
+    '청자 상감 운학무늬 매병', '백자 달항아리', '분청사기 박지 모란무늬 편병', '금동 보살 입상',
+    '토기 항아리', '청동 거울', '철제 갑옷', '옥 장신구', '나전 칠 경함', '산수도 병풍',
+    '금제 허리띠', '기와', '벼루', '청동 방울', '토기 잔', '백자 청화 용무늬 항아리',
+]
+
+
+def _split_inventory(value: str) -> List[str]:
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def build_catalog(relic_count: int = 2000, seed: int = 7, artworks_path: str = ARTWORKS_JSON_PATH) -> List[Dict[str, Any]]:
+    """100선 작품 + 합성 유물로 카탈로그 생성 (같은 시드면 항상 같은 결과)"""
+    rng = random.Random(seed)
+    catalog: List[Dict[str, Any]] = []
+
+    def make_relic(index: int, name: str, inventory: str, era: str, material: str, designation: str = '') -> Dict[str, Any]:
+        relic_id = f"PS0100100100{index:06d}"
+        museum_code, museum_name = MUSEUMS[index % len(MUSEUMS)] if index >= 200 else MUSEUMS[0]
+        image_count = rng.choice([0, 1, 1, 2, 3])
+        images = [
+            {
+                'imgUrl': f"https://www.emuseum.go.kr/openapi/img?id={relic_id}&no={n}",
+                'imgOriUri': f"https://www.emuseum.go.kr/upload/{relic_id}_{n}.jpg",
+                'imgThumUriM': f"https://www.emuseum.go.kr/upload/thumb/{relic_id}_{n}_m.jpg",
+                'imgThumUriS': f"https://www.emuseum.go.kr/upload/thumb/{relic_id}_{n}_s.jpg",
+            }
+            for n in range(1, image_count + 1)
+        ]
+        return {
+            'id': relic_id,
+            'name': name,
+            'nameEng': '',
+            'collection': inventory,
+            'museumCode': museum_code,
+            'museumName': museum_name,
+            'era': era,
+            'eraName': era,
+            'material': material,
+            'size': f"높이 {rng.randint(5, 120)}cm",
+            'standard': '',
+            'designation': designation,
+            'description': f"{era} {name}.",
+            'content': f"{era}에 만들어진 {name}이다.",
+            'imageList': images,
+            'copyright': {'typeNm': '공공누리 제1유형'},
+        }
+
+    try:
+        with open(artworks_path, 'r', encoding='utf-8') as f:
+            artworks = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        artworks = []
+
+    for artwork in artworks:
+        inventories = _split_inventory(artwork.get('inventoryNumber', '')) or ['']
+        for inventory in inventories:
+            if inventory == '미등록':
+                continue   # 실제 포털에서도 찾을 수 없는 항목
+            catalog.append(make_relic(
+                len(catalog), artwork.get('title', ''), inventory,
+                artwork.get('period', ''), artwork.get('material', ''), artwork.get('culturalProperty', ''),
+            ))
+
+    while len(catalog) < relic_count:
+        index = len(catalog)
+        catalog.append(make_relic(
+            index,
+            rng.choice(SYNTHETIC_NAMES),
+            f"{rng.choice(INVENTORY_PREFIXES)}{rng.randint(1, 30000)}",
+            rng.choice(ERAS)[1],
+            rng.choice(MATERIALS)[1],
+        ))
+    return catalog
+
+
+def _summary(relic: Dict[str, Any]) -> Dict[str, Any]:
+    """relic/list 항목 (상세의 일부 필드만)"""
+    return {key: relic[key] for key in ('id', 'name', 'collection', 'museumCode', 'museumName', 'era', 'material')}
+
+
+def _xml_element(parent: ET.Element, tag: str, value: Any) -> None:
+    element = ET.SubElement(parent, tag)
+    if isinstance(value, dict):
+        for key, child in value.items():
+            _xml_element(element, key, child)
+    elif isinstance(value, list):
+        child_tag = 'image' if tag == 'imageList' else 'item'
+        for child in value:
+            _xml_element(element, child_tag, child)
+    elif value is not None:
+        element.text = str(value)
+
+
+def render_xml(body: Dict[str, Any]) -> str:
+    """스크립트들이 파싱하는 XML 형식 (root 바로 아래 resultCode/totalCount/items)"""
+    root = ET.Element('result')
+    for key in ('resultCode', 'resultMsg', 'totalCount', 'pageNo', 'numOfRows'):
+        if key in body:
+            _xml_element(root, key, body[key])
+    _xml_element(root, 'items', body.get('items', []))
+    return '<?xml version="1.0" encoding="UTF-8"?>' + ET.tostring(root, encoding='unicode')
+
+
+def render_json(body: Dict[str, Any]) -> str:
+    header = {'resultCode': body.get('resultCode'), 'resultMsg': body.get('resultMsg')}
+    payload = {k: v for k, v in body.items() if k not in header}
+    return json.dumps({'response': {'header': header, 'body': payload}}, ensure_ascii=False)
+
+
+XML_ERROR_BODY = (
+    '<OpenAPI_ServiceResponse><cmmMsgHeader>'
+    '<errMsg>SERVICE ERROR</errMsg><returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg>'
+    '<returnReasonCode>22</returnReasonCode>'
+    '</cmmMsgHeader></OpenAPI_ServiceResponse>'
+)
+
+
+class StandinState:
+    """서버 설정과 카탈로그, 요청 통계"""
+
+    def __init__(
+        self,
+        catalog: List[Dict[str, Any]],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        slow_rate: float = 0.0,
+        slow_latency: float = 1.0,
+        error_rate: float = 0.0,
+        error_mode: str = ERROR_MODE_MIXED,
+        max_page_size: int = 100,
+        response_format: str = FORMAT_AUTO,
+        cassette: Optional[Cassette] = None,
+        seed: int = 7,
+    ):
+        self.catalog = catalog
+        self.by_id = {relic['id']: relic for relic in catalog}
+        self.latency = latency
+        self.jitter = jitter
+        self.slow_rate = slow_rate          # 꼬리 지연: 이 비율의 응답에 slow_latency 를 더한다
+        self.slow_latency = slow_latency
+        self.error_rate = error_rate
+        self.error_mode = error_mode
+        self.max_page_size = max_page_size
+        self.response_format = response_format
+        self.cassette = cassette
+        self.rng = random.Random(seed)
+        self.stats: Dict[str, int] = {}
+        self.lock = threading.Lock()
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] = self.stats.get(key, 0) + 1
+
+    def search(self, params: Dict[str, str]) -> Tuple[int, List[Dict[str, Any]]]:
+        name = params.get('name') or params.get('keyword') or ''
+        if '%' in name:
+            name = unquote(name)   # final_image_fetcher 처럼 미리 인코딩해 보내는 경우
+        manage_no = params.get('manageNo', '').replace(' ', '')
+        museum_code = params.get('museumCode', '')
+        era = ERA_NAMES.get(params.get('nationalityCode', ''), params.get('nationalityCode', ''))
+        material = MATERIAL_NAMES.get(params.get('materialCode', ''), params.get('materialCode', ''))
+        matches = [
+            relic for relic in self.catalog
+            if (not name or name in relic['name'])
+            and (not manage_no or manage_no in relic['collection'].replace(' ', ''))
+            and (not museum_code or relic['museumCode'].startswith(museum_code))
+            and (not era or relic['era'] == era)
+            and (not material or relic['material'] == material)
+        ]
+        page = max(1, int(params.get('pageNo', 1) or 1))
+        size = max(1, min(self.max_page_size, int(params.get('numOfRows', 10) or 10)))
+        start = (page - 1) * size
+        return len(matches), [_summary(relic) for relic in matches[start:start + size]]
+
+    def code_list(self) -> List[Dict[str, str]]:
+        groups = (('museum', MUSEUMS), ('era', ERAS), ('material', MATERIALS))
+        return [
+            {'groupCode': group, 'code': code, 'name': name}
+            for group, codes in groups
+            for code, name in codes
+        ]
+
+    def respond(self, path: str, if_none_match: Optional[str] = None) -> Tuple[int, str, str, Optional[str]]:
+        """요청 경로 하나에 대한 (상태 코드, 본문, Content-Type, ETag). 지연은 여기서 기다린다"""
+        parts = urlsplit(path)
+        endpoint = endpoint_from_path(parts.path)
+        params = dict(parse_qsl(parts.query, keep_blank_values=True))
+
+        if endpoint == '__stats':
+            with self.lock:
+                return 200, json.dumps(self.stats), 'application/json', None
+
+        self.count(endpoint)
+        delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.slow_rate and self.rng.random() < self.slow_rate:
+            self.count('slow')
+            delay += self.slow_latency
+        if delay:
+            time.sleep(delay)
+
+        if self.cassette is not None:
+            recorded = self.cassette.get(request_key(path))
+            if recorded is None:
+                self.count('cassette_miss')
+                return 404, XML_ERROR_BODY, 'text/xml;charset=UTF-8', None
+            headers = recorded.get('headers', {})
+            return recorded['status'], recorded['body'], headers.get('Content-Type', 'application/json'), headers.get('ETag')
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.count('injected_error')
+            mode = self.error_mode
+            if mode == ERROR_MODE_MIXED:
+                mode = self.rng.choice((ERROR_MODE_HTTP, ERROR_MODE_XML))
+            if mode == ERROR_MODE_HTTP:
+                return 503, 'Service Unavailable', 'text/plain', None
+            return 200, XML_ERROR_BODY, 'text/xml;charset=UTF-8', None
+
+        body = self._dispatch(endpoint, params)
+        if body is None:
+            return 404, XML_ERROR_BODY, 'text/xml;charset=UTF-8', None
+
+        response_format = self.response_format
+        if response_format == FORMAT_AUTO:
+            response_format = FORMAT_JSON if params.get('returnType', 'xml') == 'json' else FORMAT_XML
+        if response_format == FORMAT_JSON:
+            text, content_type = render_json(body), 'application/json;charset=UTF-8'
+        else:
+            text, content_type = render_xml(body), 'text/xml;charset=UTF-8'
+
+        etag = '"' + hashlib.sha1(text.encode('utf-8')).hexdigest()[:16] + '"'
+        if if_none_match == etag:
+            self.count('not_modified')
+            return 304, '', content_type, etag
+        return 200, text, content_type, etag
+
+    def _dispatch(self, endpoint: str, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        ok = {'resultCode': '0000', 'resultMsg': 'OK'}
+        if endpoint == 'relic/list':
+            total, items = self.search(params)
+            return dict(ok, totalCount=total, pageNo=int(params.get('pageNo', 1) or 1),
+                        numOfRows=len(items), items=items)
+        if endpoint == 'relic/detail':
+            relic = self.by_id.get(params.get('id', ''))
+            items = [relic] if relic else []
+            return dict(ok, totalCount=len(items), items=items)
+        if endpoint == 'code/list':
+            items = self.code_list()
+            return dict(ok, totalCount=len(items), items=items)
+        return None
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'   # keep-alive
+    server_version = 'MuseumStandin/1.0'
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def setup(self) -> None:
+        super().setup()
+        self.server.state.count('connections')   # 새 TCP 연결 수 (keep-alive 재사용 확인용)
+
+    def do_GET(self) -> None:
+        self._send(*self.server.state.respond(self.path, self.headers.get('If-None-Match')))
+
+    def _send(self, status: int, text: str, content_type: str, etag: Optional[str] = None) -> None:
+        data = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        if data and self.command != 'HEAD':
+            self.wfile.write(data)
+
+
+class H2CHandler(socketserver.BaseRequestHandler):
+    """평문 HTTP/2(h2c prior knowledge) 연결 하나
+
+    프레임은 이 스레드가 읽고, 요청 스트림마다 작업 스레드에서 state.respond 를 불러
+    지연이 있어도 같은 연결의 다른 스트림이 기다리지 않게 한다.
+    H2Connection 은 스레드 안전하지 않으므로 lock 을 잡고 다루고,
+    흐름 제어 창이 모자라면 WINDOW_UPDATE 가 올 때까지 기다린다.
+    """
+
+    def setup(self) -> None:
+        self.server.state.count('connections')
+        config = h2.config.H2Configuration(client_side=False, header_encoding='utf-8')
+        self.conn = h2.connection.H2Connection(config=config)
+        self.lock = threading.Condition()
+        self.closed = False
+        self.streams: Dict[int, Dict[str, str]] = {}
+
+    def handle(self) -> None:
+        with self.lock:
+            self.conn.initiate_connection()
+            self._flush()
+        while not self.closed:
+            try:
+                data = self.request.recv(65535)
+            except OSError:
+                break
+            if not data:
+                break
+            with self.lock:
+                try:
+                    events = self.conn.receive_data(data)
+                except h2.exceptions.ProtocolError:
+                    self._flush()
+                    break
+                for event in events:
+                    if isinstance(event, h2.events.RequestReceived):
+                        self.streams[event.stream_id] = dict(event.headers)
+                    elif isinstance(event, h2.events.StreamEnded) and event.stream_id in self.streams:
+                        headers = self.streams.pop(event.stream_id)
+                        threading.Thread(target=self._respond, args=(event.stream_id, headers), daemon=True).start()
+                    elif isinstance(event, h2.events.ConnectionTerminated):
+                        self.closed = True
+                # 창이 늘었거나 스트림이 끊겼을 수 있으니 기다리는 작업 스레드를 깨운다
+                self.lock.notify_all()
+                self._flush()
+        with self.lock:
+            self.closed = True
+            self.lock.notify_all()
+
+    def _respond(self, stream_id: int, headers: Dict[str, str]) -> None:
+        status, text, content_type, etag = self.server.state.respond(headers.get(':path', '/'), headers.get('if-none-match'))
+        data = text.encode('utf-8')
+        response_headers = [(':status', str(status)), ('content-type', content_type), ('content-length', str(len(data)))]
+        if etag:
+            response_headers.append(('etag', etag))
+        with self.lock:
+            try:
+                self.conn.send_headers(stream_id, response_headers, end_stream=not data)
+                self._flush()
+                while data and not self.closed:
+                    window = min(self.conn.local_flow_control_window(stream_id), self.conn.max_outbound_frame_size)
+                    if window <= 0:
+                        self.lock.wait()
+                        continue
+                    chunk, data = data[:window], data[window:]
+                    self.conn.send_data(stream_id, chunk, end_stream=not data)
+                    self._flush()
+            except h2.exceptions.StreamClosedError:
+                pass   # 클라이언트가 스트림을 취소함 (헤징 등)
+            except h2.exceptions.ProtocolError:
+                pass   # 연결이 이미 GOAWAY 로 닫힘 (클라이언트는 응답 못 받은 요청을 다시 보낸다)
+
+    def _flush(self) -> None:
+        data = self.conn.data_to_send()
+        if data and not self.closed:
+            try:
+                self.request.sendall(data)
+            except OSError:
+                self.closed = True
+
+
+class StandinServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], state: StandinState, handler: Any = StandinHandler):
+        super().__init__(address, handler)
+        self.state = state
+
+    def handle_error(self, request: Any, client_address: Tuple[str, int]) -> None:
+        # 스트리밍 클라이언트가 읽다 말고 연결을 끊는 것은 정상 동작
+        if isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            return
+        super().handle_error(request, client_address)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/openapi"
+
+
+class H2CStandinServer(StandinServer):
+    """HTTP/1.1 대신 h2c(prior knowledge)로 응답하는 대역 서버"""
+
+    def __init__(self, address: Tuple[str, int], state: StandinState):
+        if h2 is None:
+            raise ImportError("h2c 대역 서버에는 h2 패키지가 필요합니다 ('pip install h2')")
+        super().__init__(address, state, H2CHandler)
+
+
+def start_standin_server(host: str = '127.0.0.1', port: int = 0, relics: int = 2000, h2c: bool = False,
+                         **options: Any) -> StandinServer:
+    """백그라운드 스레드에서 대역 서버 시작. server.base_url 을 클라이언트에 지정해 사용
+
+    h2c=True 면 평문 HTTP/2(prior knowledge) 서버를 띄운다 (transport='h2c' 클라이언트용).
+    """
+    cassette_path = options.pop('cassette_path', None)
+    seed = options.get('seed', 7)
+    state = StandinState(
+        build_catalog(relics, seed=seed),
+        cassette=Cassette(cassette_path) if cassette_path else None,
+        **options,
+    )
+    server = (H2CStandinServer if h2c else StandinServer)((host, port), state)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="e뮤지엄 Open API 로컬 대역 서버")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--relics', type=int, default=2000, help="카탈로그 유물 수")
+    parser.add_argument('--seed', type=int, default=7)
+    parser.add_argument('--latency', type=float, default=0.0, help="응답마다 더할 지연 (초)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="지연에 더할 무작위 값의 최대치 (초)")
+    parser.add_argument('--slow-rate', type=float, default=0.0, help="느린 응답 비율 (0~1, 꼬리 지연 재현)")
+    parser.add_argument('--slow-latency', type=float, default=1.0, help="느린 응답에 더할 지연 (초)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="오류 응답 비율 (0~1)")
+    parser.add_argument('--error-mode', choices=(ERROR_MODE_HTTP, ERROR_MODE_XML, ERROR_MODE_MIXED), default=ERROR_MODE_MIXED)
+    parser.add_argument('--max-page-size', type=int, default=100, help="numOfRows 상한")
+    parser.add_argument('--format', choices=(FORMAT_AUTO, FORMAT_JSON, FORMAT_XML), default=FORMAT_AUTO)
+    parser.add_argument('--cassette', help="녹화된 cassette 파일을 재생")
+    parser.add_argument('--h2c', action='store_true', help="평문 HTTP/2(prior knowledge)로 응답 (h2 필요)")
+    args = parser.parse_args()
+
+    state = StandinState(
+        build_catalog(args.relics, seed=args.seed),
+        latency=args.latency,
+        jitter=args.jitter,
+        slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency,
+        error_rate=args.error_rate,
+        error_mode=args.error_mode,
+        max_page_size=args.max_page_size,
+        response_format=args.format,
+        cassette=Cassette(args.cassette) if args.cassette else None,
+        seed=args.seed,
+    )
+    server = (H2CStandinServer if args.h2c else StandinServer)((args.host, args.port), state)
+    protocol = 'h2c' if args.h2c else 'HTTP/1.1'
+    print(f"e뮤지엄 대역 서버 실행 중: {server.base_url} ({protocol}, 유물 {len(state.catalog)}개)")
+    print(f"export MUSEUM_API_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n종료합니다.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+변경분만 반영하는 동기화(delta sync) 상태
+
+유물마다 목록(relic/list) 항목의 지문과 상세(relic/detail) 내용의 해시를 저장해 두고,
+다음 실행에서 목록 지문이 같으면 상세 조회를 건너뛴다. 지문이 바뀌어 상세를
+다시 받았더라도 상세 해시가 같으면 작품 데이터는 건드리지 않는다.
+매일 밤 전체를 갱신해도 비용은 카탈로그 크기가 아니라 바뀐 양에 비례한다.
+
+목록 항목에 수정 일시 필드가 있으면 그 값을, 없으면 항목 전체의 해시를 지문으로 쓴다.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+DEFAULT_SYNC_STATE_PATH = '.museum_cache/sync_state.json'
+SYNC_STATE_VERSION = 1
+
+# 목록 항목에서 수정 일시로 쓸 수 있는 필드 (앞에 있는 것을 우선)
+MODIFIED_FIELDS = ('lastModified', 'modifiedDate', 'updateDate', 'updDate')
+
+
+def content_hash(value: Any) -> str:
+    """JSON 으로 표현 가능한 값의 내용 해시 (키 순서와 무관)"""
+    canonical = json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def list_fingerprint(item: Dict[str, Any]) -> str:
+    """relic/list 항목의 변경 여부를 판단할 지문"""
+    for field in MODIFIED_FIELDS:
+        if item.get(field):
+            return f"{field}:{item[field]}"
+    return f"sha256:{content_hash(item)}"
+
+
+def artwork_key(artwork: Dict[str, Any]) -> str:
+    """작품 데이터에서 동기화 상태 키를 만든다"""
+    key = artwork.get('id')
+    return str(key) if key is not None else f"title:{artwork.get('title', '')}"
+
+
+class SyncState:
+    """작품별 동기화 기록 (JSON 파일)"""
+
+    def __init__(self, path: str = DEFAULT_SYNC_STATE_PATH):
+        self.path = path
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self.unchanged = 0   # 목록 지문이 같아 상세 조회를 건너뛴 수
+        self.same_detail = 0  # 상세를 받았지만 내용이 같았던 수
+        self.changed = 0
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.records = json.load(f).get('records', {})
+
+    def needs_detail(self, key: str, relic_id: str, fingerprint: str) -> bool:
+        """목록 지문이 바뀌었거나 처음 보는 작품이면 True"""
+        record = self.records.get(key)
+        if record and record.get('relicId') == relic_id and record.get('listFingerprint') == fingerprint:
+            with self._lock:
+                self.unchanged += 1
+            return False
+        return True
+
+    def detail_changed(self, key: str, relic_id: str, detail_hash: str) -> bool:
+        record = self.records.get(key)
+        if record and record.get('relicId') == relic_id and record.get('detailHash') == detail_hash:
+            with self._lock:
+                self.same_detail += 1
+            return False
+        with self._lock:
+            self.changed += 1
+        return True
+
+    def synced_at(self, key: str) -> float:
+        """마지막으로 동기화한 시각 (epoch 초, 기록이 없으면 0)"""
+        record = self.records.get(key)
+        if not record or not record.get('syncedAt'):
+            return 0.0
+        return time.mktime(time.strptime(record['syncedAt'], '%Y-%m-%dT%H:%M:%S'))
+
+    def update(self, key: str, relic_id: str, fingerprint: str, detail_hash: str, last_modified: Optional[str] = None) -> None:
+        with self._lock:
+            self.records[key] = {
+                'relicId': relic_id,
+                'listFingerprint': fingerprint,
+                'detailHash': detail_hash,
+                'lastModified': last_modified,
+                'syncedAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            }
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': SYNC_STATE_VERSION, 'records': self.records}, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'unchanged': self.unchanged,
+            'same_detail': self.same_detail,
+            'changed': self.changed,
+            'tracked': len(self.records),
+        }
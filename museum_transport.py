@@ -0,0 +1,290 @@
+"""
+국립박물관 Open API 공용 HTTP 전송 계층
+
+요청마다 requests.get 을 호출하면 매번 TCP+TLS 핸드셰이크가 새로 일어난다.
+여기서는 keep-alive 커넥션 풀을 가진 requests.Session 을 만들고,
+한 번의 실행(run) 안에서 모든 호출이 같은 세션을 공유하도록 한다.
+
+전송 방식은 세션 어댑터로 바꿔 끼운다.
+- http1 (기본): requests/urllib3 커넥션 풀. 동시에 진행 중인 요청마다 커넥션이 하나씩 필요하다.
+- http2: httpx 어댑터. 호스트와 TLS ALPN 으로 h2 를 협상하면 적은 커넥션 위에 여러 요청을
+  다중화한다. httpx/h2 가 없으면 http1 풀로, 서버가 h2 를 지원하지 않으면
+  (평문 http 대역 서버 포함) httpx 의 HTTP/1.1 로 자동으로 내려간다.
+- h2c: 같은 어댑터를 prior knowledge 로 쓴다. 평문 http 에서도 협상 없이 바로 HTTP/2 로
+  말하므로 h2c 를 지원하는 서버(museum_standin.py --h2c)에만 쓴다. 내려갈 HTTP/1.1 이 없다.
+
+verify / cert / proxies 는 requests 와 같은 의미로 httpx 에 넘긴다
+(설정 조합마다 httpx 클라이언트를 하나씩 만들어 재사용).
+"""
+
+import logging
+import os
+import ssl
+import threading
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import DEFAULT_CA_BUNDLE_PATH, get_encoding_from_headers, select_proxy
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 4    # 호스트별 커넥션 풀 개수
+DEFAULT_POOL_MAXSIZE = 16       # 풀 하나당 유지할 최대 커넥션 수
+DEFAULT_HEADERS = {
+    'Connection': 'keep-alive',
+    'Accept': 'application/json, application/xml;q=0.9, */*;q=0.8',
+}
+
+TRANSPORT_HTTP1 = 'http1'
+TRANSPORT_HTTP2 = 'http2'
+TRANSPORT_H2C = 'h2c'       # 평문 HTTP/2 prior knowledge
+TRANSPORTS = (TRANSPORT_HTTP1, TRANSPORT_HTTP2, TRANSPORT_H2C)
+
+# 서버가 HTTP/2 연결을 프로토콜 오류로 끊었을 때 멱등 요청을 다시 보낼 횟수
+GOAWAY_RETRIES = 2
+
+# HTTP/2 에서 쓸 수 없는 연결 단위 헤더
+_HOP_BY_HOP_HEADERS = {'connection', 'keep-alive', 'proxy-connection', 'transfer-encoding', 'upgrade'}
+
+_shared_session: Optional[requests.Session] = None
+_shared_lock = threading.Lock()
+
+
+class _HttpxBody:
+    """httpx 응답 본문을 requests.Response.raw 처럼 읽게 해 주는 래퍼"""
+
+    def __init__(self, response: Any):
+        self._response = response
+
+    def stream(self, chunk_size: int, decode_content: bool = True) -> Iterator[bytes]:
+        try:
+            yield from self._response.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.ConnectionError(e)
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        finally:
+            self._response.close()
+
+    def close(self) -> None:
+        self._response.close()
+
+
+def _ssl_context(verify: Any, cert: Any) -> Any:
+    """requests 의 verify(bool 또는 CA 번들/디렉터리 경로) 와 cert(경로 또는 (cert, key)) 를 SSLContext 로"""
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    else:
+        ca = DEFAULT_CA_BUNDLE_PATH if verify is True else verify
+        if os.path.isdir(ca):
+            context = ssl.create_default_context(capath=ca)
+        else:
+            context = ssl.create_default_context(cafile=ca)
+    if cert:
+        if isinstance(cert, (tuple, list)):
+            context.load_cert_chain(cert[0], cert[1])
+        else:
+            context.load_cert_chain(cert)
+    return context
+
+
+class HTTP2Adapter(HTTPAdapter):
+    """requests 세션의 요청을 httpx(HTTP/2) 클라이언트로 보내는 어댑터
+
+    응답은 requests.Response 로, httpx 예외는 requests 예외로 바꿔 돌려주므로
+    클라이언트의 오류 분류, 재시도, 스트리밍 파싱은 그대로 동작한다.
+    prior_knowledge=True 면 HTTP/1.1 없이 처음부터 HTTP/2 로 말한다 (h2c).
+    """
+
+    def __init__(self, max_connections: int = DEFAULT_POOL_MAXSIZE, prior_knowledge: bool = False, **kwargs: Any):
+        super().__init__(**kwargs)
+        if httpx is None:
+            raise ImportError("httpx 가 필요합니다 ('pip install httpx[http2]')")
+        import h2  # noqa: F401  (없으면 여기서 ImportError)
+        self.transport = TRANSPORT_H2C if prior_knowledge else TRANSPORT_HTTP2
+        self.prior_knowledge = prior_knowledge
+        # h2 로 협상된 호스트는 커넥션 하나를 여러 요청이 나눠 쓰므로 max_connections 는
+        # HTTP/1.1 로 내려갔을 때의 상한이다
+        self.max_connections = max_connections
+        self.clients: Dict[Tuple[Any, Any, Optional[str]], Any] = {}   # (verify, cert, proxy) → httpx.Client
+        self.versions: Dict[str, int] = {}   # 협상된 HTTP 버전별 응답 수
+        self.goaway_retries = 0               # 연결이 GOAWAY 로 닫혀 다시 보낸 요청 수
+        self._lock = threading.Lock()
+
+    def get_client(self, verify: Any = True, cert: Any = None, proxy: Optional[str] = None) -> Any:
+        """verify/cert/proxy 조합에 맞는 httpx 클라이언트 (처음 쓰일 때 만든다)"""
+        if isinstance(cert, list):
+            cert = tuple(cert)
+        key = (verify, cert, proxy)
+        with self._lock:
+            client = self.clients.get(key)
+            if client is None:
+                client = httpx.Client(
+                    http1=not self.prior_knowledge,
+                    http2=True,
+                    verify=True if verify is True and not cert else _ssl_context(verify, cert),
+                    proxy=proxy,
+                    # 환경변수 프록시·CA 번들은 requests 세션이 이미 proxies/verify 로 풀어 넘긴다
+                    trust_env=False,
+                    limits=httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections),
+                )
+                self.clients[key] = client
+            return client
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, timeout: Any = None,
+             verify: Any = True, cert: Any = None, proxies: Any = None) -> requests.Response:
+        if isinstance(timeout, tuple):
+            timeout = httpx.Timeout(None, connect=timeout[0], read=timeout[1])
+        headers = {name: value for name, value in request.headers.items() if name.lower() not in _HOP_BY_HOP_HEADERS}
+        # 없는 CA 번들·인증서 파일은 requests 의 HTTPAdapter 처럼 OSError 로 그대로 올린다
+        try:
+            client = self.get_client(verify, cert, select_proxy(request.url, proxies or {}))
+        except ValueError as e:
+            raise requests.exceptions.InvalidProxyURL(e, request=request)
+        except ImportError as e:
+            # SOCKS 프록시인데 socksio 가 없음 (requests 도 InvalidSchema)
+            raise requests.exceptions.InvalidSchema(e, request=request)
+        try:
+            response = self._send(client, request, headers, timeout)
+        except httpx.TimeoutException as e:
+            raise requests.exceptions.Timeout(e, request=request)
+        except httpx.ProxyError as e:
+            raise requests.exceptions.ProxyError(e, request=request)
+        except httpx.HTTPError as e:
+            raise requests.exceptions.ConnectionError(e, request=request)
+        with self._lock:
+            self.versions[response.http_version] = self.versions.get(response.http_version, 0) + 1
+
+        # 본문은 requests 가 raw.stream() 으로 읽는다 (stream=False 면 Session 이 바로 다 읽음)
+        result = requests.Response()
+        result.status_code = response.status_code
+        result.headers = CaseInsensitiveDict(response.headers)
+        result.encoding = get_encoding_from_headers(result.headers)
+        result.reason = response.reason_phrase
+        result.url = request.url
+        result.request = request
+        result.connection = self
+        result.raw = _HttpxBody(response)
+        return result
+
+    def _send(self, client: Any, request: requests.PreparedRequest, headers: Dict[str, str], timeout: Any) -> Any:
+        # httpcore 의 동기 HTTP/2 연결은 스트림 ID 할당과 HEADERS 전송 사이에 잠금이 없어서,
+        # 여러 스레드가 한 연결을 나눠 쓰면 드물게 스트림 ID 순서가 뒤바뀌고 서버가 GOAWAY 로
+        # 연결을 닫는다 (그 연결에서 진행 중이던 요청이 모두 실패). 멱등 요청은 새 연결로 다시 보낸다
+        attempts = 1 + (GOAWAY_RETRIES if request.method in ('GET', 'HEAD') else 0)
+        for attempt in range(attempts):
+            try:
+                return client.send(
+                    client.build_request(request.method, request.url, headers=headers, content=request.body, timeout=timeout),
+                    stream=True,
+                )
+            except httpx.RemoteProtocolError:
+                if attempt == attempts - 1:
+                    raise
+                with self._lock:
+                    self.goaway_retries += 1
+
+    def close(self) -> None:
+        with self._lock:
+            clients, self.clients = list(self.clients.values()), {}
+        for client in clients:
+            client.close()
+        super().close()
+
+
+def create_http2_adapter(max_connections: int = DEFAULT_POOL_MAXSIZE, prior_knowledge: bool = False) -> Optional[HTTP2Adapter]:
+    """HTTP/2 어댑터 (httpx 나 h2 가 없으면 None)"""
+    if httpx is None:
+        logger.warning("httpx 가 설치되지 않아 HTTP/1.1 커넥션 풀을 사용합니다 ('pip install httpx[http2]')")
+        return None
+    try:
+        return HTTP2Adapter(max_connections=max_connections, prior_knowledge=prior_knowledge)
+    except ImportError:
+        logger.warning("h2 가 설치되지 않아 HTTP/1.1 커넥션 풀을 사용합니다 ('pip install httpx[http2]')")
+        return None
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    pool_block: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+    transport: str = TRANSPORT_HTTP1,
+) -> requests.Session:
+    """커넥션 풀 크기를 지정한 keep-alive 세션 생성 (transport='http2'/'h2c' 면 HTTP/2 어댑터)"""
+    if transport not in TRANSPORTS:
+        raise ValueError(f"알 수 없는 전송 방식: {transport}")
+    session = requests.Session()
+    adapter = None
+    if transport != TRANSPORT_HTTP1:
+        adapter = create_http2_adapter(pool_maxsize, prior_knowledge=transport == TRANSPORT_H2C)
+    if adapter is None:
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=0,
+        )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+def transport_stats(session: requests.Session) -> Dict[str, Any]:
+    """세션의 전송 방식 (HTTP/2 어댑터면 협상된 버전별 응답 수와 GOAWAY 재전송 수도)"""
+    adapter = session.get_adapter('https://')
+    if isinstance(adapter, HTTP2Adapter):
+        with adapter._lock:
+            return {'transport': adapter.transport, 'versions': dict(adapter.versions), 'goaway_retries': adapter.goaway_retries}
+    return {'transport': TRANSPORT_HTTP1}
+
+
+def get_shared_session() -> requests.Session:
+    """프로세스 전체에서 공유하는 세션 반환 (최초 호출 시 생성)
+
+    풀 크기는 MUSEUM_API_POOL_CONNECTIONS / MUSEUM_API_POOL_MAXSIZE,
+    전송 방식은 MUSEUM_API_TRANSPORT(http1|http2|h2c) 환경변수로 조정할 수 있다.
+    MUSEUM_API_CASSETTE 를 지정하면
+    MUSEUM_API_CASSETTE_MODE(record|replay, 기본 replay)에 따라 응답을 녹화하거나 재생한다.
+    """
+    global _shared_session
+    if _shared_session is None:
+        with _shared_lock:
+            if _shared_session is None:
+                pool_connections = int(os.getenv('MUSEUM_API_POOL_CONNECTIONS', DEFAULT_POOL_CONNECTIONS))
+                pool_maxsize = int(os.getenv('MUSEUM_API_POOL_MAXSIZE', DEFAULT_POOL_MAXSIZE))
+                session = create_session(
+                    pool_connections=pool_connections,
+                    pool_maxsize=pool_maxsize,
+                    transport=os.getenv('MUSEUM_API_TRANSPORT', TRANSPORT_HTTP1),
+                )
+                cassette_path = os.getenv('MUSEUM_API_CASSETTE')
+                if cassette_path:
+                    from museum_cassette import install_cassette
+                    install_cassette(
+                        session, cassette_path, os.getenv('MUSEUM_API_CASSETTE_MODE', 'replay'),
+                        pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                    )
+                _shared_session = session
+    return _shared_session
+
+
+def close_shared_session() -> None:
+    """공유 세션의 커넥션을 모두 닫는다"""
+    global _shared_session
+    with _shared_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
@@ -0,0 +1,72 @@
+"""
+대역 서버(museum_standin.py)로 돌리는 오프라인 회귀 테스트 공용 설정
+
+실제 API 키, 네트워크, 디스크 캐시 없이 같은 결과가 나오도록
+공유 캐시를 끄고 공유 토큰 버킷 한도를 크게 둔다.
+"""
+
+import logging
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)   # 대역 서버 카탈로그가 src/data/artworks.json 을 상대 경로로 읽는다
+
+# update_artworks 가 import 시 museum_api.log 에 로그를 남기지 않도록 루트 로거를 먼저 설정
+logging.getLogger().addHandler(logging.NullHandler())
+os.environ['MUSEUM_API_KEY'] = 'test'
+os.environ['MUSEUM_API_CACHE'] = '0'
+os.environ['MUSEUM_API_RATE'] = '100000'
+os.environ['MUSEUM_API_BURST'] = '100000'
+os.environ.pop('MUSEUM_API_CASSETTE', None)
+os.environ.pop('MUSEUM_API_BASE_URL', None)
+
+from museum_rate_limit import TokenBucket  # noqa: E402
+from museum_retry import CircuitBreaker, RetryBudget, RetryController, RetryPolicy  # noqa: E402
+from museum_standin import start_standin_server  # noqa: E402
+from museum_transport import create_session  # noqa: E402
+from update_artworks import MuseumAPIClient  # noqa: E402
+
+TEST_RELICS = 400
+
+
+def fast_retry(max_attempts: int = 3, failure_threshold: int = 5) -> RetryController:
+    """대기 없이 바로 다시 시도하는 재시도 정책"""
+    policy = RetryPolicy(max_attempts=max_attempts, base_delay=0.0, max_delay=0.0)
+    return RetryController(
+        policies={error: policy for error in ('timeout', 'connection', 'throttled', 'server', 'xml_error')},
+        budget=RetryBudget(min_reserve=1000.0, max_reserve=1000.0),
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, recovery_timeout=60.0),
+    )
+
+
+@pytest.fixture
+def standin():
+    """테스트마다 새로 띄우는 대역 서버 (통계가 섞이지 않도록)"""
+    server = start_standin_server(relics=TEST_RELICS)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_client(monkeypatch):
+    """대역 서버를 가리키는 클라이언트 생성기 (전용 세션, 캐시 없음, 빠른 재시도)"""
+    clients = []
+
+    def factory(server, **options):
+        monkeypatch.setenv('MUSEUM_API_BASE_URL', server.base_url)
+        options.setdefault('session', create_session())
+        options.setdefault('use_cache', False)
+        options.setdefault('rate_limiter', TokenBucket(100000, 100000))
+        options.setdefault('retry', fast_retry())
+        client = MuseumAPIClient(**options)
+        clients.append(client)
+        return client
+
+    yield factory
+    for client in clients:
+        client.close()
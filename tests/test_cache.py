@@ -0,0 +1,67 @@
+import pytest
+
+import museum_cache
+from museum_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        self.now += 1.0
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(museum_cache, 'time', clock)
+    return clock
+
+
+def detail(n, padding=0):
+    return {'response': {'body': {'items': [{'id': f'R{n}', 'name': 'x' * padding}]}}}
+
+
+def keys(cache):
+    return {row[0] for row in cache._conn.execute('SELECT key FROM responses')}
+
+
+def test_entry_limit_evicts_least_recently_used(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_entries=10)
+    for n in range(10):
+        cache.set('relic/detail', {'id': n}, detail(n))
+    cache.get('relic/detail', {'id': 0})            # 0 을 최근에 쓴 항목으로
+    cache.set('relic/detail', {'id': 10}, detail(10))
+    remaining = keys(cache)
+    assert len(remaining) == 9                       # 상한의 90% 까지 줄임
+    assert 'relic/detail?id=0' in remaining
+    assert 'relic/detail?id=1' not in remaining and 'relic/detail?id=2' not in remaining
+    assert cache.stats()['entries'] == 9
+
+
+def test_byte_limit_evicts_oldest(tmp_path, clock):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), max_bytes=1000)
+    for n in range(5):
+        cache.set('relic/detail', {'id': n}, detail(n, padding=200))
+    stats = cache.stats()
+    assert stats['bytes'] <= 900
+    assert 'relic/detail?id=4' in keys(cache) and 'relic/detail?id=0' not in keys(cache)
+
+
+def test_totals_follow_replace_invalidate_and_reopen(tmp_path, clock):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = ResponseCache(path)
+    cache.set('relic/detail', {'id': 1}, detail(1, padding=10))
+    cache.set('relic/detail', {'id': 1}, detail(1, padding=50))     # 같은 키를 덮어씀
+    cache.set('relic/list', {'pageNo': 1}, detail(2))
+    actual = cache._totals()
+    assert (cache.stats()['entries'], cache.stats()['bytes']) == tuple(actual) and actual[0] == 2
+    cache.close()
+
+    reopened = ResponseCache(path)
+    assert reopened.stats()['entries'] == 2
+    reopened.invalidate('relic/list')
+    assert reopened.stats()['entries'] == 1
+    assert reopened.stats()['bytes'] == reopened._totals()[1]
@@ -0,0 +1,46 @@
+import pytest
+
+from conftest import fast_retry
+from museum_cassette import MODE_RECORD, MODE_REPLAY, install_cassette
+from museum_transport import create_session
+from update_artworks import RelicPageError, extract_page
+
+
+def cassette_client(server, make_client, path, mode):
+    session = create_session()
+    install_cassette(session, path, mode)
+    return make_client(server, session=session, retry=fast_retry(max_attempts=3))
+
+
+@pytest.fixture
+def recorded(standin, make_client, tmp_path):
+    """relic/list 세 페이지(스트리밍)와 상세 하나를 녹화한 cassette 경로"""
+    path = str(tmp_path / 'cassette.json')
+    client = cassette_client(standin, make_client, path, MODE_RECORD)
+    standin.state.max_page_size = 150
+    assert len(list(client.iter_relics(page_size=150, stream=True))) == len(standin.state.catalog)
+    assert client.get_relic_detail(standin.state.catalog[0]['id']) is not None
+    return path
+
+
+def test_replay_serves_recorded_detail_without_server(standin, make_client, recorded):
+    before = standin.state.stats.get('relic/detail', 0)
+    client = cassette_client(standin, make_client, recorded, MODE_REPLAY)
+    _, items = extract_page(client.get_relic_detail(standin.state.catalog[0]['id']))
+    assert items[0]['id'] == standin.state.catalog[0]['id']
+    assert standin.state.stats.get('relic/detail', 0) == before
+
+
+def test_replay_supports_streamed_pages(standin, make_client, recorded):
+    client = cassette_client(standin, make_client, recorded, MODE_REPLAY)
+    ids = [item['id'] for item in client.iter_relics(page_size=150, stream=True)]
+    assert ids == [relic['id'] for relic in standin.state.catalog]
+
+
+def test_cassette_miss_is_not_retried(standin, make_client, recorded):
+    client = cassette_client(standin, make_client, recorded, MODE_REPLAY)
+    assert client.get_relic_detail('PS0100100100999999') is None
+    assert client.retry.budget.retries == 0
+    with pytest.raises(RelicPageError):
+        list(client.iter_relics({'keyword': '녹화 안 됨'}, stream=True))
+    assert client.retry.budget.retries == 0
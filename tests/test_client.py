@@ -0,0 +1,111 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from museum_cache import ResponseCache
+from museum_retry import CircuitOpenError
+from museum_standin import start_standin_server
+from update_artworks import extract_page, next_relic_page
+
+from conftest import fast_retry
+
+
+@pytest.fixture
+def failing():
+    server = start_standin_server(relics=150, error_rate=1.0, error_mode='http')
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_detail_round_trip(standin, make_client):
+    relic = standin.state.catalog[5]
+    _, items = extract_page(make_client(standin).get_relic_detail(relic['id']))
+    assert items[0]['id'] == relic['id']
+    assert items[0]['name'] == relic['name']
+
+
+def test_memo_coalesces_concurrent_calls(standin, make_client):
+    client = make_client(standin)
+    relic_id = standin.state.catalog[0]['id']
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: client.get_relic_detail(relic_id), range(16)))
+    assert all(result == results[0] for result in results)
+    assert standin.state.stats['relic/detail'] == 1
+
+
+def test_cache_serves_fresh_entries_without_request(standin, make_client, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'))
+    relic_id = standin.state.catalog[0]['id']
+    first = make_client(standin, cache=cache, use_cache=True).get_relic_detail(relic_id)
+    second = make_client(standin, cache=cache, use_cache=True).get_relic_detail(relic_id)
+    assert first == second
+    assert standin.state.stats['relic/detail'] == 1
+    assert cache.stats()['hits'] == 1
+
+
+def test_cache_revalidates_stale_entries(standin, make_client, tmp_path):
+    cache = ResponseCache(str(tmp_path / 'cache.sqlite'), ttls={'relic/detail': 0})
+    relic_id = standin.state.catalog[0]['id']
+    first = make_client(standin, cache=cache, use_cache=True).get_relic_detail(relic_id)
+    second = make_client(standin, cache=cache, use_cache=True).get_relic_detail(relic_id)
+    assert first == second
+    assert standin.state.stats['relic/detail'] == 2
+    assert standin.state.stats['not_modified'] == 1
+
+
+def test_server_errors_are_retried_then_given_up(failing, make_client):
+    client = make_client(failing, retry=fast_retry(max_attempts=3, failure_threshold=100))
+    assert client.get_relic_detail('PS0100100100000000') is None
+    assert failing.state.stats['relic/detail'] == 3
+    assert client.retry.stats()['retries'] == 2
+
+
+def test_breaker_opens_after_consecutive_failures(failing, make_client):
+    client = make_client(failing, retry=fast_retry(max_attempts=1, failure_threshold=3))
+    for n in range(3):
+        client.get_relic_detail(f'id{n}')
+    with pytest.raises(CircuitOpenError):
+        client.get_relic_detail('id3')
+    assert failing.state.stats['relic/detail'] == 3
+
+
+def test_next_relic_page():
+    assert next_relic_page(1, 200, 100, 1000) == (2, 100)    # 서버가 100건으로 줄임
+    assert next_relic_page(2, 100, 100, 1000) == (3, 100)
+    assert next_relic_page(10, 100, 100, 1000) is None
+    assert next_relic_page(3, 100, 40, 240) is None          # 마지막 페이지
+    assert next_relic_page(1, 100, 0, 50) is None
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_iter_relics_follows_capped_page_size(standin, make_client, stream):
+    standin.state.max_page_size = 30
+    client = make_client(standin)
+    ids = [item['id'] for item in client.iter_relics(page_size=100, stream=stream)]
+    assert len(ids) == len(set(ids)) == len(standin.state.catalog)
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_iter_relics_max_items_with_capped_page_size(standin, make_client, stream):
+    standin.state.max_page_size = 30
+    client = make_client(standin)
+    ids = [item['id'] for item in client.iter_relics(page_size=100, max_items=75, stream=stream)]
+    assert ids == [relic['id'] for relic in standin.state.catalog[:75]]
+
+
+def test_async_iter_relics_follows_capped_page_size(standin, monkeypatch):
+    pytest.importorskip('aiohttp')
+    from museum_async import AsyncMuseumAPIClient
+    from museum_rate_limit import TokenBucket
+
+    monkeypatch.setenv('MUSEUM_API_BASE_URL', standin.base_url)
+    standin.state.max_page_size = 30
+
+    async def collect():
+        async with AsyncMuseumAPIClient(use_cache=False, rate_limiter=TokenBucket(100000, 100000), retry=fast_retry()) as client:
+            return [item['id'] async for item in client.iter_relics(page_size=100)]
+
+    ids = asyncio.run(collect())
+    assert len(ids) == len(set(ids)) == len(standin.state.catalog)
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+import museum_codes
+from museum_codes import CODES_VERSION, CodeTables, build_query, filter_items
+from museum_engine import MuseumEngine
+from museum_standin import ERAS, MATERIALS, MUSEUMS
+
+
+def code_items(extra=()):
+    groups = (('museum', MUSEUMS), ('era', ERAS), ('material', MATERIALS))
+    items = [{'groupCode': group, 'code': code, 'name': name} for group, codes in groups for code, name in codes]
+    return items + list(extra)
+
+
+class FakeClient:
+    def __init__(self, items):
+        self.items = items
+        self.calls = 0
+
+    def get_code_list(self):
+        self.calls += 1
+        if self.items is None:
+            return None
+        return {'response': {'body': {'totalCount': len(self.items), 'items': self.items}}}
+
+
+@pytest.fixture
+def codes(tmp_path):
+    codes = CodeTables(str(tmp_path / 'codes.json'))
+    codes.refresh(FakeClient(code_items()))
+    return codes
+
+
+def test_lookup_by_code_name_prefix_and_substring(codes):
+    assert codes.lookup('museum', 'PS01002001') == 'PS01002001'
+    assert codes.lookup('museum', '국립경주박물관') == 'PS01002001'
+    assert codes.lookup('era', '고려') == 'PC07'               # 앞부분 일치
+    assert codes.lookup('museum', '경주') == 'PS01002001'      # 부분 일치
+    assert codes.lookup('material', '금') == 'PM03'            # 완전 일치가 먼저
+    assert codes.name('era', 'PC07') == '고려시대'
+
+
+def test_unknown_or_ambiguous_codes(codes):
+    assert codes.lookup('museum', '국립') is None              # 여러 박물관이 걸린다
+    assert codes.lookup('museum', '루브르') is None
+    assert codes.lookup('era', 'PC99') is None
+    assert codes.lookup('era', '') is None
+    assert codes.lookup('nosuchgroup', '고려') is None
+    assert codes.name('era', 'PC99') == ''
+
+
+def test_build_query_with_codes(codes):
+    params, leftover = build_query({
+        'title': ' 청자 매병 ', 'inventory': '본관 1234, 본관 1235',
+        'museum': '국립중앙박물관', 'era': '고려', 'material': '도자기',
+    }, codes)
+    assert params == {
+        'name': '청자 매병', 'manageNo': '본관1234',
+        'museumCode': 'PS01001001', 'nationalityCode': 'PC07', 'materialCode': 'PM04',
+    }
+    assert leftover == {}
+
+
+def test_build_query_leaves_unmapped_filters(codes):
+    params, leftover = build_query({'keyword': '금관', 'museum': '국립', 'era': '고려'}, codes)
+    assert params == {'name': '금관', 'nationalityCode': 'PC07'}
+    assert leftover == {'museum': '국립'}
+    # 코드표가 없으면 분류 조건은 모두 남는다
+    params, leftover = build_query({'name': '금관', 'manageNo': '경주 1', 'material': '금'})
+    assert params == {'name': '금관', 'manageNo': '경주1'} and leftover == {'material': '금'}
+    assert build_query({}) == ({}, {})
+
+
+def test_filter_items_applies_leftover_to_name_fields():
+    items = [
+        {'museumName': '국립경주박물관', 'era': '통일신라', 'material': '금'},
+        {'museumName': '국립중앙박물관', 'era': '통일 신라', 'material': '청동'},
+        {'museumName': None, 'era': '통일신라'},
+    ]
+    assert filter_items(items, {'era': '통일신라'}) == items
+    assert filter_items(items, {'museum': '경주', 'era': '통일신라'}) == items[:1]
+    assert filter_items(items, {}) == items
+
+
+def test_refresh_saves_and_reloads_until_stale(codes, tmp_path, monkeypatch):
+    client = FakeClient(code_items())
+    reloaded = CodeTables(codes.path)
+    assert reloaded.groups == codes.groups and reloaded.revision == codes.revision
+    assert reloaded.refresh(client) is False and client.calls == 0
+    assert reloaded.refresh(client, force=True) is False and client.calls == 1   # 내용이 같으면 revision 그대로
+
+    now = museum_codes.time.time()
+    monkeypatch.setattr(museum_codes.time, 'time', lambda: now + reloaded.ttl + 1)
+    assert reloaded.is_stale()
+    client.items = code_items([{'groupCode': 'era', 'code': 'PC11', 'name': '현대'}])
+    assert reloaded.refresh(client) is True and client.calls == 2
+    assert reloaded.lookup('era', '현대') == 'PC11' and reloaded.revision != codes.revision
+    assert reloaded.stats()['groups'] == {'museum': len(MUSEUMS), 'era': len(ERAS) + 1, 'material': len(MATERIALS)}
+
+
+def test_failed_refresh_keeps_the_old_copy(codes):
+    revision = codes.revision
+    assert codes.refresh(FakeClient(None), force=True) is False
+    assert codes.revision == revision and codes.lookup('era', '고려') == 'PC07'
+
+
+def test_old_version_file_is_ignored(tmp_path):
+    path = tmp_path / 'codes.json'
+    path.write_text(json.dumps({'version': CODES_VERSION + 1, 'groups': {'era': {'PC07': '고려시대'}}}), encoding='utf-8')
+    codes = CodeTables(str(path))
+    assert codes.groups == {} and codes.is_stale()
+
+
+def test_engine_query_sends_codes_to_the_server(standin, make_client, tmp_path):
+    codes = CodeTables(str(tmp_path / 'codes.json'))
+    with MuseumEngine(make_client(standin), codes=codes) as engine:
+        items = engine.query({'era': '고려', 'material': '도자기'}, size=50)
+        assert items and all(item['era'] == '고려시대' and item['material'] == '도자기' for item in items)
+        assert engine.query({'museum': '루브르'}, size=50) == []
+    assert codes.revision and codes.lookup('era', '고려') == 'PC07'
@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from museum_concurrency import ERROR_SERVER, ERROR_THROTTLED, AIMDController
+from museum_rate_limit import TokenBucket
+
+
+def test_healthy_responses_grow_the_window_additively():
+    controller = AIMDController(initial_window=2, max_window=4, latency_target=1.0)
+    controller.record(0.01)
+    assert controller.window == 2.5          # 응답마다 increase / window 씩
+    controller.record(0.01)
+    assert controller.window == pytest.approx(2.9)
+    for _ in range(50):
+        controller.record(0.01)
+    assert controller.window == 4.0          # max_window 에서 멈춤
+
+
+def test_backoff_errors_halve_the_window_once_per_congestion():
+    controller = AIMDController(initial_window=16, latency_target=1.0)
+    controller.record(0.05, ERROR_THROTTLED)
+    assert controller.window == 8.0
+    controller.record(0.05, ERROR_SERVER)    # 같은 혼잡에 대한 연이은 오류는 한 번만 줄인다
+    assert controller.window == 8.0
+    controller._last_decrease -= 1.0
+    controller.record(0.05, ERROR_SERVER)
+    assert controller.window == 4.0
+    assert controller.metrics()['decreases'] == 2
+
+
+def test_slow_p95_shrinks_and_errors_block_growth():
+    controller = AIMDController(initial_window=8, min_window=2, latency_target=0.5, error_rate_threshold=0.05)
+    controller.record(2.0)
+    assert controller.window == 4.0
+    controller = AIMDController(initial_window=4, latency_target=1.0, error_rate_threshold=0.05)
+    controller.record(0.01, 'connection')    # 줄이지는 않지만 오류율이 높으면 늘리지도 않는다
+    controller.record(0.01)
+    assert controller.window == 4.0
+
+
+def test_sync_slot_bounds_threads_to_the_window():
+    controller = AIMDController(initial_window=2, max_window=2)
+    peak, active, lock = [0], [0], threading.Lock()
+
+    def work():
+        with controller.sync_slot() as slot:
+            slot.start()
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert peak[0] == 2
+    assert controller.metrics()['completed'] == 8
+
+
+def test_latency_excludes_rate_limiter_wait(standin, make_client):
+    controller = AIMDController(initial_window=1, max_window=1)
+    client = make_client(standin, rate_limiter=TokenBucket(rate=20, burst=1), controller=controller)
+    for relic in standin.state.catalog[:5]:
+        client.get_relic_detail(relic['id'])
+    # 토큰 간격(50ms)은 표본에 들어가지 않는다
+    assert controller.metrics()['completed'] == 5
+    assert max(controller._latencies) < 0.04
+
+
+def test_engine_reports_the_window(standin, make_client):
+    from museum_engine import MuseumEngine
+
+    client = make_client(standin, adaptive=True)
+    with MuseumEngine(client, workers=4) as engine:
+        engine.fetch_all([relic['id'] for relic in standin.state.catalog[:20]])
+        assert engine.last_stats['concurrency']['completed'] == 20
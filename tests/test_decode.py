@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from museum_decode import DecodeError, decode_response, iter_json_items, iter_response_items
+
+ITEMS = [{'id': f'R{n}', 'name': f'유물 {n}', 'imageList': [{'imgUrl': f'u{n}'}]} for n in range(5)]
+JSON_BODY = json.dumps({
+    'response': {
+        'header': {'resultCode': '0000', 'resultMsg': 'OK'},
+        'body': {'totalCount': 42, 'pageNo': 1, 'numOfRows': 5, 'items': ITEMS},
+    },
+}, ensure_ascii=False).encode('utf-8')
+XML_BODY = (
+    '<?xml version="1.0" encoding="UTF-8"?><response><header><resultCode>0000</resultCode>'
+    '<resultMsg>OK</resultMsg></header><body><totalCount>42</totalCount><items>'
+    + ''.join(f'<item><id>R{n}</id><name>유물 {n}</name><imageList><list><imgUrl>u{n}</imgUrl></list></imageList></item>' for n in range(5))
+    + '</items></body></response>'
+).encode('utf-8')
+XML_ERROR = (
+    '<OpenAPI_ServiceResponse><cmmMsgHeader><errMsg>SERVICE ERROR</errMsg>'
+    '<returnAuthMsg>LIMITED_NUMBER_OF_SERVICE_REQUESTS_EXCEEDS_ERROR</returnAuthMsg></cmmMsgHeader></OpenAPI_ServiceResponse>'
+).encode('utf-8')
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_json_and_xml_decode_alike():
+    from_json = decode_response(JSON_BODY, 'application/json')['response']['body']
+    from_xml = decode_response(XML_BODY, 'application/json')['response']['body']   # 본문으로 형식 판별
+    assert from_json['totalCount'] == from_xml['totalCount'] == 42
+    assert [item['id'] for item in from_json['items']] == [item['id'] for item in from_xml['items']]
+    assert from_xml['items'][0]['imageList'] == [{'imgUrl': 'u0'}]
+
+
+def test_bom_prefixed_json():
+    assert decode_response(b'\xef\xbb\xbf' + JSON_BODY)['response']['body']['totalCount'] == 42
+
+
+def test_xml_error_body_is_an_api_error():
+    with pytest.raises(DecodeError) as info:
+        decode_response(XML_ERROR, 'application/json')
+    assert info.value.api_error
+
+
+def test_json_result_code_error():
+    body = json.dumps({'response': {'header': {'resultCode': '99', 'resultMsg': 'LIMIT'}, 'body': {}}}).encode()
+    with pytest.raises(DecodeError) as info:
+        decode_response(body)
+    assert info.value.api_error
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 64, 100000])
+def test_json_scanner_matches_full_decode_at_any_chunk_size(size):
+    fields = {}
+    items = list(iter_json_items(chunked(JSON_BODY, size), fields.__setitem__))
+    assert items == decode_response(JSON_BODY)['response']['body']['items']
+    assert fields['totalCount'] == 42
+    assert fields['resultCode'] == '0000'
+
+
+@pytest.mark.parametrize('size', [1, 16, 100000])
+def test_streamed_xml_matches_full_decode(size):
+    fields = {}
+    items = list(iter_response_items(chunked(XML_BODY, size), 'text/xml', fields.__setitem__))
+    assert items == decode_response(XML_BODY)['response']['body']['items']
+    assert fields['totalCount'] == 42
+
+
+def test_truncated_json_stream_raises():
+    with pytest.raises(DecodeError):
+        list(iter_json_items(chunked(JSON_BODY[:len(JSON_BODY) // 2], 10)))
@@ -0,0 +1,111 @@
+import pytest
+
+from conftest import fast_retry
+from museum_engine import STATUS_DETAIL_FAILED, STATUS_ERROR, STATUS_NOT_FOUND, STATUS_SUCCESS, MuseumEngine
+from museum_match import Match
+from museum_resolution import ResolutionCache
+from update_artworks import extract_page
+
+
+@pytest.fixture
+def engine(standin, make_client, tmp_path):
+    client = make_client(standin, retry=fast_retry(max_attempts=1, failure_threshold=1000))
+    engine = MuseumEngine(client, workers=2, resolutions=ResolutionCache(str(tmp_path / 'resolutions.json')))
+    yield engine
+    engine.close()
+
+
+def catalog_target(standin):
+    relic = standin.state.catalog[0]
+    return {'title': relic['name'], 'inventory': relic['collection'], 'titleEn': '', 'museum': ''}
+
+
+def test_failed_search_is_not_cached_as_not_found(standin, engine):
+    target = catalog_target(standin)
+    standin.state.error_rate, standin.state.error_mode = 1.0, 'http'
+    job = engine.resolve(target)
+    assert job['status'] == STATUS_NOT_FOUND and job['request_failed']
+    assert engine.resolutions.get_failure(target) is None
+
+    standin.state.error_rate = 0.0
+    job = engine.resolve(target)
+    assert job['relic_id'] == standin.state.catalog[0]['id']
+
+
+def test_zero_hits_are_cached_as_not_found(engine):
+    target = {'title': '존재하지 않는 유물', 'inventory': '', 'titleEn': '', 'museum': ''}
+    job = engine.resolve(target)
+    assert 'request_failed' not in job
+    assert engine.resolutions.get_failure(target)['reason'] == STATUS_NOT_FOUND
+    assert engine.resolve(target)['skipped']
+
+
+def test_failed_detail_is_not_cached(standin, engine):
+    target = catalog_target(standin)
+    job = engine.resolve(target)
+    standin.state.error_rate, standin.state.error_mode = 1.0, 'http'
+    outcome = engine._detail_stage(job)
+    assert outcome['status'] == STATUS_DETAIL_FAILED and outcome['request_failed']
+    assert engine.resolutions.get_failure(target) is None
+
+
+def test_missing_detail_is_cached(engine):
+    target = {'title': '없는 유물', 'inventory': '', 'titleEn': '', 'museum': ''}
+    outcome = engine._detail_stage(dict(target, relic_id='PS0100100100999999', matched_by='title', score=1.0))
+    assert outcome['status'] == STATUS_DETAIL_FAILED and 'request_failed' not in outcome
+    assert engine.resolutions.get_failure(target)['reason'] == STATUS_DETAIL_FAILED
+
+
+def speculative_job(ids):
+    items = [{'id': relic_id, 'name': f'후보 {n}', 'collection': ''} for n, relic_id in enumerate(ids)]
+    candidates = [Match(item, 1.0, 'title') for item in items]
+    return {'title': '후보', 'relic_id': ids[0], 'item': items[0], 'matched_by': 'title', 'score': 1.0,
+            'candidates': candidates}
+
+
+def test_speculation_counts_all_requests_wasted_without_a_winner(standin, make_client):
+    with MuseumEngine(make_client(standin), speculative=3) as engine:
+        job, relic, failed = engine._fetch_speculative(speculative_job(['NONE1', 'NONE2', 'NONE3']))
+        assert relic is None and not failed
+        assert engine.speculation['wasted'] + engine.speculation['cancelled'] == 3
+
+
+def test_speculation_does_not_count_the_winner_as_wasted(standin, make_client):
+    with_images = [relic['id'] for relic in standin.state.catalog if relic['imageList']][:3]
+    with MuseumEngine(make_client(standin), speculative=3) as engine:
+        job, relic, _ = engine._fetch_speculative(speculative_job(with_images))
+        assert relic.id == with_images[0]
+        assert engine.speculation['wasted'] + engine.speculation['cancelled'] == 2
+
+
+def test_resolve_batch_leaves_memoized_first_page_intact(standin, make_client):
+    standin.state.max_page_size = 20
+    members = [relic for relic in standin.state.catalog if relic['collection'].replace(' ', '').startswith('본관')][:3]
+    targets = [{'title': relic['name'], 'inventory': relic['collection'], 'titleEn': '', 'museum': ''} for relic in members]
+    client = make_client(standin)
+    with MuseumEngine(client, workers=2) as engine:
+        jobs = engine.resolve_batch(targets, page_size=20, max_pages=10)
+        assert [job['relic_id'] for job in jobs] == [relic['id'] for relic in members]
+        assert engine.last_stats['batch']['listed'] > 20
+        _, items = extract_page(client.list_relics({'manageNo': '본관'}, page=1, size=20))
+        assert len(items) == 20
+
+
+def test_stage_exception_keeps_the_outcome_in_place(standin, engine, monkeypatch):
+    relics = standin.state.catalog[:3]
+    targets = [{'title': relic['name'], 'inventory': relic['collection'], 'titleEn': '', 'museum': ''} for relic in relics]
+    fetch_detail = engine._fetch_detail
+
+    def broken_for_second(relic_id, item=None):
+        if relic_id == relics[1]['id']:
+            raise ValueError('깨진 응답')
+        return fetch_detail(relic_id, item)
+
+    monkeypatch.setattr(engine, '_fetch_detail', broken_for_second)
+    outcomes = engine.images(targets)
+    assert [outcome['inventory'] for outcome in outcomes] == [target['inventory'] for target in targets]
+    assert outcomes[1]['status'] == STATUS_ERROR and '깨진 응답' in outcomes[1]['error']
+    assert outcomes[1]['relic_id'] == relics[1]['id'] and 'item' not in outcomes[1]
+    assert outcomes[0]['status'] != STATUS_ERROR and outcomes[2]['status'] != STATUS_ERROR
+    # 예외는 실패 기록으로 남기지 않으므로 다음 실행에서 다시 시도한다
+    assert engine.resolutions.get_failure(targets[1], (STATUS_DETAIL_FAILED,)) is None
@@ -0,0 +1,42 @@
+import json
+
+import pytest
+
+from museum_harvest import Harvester
+
+
+def read_ids(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line)['id'] for line in f]
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_harvest_follows_capped_page_size(standin, make_client, tmp_path, stream):
+    standin.state.max_page_size = 30
+    output = str(tmp_path / 'relics.jsonl')
+    checkpoint = Harvester(make_client(standin), output, page_size=100, details=False, stream=stream).run()
+    ids = read_ids(output)
+    assert checkpoint.completed and checkpoint.total == len(standin.state.catalog)
+    assert len(ids) == len(set(ids)) == len(standin.state.catalog)
+    assert checkpoint.next_size == 30
+
+
+def test_harvest_resume_with_capped_page_size(standin, make_client, tmp_path):
+    standin.state.max_page_size = 30
+    output = str(tmp_path / 'relics.jsonl')
+    client = make_client(standin)
+    first = Harvester(client, output, page_size=100, details=False, checkpoint_every=7).run(max_items=95)
+    assert not first.completed and first.written == 95
+    checkpoint = Harvester(client, output, page_size=100, details=False).run(resume=True)
+    ids = read_ids(output)
+    assert checkpoint.completed
+    assert ids == [relic['id'] for relic in standin.state.catalog]
+
+
+def test_harvest_short_listing_is_not_completed(standin, make_client, tmp_path, monkeypatch):
+    search = standin.state.search
+    monkeypatch.setattr(standin.state, 'search', lambda params: (search(params)[0] + 50, search(params)[1]))
+    output = str(tmp_path / 'relics.jsonl')
+    checkpoint = Harvester(make_client(standin), output, page_size=100, details=False).run()
+    assert checkpoint.written == len(standin.state.catalog)
+    assert not checkpoint.completed
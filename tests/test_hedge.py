@@ -0,0 +1,70 @@
+import threading
+import time
+
+from museum_hedge import Hedger
+
+
+def warmed(**options):
+    hedger = Hedger(min_samples=5, **options)
+    hedger.samples.extend([0.01] * 5)      # delay() = MIN_HEDGE_DELAY
+    return hedger
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_fast_path_runs_inline_without_samples():
+    hedger = Hedger(min_samples=5)
+    caller = threading.current_thread()
+    assert hedger.call(lambda: threading.current_thread() is caller) is True
+    assert hedger.stats()['requests'] == 1 and len(hedger.samples) == 1
+    hedger.close()
+
+
+def test_hedge_wins_and_slow_primary_is_sampled():
+    hedger = warmed(max_ratio=1.0)
+    calls = []
+    lock = threading.Lock()
+
+    def fn():
+        with lock:
+            calls.append(1)
+            first = len(calls) == 1
+        if first:
+            time.sleep(0.3)
+            return 'primary'
+        return 'hedge'
+
+    assert hedger.call(fn) == 'hedge'
+    assert hedger.stats()['hedge_wins'] == 1
+    # 원래 요청이 끝나면 그 지연(0.3초)이 표본에 들어간다
+    assert wait_for(lambda: len(hedger.samples) == 6)
+    assert max(hedger.samples) >= 0.3
+    hedger.close()
+
+
+def test_hedge_rate_is_capped():
+    hedger = warmed(max_ratio=0.1)
+    hedger.samples.extend([0.01] * 200)    # 느린 표본 10개로는 p90 이 움직이지 않는다
+
+    def slow():
+        time.sleep(0.05)
+        return 'ok'
+
+    for _ in range(10):
+        assert hedger.call(slow) == 'ok'
+    stats = hedger.stats()
+    assert stats['hedged'] == 1 and stats['denied'] == 9
+    hedger.close()
+
+
+def test_fast_response_is_not_hedged():
+    hedger = warmed(max_ratio=1.0)
+    hedger.samples.extend([1.0] * 5)       # p90 이 충분히 길다
+    assert hedger.call(lambda: 'ok') == 'ok'
+    assert hedger.stats()['hedged'] == 0
+    hedger.close()
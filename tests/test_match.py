@@ -0,0 +1,52 @@
+from museum_engine import MuseumEngine
+from museum_match import CandidateIndex, normalize_inventory, split_inventory
+
+ITEMS = [
+    {'id': 'A', 'name': '금관', 'nameEng': '', 'collection': '경주 1'},
+    {'id': 'B', 'name': '황남대총 북분 금관', 'nameEng': '', 'collection': '본관 11377'},
+    {'id': 'C', 'name': '청동 방울', 'nameEng': '', 'collection': '본관 2426'},
+    {'id': 'D', 'name': '빗살무늬토기', 'nameEng': '', 'collection': '암사 123'},
+]
+
+
+def test_normalize_inventory():
+    assert normalize_inventory('본관 02426') == '본관2426'
+    assert normalize_inventory('m 67') == 'M67'
+    assert split_inventory('본관11377, 본관10824') == ['본관11377', '본관10824']
+
+
+def test_inventory_hit_outranks_exact_title():
+    index = CandidateIndex(ITEMS)
+    target = {'title': '금관', 'inventory': '본관11377'}
+    best = index.best(target)
+    assert best.item['id'] == 'B' and best.matched_by == 'inventory'
+    assert [match.item['id'] for match in index.match(target, k=2)] == ['B', 'A']
+
+
+def test_title_only_match():
+    best = CandidateIndex(ITEMS).best({'title': '빗살무늬토기'})
+    assert best.item['id'] == 'D' and best.matched_by == 'title' and best.score == 1.0
+
+
+def test_inventory_only_match():
+    best = CandidateIndex(ITEMS).best({'title': '', 'inventory': '암사 0123'})
+    assert best.item['id'] == 'D' and best.score == 1.0
+
+
+def test_weak_inventory_hit_is_not_replaced_by_title_candidate():
+    # 번호는 C 와 맞지만 명칭이 전혀 다르다: 이름이 같은 A 로 넘어가지 않고 None
+    index = CandidateIndex(ITEMS)
+    target = {'title': '금관', 'inventory': '본관2426'}
+    assert index.match(target, k=1)[0].item['id'] == 'C'
+    assert index.best(target) is None
+
+
+def test_unrelated_title_is_rejected():
+    assert CandidateIndex(ITEMS).best({'title': '백자 달항아리'}) is None
+
+
+def test_engine_pick_prefers_inventory_hit(standin, make_client):
+    engine = MuseumEngine(make_client(standin))
+    job = engine._pick({'title': '금관', 'inventory': '본관11377'}, ITEMS)
+    assert job['relic_id'] == 'B' and job['matched_by'] == 'inventory'
+    assert engine._pick({'title': '금관', 'inventory': '본관2426'}, ITEMS) is None
@@ -0,0 +1,47 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from museum_memo import Memoizer
+
+
+def test_lru_evicts_least_recently_used():
+    memo = Memoizer(maxsize=2)
+    memo.call('a', lambda: 1)
+    memo.call('b', lambda: 2)
+    memo.call('a', lambda: 0)      # a 를 최근으로
+    memo.call('c', lambda: 3)      # b 가 밀려남
+    assert memo.call('a', lambda: 0) == 1
+    assert memo.call('b', lambda: 20) == 20
+    assert memo.stats()['size'] == 2
+
+
+def test_none_and_exceptions_are_not_memoized():
+    def fail():
+        raise ValueError('실패')
+
+    memo = Memoizer()
+    assert memo.call('key', lambda: None) is None
+    with pytest.raises(ValueError):
+        memo.call('key', fail)
+    assert memo.call('key', lambda: 'ok') == 'ok'
+
+
+def test_concurrent_calls_share_one_execution():
+    memo = Memoizer()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        release.wait(5)
+        return 'value'
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(memo.call, 'key', slow) for _ in range(4)]
+        while memo.stats()['coalesced'] < 3:
+            threading.Event().wait(0.01)
+        release.set()
+        assert [future.result() for future in futures] == ['value'] * 4
+    assert calls == [1]
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from museum_pipeline import Pipeline, Stage, StageFailure, percentile
+from museum_retry import CircuitOpenError
+
+
+def test_results_keep_input_order_across_workers():
+    def slow_square(n):
+        time.sleep(0.001 * (n % 3))
+        return n * n
+
+    pipeline = Pipeline([Stage('square', slow_square, workers=4), Stage('inc', lambda n: n + 1, workers=2)])
+    assert pipeline.run(range(50)) == [n * n + 1 for n in range(50)]
+    assert pipeline.stats()['stages']['square']['processed'] == 50
+
+
+def test_none_drops_and_exceptions_fail_items():
+    def stage(n):
+        if n == 3:
+            raise ValueError('boom')
+        return None if n % 2 else n
+
+    pipeline = Pipeline([Stage('stage', stage, workers=2)])
+    results = pipeline.run(range(6))
+    assert [result for result in results if not isinstance(result, StageFailure)] == [0, 2, 4]
+    failure = results[2]
+    assert isinstance(failure, StageFailure) and (failure.stage, failure.item) == ('stage', 3)
+    assert isinstance(failure.error, ValueError)
+    stats = pipeline.stats()['stages']['stage']
+    assert (stats['processed'], stats['dropped'], stats['failed']) == (3, 2, 1)
+
+
+def test_failed_items_keep_their_place_through_later_stages():
+    seen = []
+
+    def parse(n):
+        if n % 4 == 1:
+            raise ValueError(f'bad {n}')
+        return n
+
+    def record(n):
+        seen.append(n)
+        return n * 10
+
+    pipeline = Pipeline([Stage('parse', parse, workers=3), Stage('record', record, workers=2)])
+    results = pipeline.run(range(12))
+    assert len(results) == 12
+    for n, result in enumerate(results):
+        if n % 4 == 1:
+            assert isinstance(result, StageFailure) and result.item == n
+        else:
+            assert result == n * 10
+    # 실패한 항목은 뒤 단계 함수에 넘어가지 않는다
+    assert sorted(seen) == [n for n in range(12) if n % 4 != 1]
+    stats = pipeline.stats()['stages']
+    assert stats['parse']['failed'] == 3 and stats['record']['processed'] == 9
+    assert len(pipeline.item_latencies) == 9
+
+
+def test_fatal_error_stops_the_run():
+    def stage(n):
+        if n == 5:
+            raise CircuitOpenError('open')
+        return n
+
+    with pytest.raises(CircuitOpenError):
+        Pipeline([Stage('stage', stage)]).run(range(1000))
+
+
+def test_percentile_nearest_rank():
+    values = sorted(range(1, 101))
+    assert percentile(values, 0.5) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile(values, 1.0) == 100
+    assert percentile([], 0.9) == 0.0
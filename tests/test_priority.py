@@ -0,0 +1,79 @@
+import json
+
+import museum_engine
+from museum_engine import MuseumEngine, make_target
+from museum_priority import CLASS_DESIGNATED, CLASS_FEATURED, CLASS_OTHER, PriorityScheduler, make_priority
+from update_artworks import ARTWORKS_JSON_PATH
+
+ITEMS = [
+    {'id': 1, 'culturalProperty': ''},
+    {'id': 2, 'culturalProperty': '국보 제1호'},
+    {'id': 3, 'featured': True},
+    {'id': 4, 'culturalProperty': '보물'},
+    {'id': 5},
+]
+
+
+def test_priority_order_and_stats():
+    refreshed = {4: 100.0, 2: 50.0}
+    scheduler = PriorityScheduler(ITEMS, make_priority(lambda item: refreshed.get(item['id'], 0.0)))
+    order = [item['id'] for item in scheduler]
+    assert order == [3, 2, 4, 1, 5]     # 대표 → 국보·보물(오래된 것 먼저) → 나머지
+    stats = scheduler.stats()
+    assert list(stats['classes']) == [CLASS_FEATURED, CLASS_DESIGNATED, CLASS_OTHER]
+    assert stats['classes'][CLASS_OTHER]['dispatched'] == 2 and stats['cutoff'] is None
+
+
+def test_limit_cuts_off_and_counts_pending():
+    scheduler = PriorityScheduler(ITEMS, make_priority(), limit=2)
+    assert [item['id'] for item in scheduler] == [3, 2]
+    stats = scheduler.stats()
+    assert stats['cutoff'] == 'limit'
+    assert stats['classes'][CLASS_OTHER]['pending'] == 2
+
+
+def test_track_counts_completed_and_failed():
+    scheduler = PriorityScheduler(ITEMS)
+    tracked = scheduler.track(lambda item: item if item['id'] % 2 else None)
+    for item in scheduler:
+        tracked(item)
+    counts = scheduler.stats()['classes']
+    assert counts[CLASS_OTHER]['completed'] == 2 and counts[CLASS_DESIGNATED]['failed'] == 2
+
+
+def test_batch_images_pull_from_scheduler_one_chunk_at_a_time(standin, make_client, monkeypatch):
+    with open(ARTWORKS_JSON_PATH, 'r', encoding='utf-8') as f:
+        targets = [make_target(artwork) for artwork in json.load(f)]
+    monkeypatch.setattr(museum_engine, 'SCHEDULED_BATCH_SIZE', 10)
+    scheduler = PriorityScheduler(targets, make_priority())
+    engine = MuseumEngine(make_client(standin), workers=2)
+    resolve_batch = engine.resolve_batch
+    chunks = []
+
+    def first_chunk_only(chunk):
+        chunks.append(list(chunk))
+        scheduler.limit = 10    # 첫 묶음을 확인하는 동안 한도에 걸린 것처럼
+        return resolve_batch(chunk)
+
+    monkeypatch.setattr(engine, 'resolve_batch', first_chunk_only)
+    outcomes = engine.images(scheduler, batch=True)
+    assert len(chunks) == 1 and len(outcomes) == 10
+    assert chunks[0] == sorted(targets, key=make_priority())[:10]
+    assert engine.last_stats['priority']['cutoff'] == 'limit'
+
+
+def test_stage_exception_before_tracked_stage_counts_as_failed(standin, make_client, monkeypatch):
+    relics = standin.state.catalog[:4]
+    targets = [{'title': relic['name'], 'inventory': relic['collection'], 'featured': i == 0} for i, relic in enumerate(relics)]
+    scheduler = PriorityScheduler(targets, make_priority())
+    engine = MuseumEngine(make_client(standin), workers=2)
+
+    def broken_resolve(target):
+        raise ValueError('검색 실패')
+
+    monkeypatch.setattr(engine, '_resolve_stage', broken_resolve)
+    outcomes = engine.images(scheduler)
+    assert len(outcomes) == 4 and all(outcome['status'] == museum_engine.STATUS_ERROR for outcome in outcomes)
+    counts = engine.last_stats['priority']['classes']
+    assert counts[CLASS_FEATURED]['failed'] == 1 and counts[CLASS_OTHER]['failed'] == 3
+    assert sum(count['completed'] for count in counts.values()) == 0
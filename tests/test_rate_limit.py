@@ -0,0 +1,105 @@
+import multiprocessing
+
+import pytest
+
+import museum_rate_limit
+from museum_rate_limit import FileTokenBucket, TokenBucket
+
+
+class FakeClock:
+    """monotonic/time/sleep 을 한 시계로 (sleep 은 시계를 그만큼 돌린다)"""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(museum_rate_limit, 'time', clock)
+    return clock
+
+
+def test_burst_is_free_then_rate_paces(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_refill_is_capped_at_burst(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    clock.now += 100.0                 # 오래 쉬어도 burst 만큼만 쌓인다
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [0.5]
+
+
+def test_partial_refill(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    bucket.acquire()
+    clock.now += 0.125                 # 토큰 반 개
+    assert bucket._reserve() == pytest.approx(0.125)
+
+
+def test_waiters_reserve_in_order(clock):
+    bucket = TokenBucket(rate=2, burst=1)
+    assert [bucket._reserve() for _ in range(4)] == [0.0, 0.5, 1.0, 1.5]
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(burst=0)
+
+
+@pytest.mark.skipif(museum_rate_limit.fcntl is None, reason="fcntl 없음")
+def test_file_bucket_state_is_shared_between_instances(clock, tmp_path):
+    path = str(tmp_path / 'limits' / 'rate.state')
+    first, second = FileTokenBucket(path, rate=1, burst=2), FileTokenBucket(path, rate=1, burst=2)
+    assert first._reserve() == 0.0
+    assert second._reserve() == 0.0
+    assert first._reserve() == 1.0     # 두 인스턴스가 burst 2 를 나눠 썼다
+    assert second._reserve() == 2.0
+    clock.now += 10.0
+    assert [first._reserve(), second._reserve(), first._reserve()] == [0.0, 0.0, 1.0]
+
+
+def _reserve_many(path, count, queue):
+    bucket = FileTokenBucket(path, rate=1, burst=4)
+    queue.put([bucket._reserve() for _ in range(count)])
+
+
+@pytest.mark.skipif(museum_rate_limit.fcntl is None, reason="fcntl 없음")
+def test_file_bucket_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / 'rate.state')
+    context = multiprocessing.get_context('fork')
+    queue = context.Queue()
+    workers = [context.Process(target=_reserve_many, args=(path, 4, queue)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    waits = sorted(queue.get(timeout=10) + queue.get(timeout=10))
+    for worker in workers:
+        worker.join(timeout=10)
+    # 8건 중 burst 4건만 바로 나가고, 나머지는 두 프로세스를 합쳐 1초 간격으로 예약된다
+    assert waits[:4] == [0.0] * 4
+    assert waits[4:] == pytest.approx([1.0, 2.0, 3.0, 4.0], abs=0.2)
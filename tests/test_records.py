@@ -0,0 +1,99 @@
+import json
+import sys
+
+import pytest
+
+from museum_records import Artwork, ImageRef, Relic, artworks_from_json, artworks_to_json, load_relics
+from update_artworks import ARTWORKS_JSON_PATH
+
+RELIC = {
+    'id': 'PS0100100100100001',
+    'name': '빗살무늬토기',
+    'nameEng': 'Comb-pattern Pottery',
+    'collection': '암사123',
+    'museumCode': 'PS01001001',
+    'museumName': '국립중앙박물관',
+    'era': 'PS06001001',
+    'eraName': '신석기',
+    'material': '토기',
+    'size': '높이 38.1cm',
+    'designation': '',
+    'imageList': [
+        {'imgUrl': 'https://example.org/1.jpg', 'imgThumUriM': 'https://example.org/1_m.jpg'},
+        {'imgOriUri': 'https://example.org/2.jpg'},
+    ],
+    'newApiField': {'nested': [1, 2]},     # 레코드에 없는 키
+}
+
+
+def fresh(value):
+    """컴파일 시점 상수 interning 을 피해 새 문자열 객체를 만든다"""
+    return ''.join(list(value))
+
+
+def test_relic_round_trip_keeps_unknown_keys():
+    relic = Relic.from_dict(RELIC)
+    assert relic.to_dict() == RELIC
+    assert relic.extra == {'newApiField': {'nested': [1, 2]}}
+    assert Relic.from_dict(relic.to_dict()) == relic
+    assert not hasattr(relic, '__dict__') and not hasattr(relic.images[0], '__dict__')
+
+
+def test_relic_images_and_best_url():
+    relic = Relic.from_dict(RELIC)
+    assert all(isinstance(image, ImageRef) for image in relic.images)
+    assert relic.best_image_url() == 'https://example.org/1_m.jpg'
+    assert relic.images[1].best_url() == 'https://example.org/2.jpg'
+    # XML 응답처럼 이미지가 하나면 목록이 아니라 dict 로 온다
+    single = Relic.from_dict(dict(RELIC, imageList=RELIC['imageList'][1]))
+    assert len(single.images) == 1 and single.to_dict()['imageList'] == [RELIC['imageList'][1]]
+
+
+def test_missing_fields_are_none_and_left_out():
+    relic = Relic.from_dict({'id': 'X1', 'name': '금관'})
+    assert relic.era_name is None and relic.images is None and relic.extra is None
+    assert relic.to_dict() == {'id': 'X1', 'name': '금관'}
+    assert relic.best_image_url() == ''
+    assert Relic.from_dict({}).to_dict() == {}
+
+
+def test_category_fields_are_interned():
+    first = Relic.from_dict(dict(RELIC, eraName=fresh('신석기'), museumName=fresh('국립중앙박물관'), name=fresh('토기')))
+    second = Relic.from_dict(dict(RELIC, eraName=fresh('신석기'), museumName=fresh('국립중앙박물관'), name=fresh('토기')))
+    assert first.era_name is second.era_name
+    assert first.museum_name is second.museum_name
+    assert first.name is not second.name      # 명칭은 intern 하지 않는다
+
+
+def test_artworks_json_round_trip():
+    with open(ARTWORKS_JSON_PATH, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    artworks = artworks_from_json(data)
+    assert artworks_to_json(artworks) == data
+    assert artworks_to_json([data[0]]) == [data[0]]     # dict 는 그대로
+
+
+def test_artwork_dict_access_for_known_unknown_and_missing_keys():
+    artwork = Artwork.from_dict({'id': '1', 'title': '금관', 'culturalProperty': '국보', 'legacyNote': '메모'})
+    assert artwork['title'] == '금관' and artwork.get('legacyNote') == '메모'
+    assert 'significance' not in artwork and artwork.get('significance', '-') == '-'
+    with pytest.raises(KeyError):
+        artwork['significance']
+    with pytest.raises(KeyError):
+        artwork['unknownKey']
+
+    artwork.update({'culturalProperty': fresh('국보'), 'imageUrl': 'https://example.org/a.jpg', 'addedKey': 1})
+    assert artwork.cultural_property is sys.intern(fresh('국보'))
+    assert artwork.image_url == 'https://example.org/a.jpg' and artwork.extra == {'legacyNote': '메모', 'addedKey': 1}
+    assert artwork.to_dict() == {
+        'id': '1', 'title': '금관', 'imageUrl': 'https://example.org/a.jpg', 'culturalProperty': '국보',
+        'legacyNote': '메모', 'addedKey': 1,
+    }
+
+
+def test_load_relics_reads_jsonl(tmp_path):
+    path = tmp_path / 'relics.jsonl'
+    path.write_text(json.dumps(RELIC, ensure_ascii=False) + '\n\n' + json.dumps({'id': 'X2'}) + '\n', encoding='utf-8')
+    relics = list(load_relics(str(path)))
+    assert [relic.id for relic in relics] == [RELIC['id'], 'X2']
+    assert relics[0] == Relic.from_dict(RELIC)
@@ -0,0 +1,52 @@
+import time
+
+from museum_resolution import FAILURE_DETAIL_FAILED, FAILURE_NOT_FOUND, ResolutionCache, resolution_key
+
+TARGET = {'title': '청자 상감운학문 매병', 'inventory': '덕수 2000', 'museum': '국립중앙박물관'}
+
+
+def test_key_ignores_spacing_and_inventory_order():
+    assert resolution_key(TARGET) == resolution_key(dict(TARGET, title='청자상감운학문매병'))
+    assert resolution_key({'title': 'a', 'inventory': '덕수 1, 본관 2'}) == resolution_key({'title': 'a', 'inventory': '본관 2, 덕수 1'})
+
+
+def test_records_survive_save_and_reload(tmp_path):
+    path = str(tmp_path / 'resolutions.json')
+    cache = ResolutionCache(path)
+    cache.put(TARGET, 'PS0100100100100000100', 1.0, 'inventory')
+    cache.put_failure({'title': '없는 작품'}, FAILURE_NOT_FOUND)
+    cache.save()
+
+    reloaded = ResolutionCache(path)
+    assert reloaded.get(TARGET)['relicId'] == 'PS0100100100100000100'
+    assert reloaded.get_failure({'title': '없는 작품'})['reason'] == FAILURE_NOT_FOUND
+    assert reloaded.stats()['hits'] == 1
+
+
+def test_expired_or_low_confidence_records_are_rechecked(tmp_path):
+    cache = ResolutionCache(str(tmp_path / 'resolutions.json'), ttl=60, min_confidence=0.9)
+    cache.put(TARGET, 'A', 0.5, 'title')
+    assert cache.get(TARGET) is None
+    cache.put(TARGET, 'A', 1.0, 'inventory')
+    cache.records[resolution_key(TARGET)]['resolvedAt'] = time.time() - 120
+    assert cache.get(TARGET) is None
+    assert cache.stats()['stale'] == 2
+
+
+def test_failures_expire_per_reason(tmp_path):
+    cache = ResolutionCache(str(tmp_path / 'resolutions.json'), failure_ttls={FAILURE_DETAIL_FAILED: 10})
+    cache.put_failure(TARGET, FAILURE_DETAIL_FAILED, relic_id='A')
+    assert cache.get_failure(TARGET, reasons=(FAILURE_NOT_FOUND,)) is None
+    assert cache.get_failure(TARGET)['relicId'] == 'A'
+    cache.failures[resolution_key(TARGET)]['recordedAt'] = time.time() - 20
+    assert cache.get_failure(TARGET) is None
+    assert cache.stats()['failures'] == {}
+
+
+def test_invalidate_drops_record_and_failure(tmp_path):
+    cache = ResolutionCache(str(tmp_path / 'resolutions.json'))
+    cache.put(TARGET, 'A', 1.0, 'inventory')
+    cache.put_failure(TARGET, FAILURE_NOT_FOUND)
+    assert cache.invalidate(TARGET)
+    assert cache.get(TARGET) is None and cache.get_failure(TARGET) is None
+    assert not cache.invalidate(TARGET)
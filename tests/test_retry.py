@@ -0,0 +1,86 @@
+import pytest
+
+from museum_retry import CircuitBreaker, CircuitOpenError, RetryBudget, RetryController, RetryPolicy
+
+from conftest import fast_retry
+
+
+def controller(max_attempts=3, failure_threshold=2, budget=None, recovery_timeout=60.0):
+    policy = RetryPolicy(max_attempts=max_attempts, base_delay=0.0, max_delay=0.0)
+    return RetryController(
+        policies={'server': policy},
+        budget=budget or RetryBudget(min_reserve=1000.0, max_reserve=1000.0),
+        breaker=CircuitBreaker(failure_threshold=failure_threshold, recovery_timeout=recovery_timeout),
+    )
+
+
+def failed_request(retry, attempts):
+    """attempts 번 모두 server 오류인 요청 하나. 마지막 after_attempt 결과를 돌려준다"""
+    for attempt in range(1, attempts + 1):
+        retry.before_attempt()
+        delay = retry.after_attempt('server', attempt)
+        if delay is None:
+            return attempt
+    return None
+
+
+def test_retried_request_counts_once_against_the_breaker():
+    retry = controller(max_attempts=3, failure_threshold=2)
+    assert failed_request(retry, 3) == 3
+    assert retry.breaker.state == CircuitBreaker.CLOSED
+    assert failed_request(retry, 3) == 3
+    assert retry.breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        retry.before_attempt()
+
+
+def test_success_resets_the_failure_streak():
+    retry = controller(max_attempts=1, failure_threshold=2)
+    failed_request(retry, 1)
+    retry.before_attempt()
+    assert retry.after_attempt(None, 1) is None
+    failed_request(retry, 1)
+    assert retry.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_probe():
+    retry = controller(max_attempts=3, failure_threshold=1, recovery_timeout=0.0)
+    failed_request(retry, 3)
+    assert retry.breaker.state == CircuitBreaker.OPEN
+
+    retry.before_attempt()                              # 시험 요청
+    assert retry.breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        retry.breaker.before_request()                  # 시험 중에는 하나만
+    assert retry.after_attempt('server', 1) is None     # 시험 요청은 재시도하지 않음
+    assert retry.breaker.state == CircuitBreaker.OPEN
+
+    retry.before_attempt()
+    retry.after_attempt(None, 1)
+    assert retry.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_exhausted_budget_gives_up_and_counts_a_failure():
+    retry = controller(max_attempts=5, failure_threshold=1,
+                       budget=RetryBudget(ratio=0.0, min_reserve=1.0, max_reserve=1.0))
+    assert failed_request(retry, 5) == 2                # 재시도 한 번만 허용
+    assert retry.stats() == {'retries': 1, 'budget_exhausted': 1, 'circuit': CircuitBreaker.OPEN}
+
+
+def test_budget_refills_with_requests():
+    budget = RetryBudget(ratio=0.5, min_reserve=0.0, max_reserve=1.0)
+    assert not budget.withdraw()
+    budget.deposit()
+    budget.deposit()
+    budget.deposit()                                    # max_reserve 에서 멈춤
+    assert budget.withdraw() and not budget.withdraw()
+
+
+def test_retrying_client_survives_transient_errors(standin, make_client):
+    # 한 번씩 실패하는 요청이 브레이커 상한보다 많아도 배치가 중단되지 않는다
+    client = make_client(standin, retry=fast_retry(max_attempts=3, failure_threshold=2))
+    standin.state.error_rate, standin.state.error_mode = 0.5, 'http'
+    relic_ids = [relic['id'] for relic in standin.state.catalog[:20]]
+    for relic_id in relic_ids:
+        client.get_relic_detail(relic_id)
+    assert client.retry.stats()['retries'] > 2
@@ -0,0 +1,58 @@
+import json
+
+import requests
+
+from museum_decode import decode_response
+from museum_standin import build_catalog, start_standin_server
+
+
+def get(server, endpoint, **params):
+    return requests.get(f"{server.base_url}/{endpoint}", params=params, timeout=5)
+
+
+def test_catalog_is_deterministic():
+    assert build_catalog(300, seed=3) == build_catalog(300, seed=3)
+    assert build_catalog(300, seed=3) != build_catalog(300, seed=4)
+
+
+def test_catalog_contains_artworks_by_inventory():
+    catalog = build_catalog(300)
+    assert any(relic['name'] == '빗살무늬토기' for relic in catalog)
+    assert len(catalog) == 300
+
+
+def test_list_pages_are_capped_by_max_page_size(standin):
+    body = get(standin, 'relic/list', numOfRows=250, pageNo=2, returnType='json').json()['response']['body']
+    assert body['totalCount'] == len(standin.state.catalog)
+    assert body['numOfRows'] == 100
+    assert body['items'][0]['id'] == standin.state.catalog[100]['id']
+
+
+def test_xml_and_json_decode_to_same_items(standin):
+    relic_id = standin.state.catalog[0]['id']
+    as_json = get(standin, 'relic/detail', id=relic_id, returnType='json')
+    as_xml = get(standin, 'relic/detail', id=relic_id)
+    assert as_xml.headers['Content-Type'].startswith('text/xml')
+    decoded_json = decode_response(as_json.content, as_json.headers['Content-Type'])
+    decoded_xml = decode_response(as_xml.content, as_xml.headers['Content-Type'])
+    assert decoded_xml['response']['body']['items'][0]['id'] == relic_id
+    assert decoded_xml['response']['body']['items'][0]['name'] == decoded_json['response']['body']['items'][0]['name']
+
+
+def test_etag_revalidation_returns_304(standin):
+    first = get(standin, 'relic/detail', id=standin.state.catalog[0]['id'], returnType='json')
+    again = requests.get(first.url, headers={'If-None-Match': first.headers['ETag']}, timeout=5)
+    assert again.status_code == 304
+    assert standin.state.stats['not_modified'] == 1
+
+
+def test_injected_http_errors():
+    server = start_standin_server(relics=150, error_rate=1.0, error_mode='http')
+    try:
+        assert get(server, 'relic/list', returnType='json').status_code == 503
+        assert server.state.stats['injected_error'] == 1
+        stats = json.loads(get(server, '__stats').text)
+        assert stats['relic/list'] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+
+from museum_standin import start_standin_server
+from museum_transport import HTTP2Adapter, create_session, transport_stats
+
+
+@pytest.fixture
+def h2c_standin():
+    server = start_standin_server(relics=200, h2c=True)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_h2c_multiplexes_requests_on_one_connection(h2c_standin, make_client):
+    client = make_client(h2c_standin, session=create_session(transport='h2c'))
+    relic_ids = [relic['id'] for relic in h2c_standin.state.catalog[:40]]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        details = list(executor.map(client.get_relic_detail, relic_ids))
+    assert all(detail is not None for detail in details)
+    stats = transport_stats(client.session)
+    assert stats['transport'] == 'h2c'
+    assert stats['versions'] == {'HTTP/2': 40}
+    assert h2c_standin.state.stats['connections'] == 1
+
+
+def test_h2c_revalidation_returns_304(h2c_standin):
+    session = create_session(transport='h2c')
+    url = f"{h2c_standin.base_url}/relic/detail"
+    first = session.get(url, params={'id': h2c_standin.state.catalog[0]['id'], 'returnType': 'json'}, timeout=5)
+    again = session.get(first.url, headers={'If-None-Match': first.headers['ETag']}, timeout=5)
+    assert first.status_code == 200 and again.status_code == 304
+    session.close()
+
+
+def test_http2_adapter_honours_proxies(standin):
+    # HTTP/1.1 대역 서버는 절대 URL 요청도 경로만 보고 응답하므로 전달 프록시 역할을 할 수 있다
+    session = create_session(transport='http2')
+    proxy = standin.base_url.rsplit('/openapi', 1)[0]
+    relic_id = standin.state.catalog[0]['id']
+    response = session.get('http://museum.invalid/openapi/relic/detail', params={'id': relic_id, 'returnType': 'json'},
+                           proxies={'http': proxy}, timeout=5)
+    assert response.json()['response']['body']['items'][0]['id'] == relic_id
+    assert standin.state.stats['relic/detail'] == 1
+    session.close()
+
+
+def test_http2_adapter_keeps_a_client_per_tls_setting(tmp_path):
+    adapter = HTTP2Adapter()
+    assert adapter.get_client(True) is adapter.get_client(True)
+    assert adapter.get_client(False) is not adapter.get_client(True)
+    with pytest.raises(OSError):
+        adapter.get_client(str(tmp_path / 'missing-ca.pem'))
+    with pytest.raises(requests.exceptions.InvalidProxyURL):
+        adapter.send(requests.Request('GET', 'http://museum.invalid/').prepare(), proxies={'http': 'foo'})
+    adapter.close()
@@ -0,0 +1,195 @@
+import json
+import os
+
+import pytest
+
+import museum_harvest
+from conftest import fast_retry
+from museum_engine import MuseumEngine
+from museum_sync import SyncState, artwork_key, content_hash, list_fingerprint
+from update_artworks import ARTWORKS_JSON_PATH, apply_api_detail, apply_delta, diff_api_detail, sync_artwork_delta
+
+
+@pytest.fixture
+def artworks_path(tmp_path):
+    with open(ARTWORKS_JSON_PATH, 'r', encoding='utf-8') as f:
+        artworks = json.load(f)[:3]
+    path = tmp_path / 'artworks.json'
+    path.write_text(json.dumps(artworks, ensure_ascii=False), encoding='utf-8')
+    return str(path)
+
+
+def run_update(artworks_path, output, sync_state_path):
+    return museum_harvest.main([
+        'update', '--delta', '--no-resolutions', '--no-cache', '--no-priority',
+        '--artworks', artworks_path, '--output', output, '--sync-state', sync_state_path,
+    ])
+
+
+def test_sync_state_is_saved_after_artworks(standin, artworks_path, tmp_path, monkeypatch):
+    monkeypatch.setenv('MUSEUM_API_BASE_URL', standin.base_url)
+    sync_state_path = str(tmp_path / 'sync_state.json')
+    output = str(tmp_path / 'updated.json')
+    assert run_update(artworks_path, output, sync_state_path) == 0
+    assert os.path.exists(output) and os.path.exists(sync_state_path)
+
+
+def test_failed_write_keeps_sync_state_unsaved(standin, artworks_path, tmp_path, monkeypatch):
+    monkeypatch.setenv('MUSEUM_API_BASE_URL', standin.base_url)
+    sync_state_path = str(tmp_path / 'sync_state.json')
+    with pytest.raises(OSError):
+        run_update(artworks_path, str(tmp_path / 'missing' / 'updated.json'), sync_state_path)
+    assert not os.path.exists(sync_state_path)
+
+
+def test_update_keeps_partial_count_when_breaker_opens(standin, make_client):
+    artworks = [
+        {'title': relic['name'], 'inventoryNumber': relic['collection'], 'description': ''}
+        for relic in standin.state.catalog[:8]
+    ]
+    client = make_client(standin, retry=fast_retry(max_attempts=1, failure_threshold=2))
+    engine = MuseumEngine(client, workers=1)
+    resolve = engine.resolve
+    calls = []
+
+    def failing_after_three(target):
+        calls.append(target)
+        if len(calls) == 4:
+            standin.state.error_rate, standin.state.error_mode = 1.0, 'http'
+        return resolve(target)
+
+    engine.resolve = failing_after_three
+    assert engine.update(artworks) == 3
+    assert engine.last_stats['update'] == {'changed': 3, 'interrupted': True}
+    assert all(artwork['description'] for artwork in artworks[:3])
+
+
+DETAIL = {
+    'id': 'R1',
+    'content': '신석기시대의 대표적인 토기',
+    'eraName': '신석기',
+    'material': '토기',
+    'museumName': '국립중앙박물관',
+    'imageList': [{'imgUrl': 'https://example.org/1.jpg'}, {'imgUrl': 'https://example.org/2.jpg'}],
+}
+ITEM = {'id': 'R1', 'name': '빗살무늬토기', 'lastModified': '2024-01-01'}
+
+
+def page(item):
+    return {'response': {'body': {'totalCount': 1, 'items': [item] if item is not None else []}}}
+
+
+class FakeClient:
+    def __init__(self, item, detail):
+        self.item = item
+        self.detail = detail
+        self.detail_calls = 0
+
+    def search_relics(self, keyword='', size=1):
+        return page(self.item)
+
+    def get_relic_detail(self, relic_id):
+        self.detail_calls += 1
+        return page(self.detail)
+
+
+@pytest.fixture
+def state(tmp_path):
+    return SyncState(str(tmp_path / 'sync_state.json'))
+
+
+def artwork():
+    return {'id': 7, 'title': '빗살무늬토기', 'description': '', 'period': '신석기', 'museum': '국립중앙박물관'}
+
+
+def test_diff_keeps_only_changed_non_empty_fields():
+    changes = diff_api_detail(artwork(), dict(DETAIL, material=''))
+    assert changes == {'description': DETAIL['content'], 'imageUrl': 'https://example.org/1.jpg'}
+    assert diff_api_detail(dict(artwork(), **changes), DETAIL) == {'material': '토기'}
+
+
+def test_removed_fields_do_not_clear_artwork_data():
+    current = dict(artwork(), description='기존 설명', imageUrl='https://example.org/old.jpg', material='토기')
+    removed = {key: value for key, value in DETAIL.items() if key not in ('content', 'imageList', 'material')}
+    assert diff_api_detail(current, removed) == {}
+    assert apply_api_detail(current, page(removed)) is False
+    assert current['description'] == '기존 설명' and current['imageUrl'] == 'https://example.org/old.jpg'
+
+
+def test_first_sync_applies_detail_and_records_state(state):
+    target = artwork()
+    client = FakeClient(ITEM, DETAIL)
+    assert sync_artwork_delta(target, client, state) is True
+    assert target['description'] == DETAIL['content'] and target['imageUrl'] == 'https://example.org/1.jpg'
+    record = state.records[artwork_key(target)]
+    assert record['relicId'] == 'R1' and record['listFingerprint'] == 'lastModified:2024-01-01'
+    assert record['detailHash'] == content_hash(DETAIL) and record['lastModified'] == '2024-01-01'
+    assert state.stats() == {'unchanged': 0, 'same_detail': 0, 'changed': 1, 'tracked': 1}
+
+
+def test_unchanged_list_fingerprint_skips_detail(state):
+    target = artwork()
+    client = FakeClient(ITEM, DETAIL)
+    sync_artwork_delta(target, client, state)
+    target['description'] = '손으로 고친 설명'
+    assert sync_artwork_delta(target, client, state) is False
+    assert client.detail_calls == 1 and state.unchanged == 1
+    assert target['description'] == '손으로 고친 설명'
+
+
+def test_unchanged_detail_hash_skips_apply(state):
+    target = artwork()
+    client = FakeClient(ITEM, DETAIL)
+    sync_artwork_delta(target, client, state)
+    target['description'] = '손으로 고친 설명'
+    client.item = dict(ITEM, lastModified='2024-02-01')     # 목록 지문만 바뀜
+    assert sync_artwork_delta(target, client, state) is False
+    assert client.detail_calls == 2 and state.same_detail == 1
+    assert target['description'] == '손으로 고친 설명'
+    assert state.records[artwork_key(target)]['listFingerprint'] == 'lastModified:2024-02-01'
+
+
+def test_changed_field_is_applied_alone(state):
+    target = artwork()
+    client = FakeClient(ITEM, DETAIL)
+    sync_artwork_delta(target, client, state)
+    before = dict(target)
+    client.item = dict(ITEM, lastModified='2024-03-01')
+    client.detail = dict(DETAIL, material='토기(점토)')
+    assert sync_artwork_delta(target, client, state) is True
+    assert target == dict(before, material='토기(점토)')
+    assert state.records[artwork_key(target)]['detailHash'] == content_hash(client.detail)
+    assert state.changed == 2
+
+
+def test_removed_detail_field_updates_hash_without_changes(state):
+    target = artwork()
+    client = FakeClient(ITEM, DETAIL)
+    sync_artwork_delta(target, client, state)
+    before = dict(target)
+    client.item = dict(ITEM, lastModified='2024-04-01')
+    client.detail = {key: value for key, value in DETAIL.items() if key != 'content'}
+    assert sync_artwork_delta(target, client, state) is False
+    assert target == before
+    # 다음 실행에서 같은 상세를 다시 비교하지 않도록 해시는 새 내용으로 남긴다
+    assert state.records[artwork_key(target)]['detailHash'] == content_hash(client.detail)
+
+
+def test_missing_detail_leaves_state_alone(state):
+    target = artwork()
+    assert apply_delta(target, ITEM, page(None), state) is False
+    assert state.records == {}
+    assert sync_artwork_delta(target, FakeClient(None, DETAIL), state) is False    # 검색 결과 없음
+
+
+def test_fingerprint_without_modified_field_hashes_the_item(state):
+    item = {'id': 'R1', 'name': '빗살무늬토기'}
+    assert list_fingerprint(item) == f"sha256:{content_hash(item)}"
+    target = artwork()
+    client = FakeClient(item, DETAIL)
+    sync_artwork_delta(target, client, state)
+    state.save()
+    reloaded = SyncState(state.path)
+    assert not reloaded.needs_detail(artwork_key(target), 'R1', list_fingerprint(item))
+    assert reloaded.needs_detail(artwork_key(target), 'R1', list_fingerprint(dict(item, name='토기')))
+    assert reloaded.needs_detail(artwork_key(target), 'R2', list_fingerprint(item))    # 다른 유물로 바뀜
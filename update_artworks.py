@@ -1,10 +1,43 @@
 import os
 import requests
 import json
-import time
 import logging
-from typing import Optional, Dict, Any
-from requests.exceptions import RequestException, Timeout, ConnectionError
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Optional, Callable, Dict, Any, Iterator, List, NamedTuple, Tuple, Union
+from requests.exceptions import RequestException, Timeout, ConnectionError, HTTPError
+
+from museum_transport import (
+    DEFAULT_POOL_CONNECTIONS,
+    DEFAULT_POOL_MAXSIZE,
+    TRANSPORT_HTTP1,
+    create_session,
+    get_shared_session,
+)
+from museum_cache import CacheEntry, ResponseCache, get_shared_cache
+from museum_concurrency import (
+    ERROR_CONNECTION,
+    ERROR_TIMEOUT,
+    ERROR_XML,
+    AIMDController,
+    AIMDSlot,
+    classify_status,
+)
+from museum_decode import DecodeError, decode_response, iter_response_items
+from museum_hedge import HEDGED_ENDPOINTS, Hedger
+from museum_memo import DEFAULT_MEMO_SIZE, Memoizer
+from museum_rate_limit import TokenBucket, get_shared_rate_limiter
+from museum_records import Artwork, artworks_from_json, artworks_to_json
+from museum_retry import CircuitOpenError, RetryController
+from museum_sync import (
+    DEFAULT_SYNC_STATE_PATH,
+    MODIFIED_FIELDS,
+    SyncState,
+    artwork_key,
+    content_hash,
+    list_fingerprint,
+)
 
 # Load environment variables
 try:
@@ -25,14 +58,99 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 100
+STREAM_CHUNK_SIZE = 16 * 1024
+
+class RelicPageError(Exception):
+    """iter_relics 순회 중 목록 페이지를 받지 못함 (재시도 후에도 실패)"""
+
+class RelicPage(NamedTuple):
+    """iter_relic_pages 가 돌려주는 relic/list 한 페이지 (size 는 요청한 numOfRows)"""
+    page: int
+    size: int
+    total: int
+    items: List[Dict[str, Any]]
+
+def extract_page(data: Optional[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+    """relic/list 응답에서 (totalCount, items) 추출"""
+    try:
+        body = data['response']['body']
+    except (KeyError, TypeError):
+        return 0, []
+    items = body.get('items') or []
+    if isinstance(items, dict):
+        items = items.get('item') or []
+        if isinstance(items, dict):
+            items = [items]
+    return int(body.get('totalCount') or 0), items
+
+def next_relic_page(page: int, size: int, count: int, total: int) -> Optional[Tuple[int, int]]:
+    """relic/list 다음 요청의 (pageNo, numOfRows). 더 받을 것이 없으면 None
+
+    받은 행 수가 0 이거나 지금까지 받은 범위가 totalCount 에 닿으면 끝이다.
+    서버가 numOfRows 를 최대 페이지 크기로 줄여 보냈으면 받은 행 수를 페이지 크기로 삼는다
+    (서버는 줄인 크기로 시작 위치를 계산하므로 페이지 번호는 그대로 이어진다).
+    """
+    if count == 0 or (page - 1) * size + count >= total:
+        return None
+    return page + 1, min(size, count)
+
+def build_list_params(query: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """검색어 문자열 또는 필터 dict 를 relic/list 파라미터로 변환"""
+    if query is None:
+        return {}
+    if isinstance(query, str):
+        return {'keyword': query} if query else {}
+    return {k: v for k, v in query.items() if v not in (None, '')}
+
 class MuseumAPIClient:
     """국립박물관 API 클라이언트"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        cache: Optional[ResponseCache] = None,
+        use_cache: bool = True,
+        memo_size: int = DEFAULT_MEMO_SIZE,
+        retry: Optional[RetryController] = None,
+        hedger: Optional[Hedger] = None,
+        transport: Optional[str] = None,
+        adaptive: bool = False,
+        controller: Optional[AIMDController] = None,
+    ):
         self.service_key = self._get_service_key()
         self.endpoint = "www.emuseum.go.kr/openapi"
-        self.base_url = f"https://{self.endpoint}"
+        # MUSEUM_API_BASE_URL 로 로컬 대역 서버(museum_standin.py) 등을 가리킬 수 있다
+        self.base_url = os.getenv('MUSEUM_API_BASE_URL', f"https://{self.endpoint}")
         self.timeout = 15
+        # 풀 크기나 전송 방식(http1/http2/h2c)을 직접 지정하면 전용 세션을, 아니면 실행 전체의 공유 세션을 사용
+        if session is not None:
+            self.session = session
+        elif pool_connections or pool_maxsize or transport:
+            self.session = create_session(
+                pool_connections=pool_connections or DEFAULT_POOL_CONNECTIONS,
+                pool_maxsize=pool_maxsize or DEFAULT_POOL_MAXSIZE,
+                transport=transport or TRANSPORT_HTTP1,
+            )
+        else:
+            self.session = get_shared_session()
+        # 호출 간격은 sleep 대신 공유 토큰 버킷으로 맞춘다
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
+        # 디스크 캐시: 유효한 응답은 네트워크 없이, 만료된 응답은 조건부 요청으로
+        self.cache = (cache or get_shared_cache()) if use_cache else None
+        # 실행 중 같은 조회는 메모리에서 재사용하고, 동시에 들어온 같은 조회는 하나로 합친다
+        self.memo = Memoizer(memo_size)
+        # adaptive 이면 동시에 보내는 요청 수를 AIMD 창으로 조절한다 (작업 스레드 수는 상한일 뿐)
+        if controller is None and adaptive:
+            controller = AIMDController(max_window=pool_maxsize or DEFAULT_POOL_MAXSIZE)
+        self.controller = controller
+        # 오류 종류별 재시도 정책 + 재시도 예산 + 서킷 브레이커
+        self.retry = retry or RetryController()
+        # 느린 상세 조회를 한 번 더 보내 먼저 온 응답을 쓰는 헤지 (기본 끔)
+        self.hedger = hedger
         
     def _get_service_key(self) -> str:
         """환경변수에서 API 키 가져오기"""
@@ -45,45 +163,95 @@ class MuseumAPIClient:
         return service_key
     
     def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """공통 API 요청 메서드"""
+        """공통 API 요청 메서드
+
+        일시적인 오류는 오류 종류별 정책에 따라 백오프 후 다시 시도한다.
+        서킷 브레이커가 열려 있으면 CircuitOpenError 를 그대로 올려 배치를 빨리 끝낸다.
+        hedger 가 있으면 relic/detail 은 느릴 때 한 번 더 보낸다 (museum_hedge.py).
+        """
         url = f"{self.base_url}/{endpoint}"
         params['serviceKey'] = self.service_key
         params['returnType'] = 'json'
         
+        cached = self.cache.get(endpoint, params) if self.cache else None
+        if cached and cached.fresh:
+            logger.info(f"캐시 적중: {endpoint} - {params}")
+            return cached.data
+        headers = cached.conditional_headers() if cached and self.cache.revalidate else {}
+        if self.hedger is not None and endpoint in HEDGED_ENDPOINTS:
+            return self.hedger.call(lambda: self._request_with_retry(url, endpoint, dict(params), headers, cached))
+        return self._request_with_retry(url, endpoint, params, headers, cached)
+
+    def _request_with_retry(self, url: str, endpoint: str, params: Dict[str, Any], headers: Dict[str, str], cached: Optional[CacheEntry]) -> Optional[Dict[str, Any]]:
+        attempt = 0
+        while True:
+            attempt += 1
+            self.retry.before_attempt()
+            data, error = self._send_once(url, endpoint, params, headers, cached)
+            delay = self.retry.after_attempt(error, attempt)
+            if delay is None:
+                return data
+            logger.warning(f"{error} 오류 - {delay:.1f}초 후 재시도 ({attempt}회 실패): {endpoint}")
+            time.sleep(delay)
+    
+    def _send_once(self, url: str, endpoint: str, params: Dict[str, Any], headers: Dict[str, str], cached: Optional[CacheEntry]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """요청 한 번 전송. (데이터, 오류 분류) 반환 (adaptive 면 AIMD 창 안에서)"""
+        with (self.controller.sync_slot() if self.controller is not None else nullcontext(AIMDSlot())) as slot:
+            data, slot.error = self._send_request(url, endpoint, params, headers, cached, slot)
+        return data, slot.error
+
+    def _send_request(self, url: str, endpoint: str, params: Dict[str, Any], headers: Dict[str, str], cached: Optional[CacheEntry], slot: AIMDSlot) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         try:
+            self.rate_limiter.acquire()
+            slot.start()
             logger.info(f"API 요청: {endpoint} - {params}")
-            response = requests.get(url, params=params, timeout=self.timeout)
+            response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
             response.raise_for_status()
             
             logger.info(f"응답 상태: {response.status_code}")
             
-            if response.status_code == 200:
+            if response.status_code == 304 and cached:
+                logger.info("캐시 재검증 성공 (304 Not Modified)")
+                self.cache.refresh(endpoint, params)
+                return cached.data, None
+            elif response.status_code == 200:
                 try:
-                    data = response.json()
-                    logger.info("JSON 파싱 성공")
-                    return data
-                except json.JSONDecodeError as e:
-                    logger.error(f"JSON 파싱 실패: {e}")
+                    data = decode_response(response.content, response.headers.get('Content-Type'))
+                    logger.info("응답 파싱 성공")
+                    if self.cache:
+                        self.cache.set(
+                            endpoint, params, data,
+                            etag=response.headers.get('ETag'),
+                            last_modified=response.headers.get('Last-Modified'),
+                        )
+                    return data, None
+                except DecodeError as e:
+                    logger.error(f"응답 파싱 실패: {e}")
                     logger.error(f"응답 내용: {response.text[:500]}...")
-                    return None
+                    return None, ERROR_XML if e.api_error else None
             else:
                 logger.warning(f"예상치 못한 상태 코드: {response.status_code}")
-                return None
+                return None, None
                 
         except Timeout:
             logger.error(f"요청 시간 초과 ({self.timeout}초)")
+            return None, ERROR_TIMEOUT
         except ConnectionError:
             logger.error("연결 오류 - 네트워크 상태를 확인하세요")
+            return None, ERROR_CONNECTION
+        except HTTPError as e:
+            logger.error(f"HTTP 요청 오류: {e}")
+            return None, classify_status(e.response.status_code) if e.response is not None else None
         except RequestException as e:
             logger.error(f"HTTP 요청 오류: {e}")
         except Exception as e:
             logger.error(f"예상치 못한 오류: {e}")
             
-        return None
+        return None, None
     
     def get_code_list(self) -> Optional[Dict[str, Any]]:
-        """코드 목록 조회 - 소장품 분류 코드 확인"""
-        return self._make_request("code/list", {})
+        """코드 목록 조회 - 소장품 분류 코드 확인 (로컬 사본은 museum_codes.CodeTables)"""
+        return self.memo.call(('code/list',), lambda: self._make_request("code/list", {}))
     
     def search_relics(self, keyword: str = "", page: int = 1, size: int = 10) -> Optional[Dict[str, Any]]:
         """소장품 목록 조회"""
@@ -94,12 +262,178 @@ class MuseumAPIClient:
         if keyword:
             params['keyword'] = keyword
             
-        return self._make_request("relic/list", params)
+        return self.memo.call(
+            ('relic/list', keyword, page, size),
+            lambda: self._make_request("relic/list", params),
+        )
     
+    def list_relics(self, query: Union[str, Dict[str, Any], None], page: int = 1, size: int = 10) -> Optional[Dict[str, Any]]:
+        """검색 조건(name, manageNo, museumCode 등)으로 소장품 목록 조회"""
+        params = build_list_params(query)
+        return self.memo.call(
+            ('relic/list', tuple(sorted(params.items())), page, size),
+            lambda: self._make_request("relic/list", dict(params, pageNo=page, numOfRows=size)),
+        )
+
     def get_relic_detail(self, relic_id: str) -> Optional[Dict[str, Any]]:
         """소장품 상세 정보 조회"""
         params = {'id': relic_id}
-        return self._make_request("relic/detail", params)
+        return self.memo.call(
+            ('relic/detail', relic_id),
+            lambda: self._make_request("relic/detail", params),
+        )
+
+    def _fetch_relic_page(self, params: Dict[str, Any], page: int, size: int) -> Dict[str, Any]:
+        data = self._make_request("relic/list", dict(params, pageNo=page, numOfRows=size))
+        if data is None:
+            raise RelicPageError(f"relic/list {page} 페이지 조회 실패")
+        return data
+
+    def stream_relic_page(
+        self,
+        params: Dict[str, Any],
+        page: int,
+        size: int,
+        on_field: Optional[Callable[[str, Any], None]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """relic/list 한 페이지를 받는 대로 한 건씩 파싱해 돌려준다 (캐시 미사용)
+
+        연결과 상태 코드 오류는 재시도 정책을 따르고, 본문을 읽는 도중 끊기면 RelicPageError.
+        totalCount 등 목록 밖의 필드는 on_field(name, value) 로 알린다.
+        """
+        url = f"{self.base_url}/relic/list"
+        params = dict(params, pageNo=page, numOfRows=size, serviceKey=self.service_key, returnType='json')
+        attempt = 0
+        while True:
+            attempt += 1
+            self.retry.before_attempt()
+            response, error = None, None
+            try:
+                self.rate_limiter.acquire()
+                logger.info(f"API 스트리밍 요청: relic/list - {params}")
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=True)
+                response.raise_for_status()
+            except Timeout:
+                error = ERROR_TIMEOUT
+            except ConnectionError:
+                error = ERROR_CONNECTION
+            except HTTPError as e:
+                error = classify_status(e.response.status_code) if e.response is not None else None
+                if error is None:
+                    # 재시도 대상이 아닌 4xx
+                    response.close()
+                    self.retry.after_attempt(None, attempt)
+                    raise RelicPageError(f"relic/list {page} 페이지 조회 실패: {e}") from e
+            except RequestException as e:
+                # 재시도해도 같은 결과인 요청 오류 (잘못된 URL, cassette 에 없는 요청 등)
+                self.retry.after_attempt(None, attempt)
+                raise RelicPageError(f"relic/list {page} 페이지 조회 실패: {e}") from e
+            if error is None:
+                self.retry.after_attempt(None, attempt)
+                break
+            if response is not None:
+                response.close()
+            delay = self.retry.after_attempt(error, attempt)
+            if delay is None:
+                raise RelicPageError(f"relic/list {page} 페이지 조회 실패 ({error})")
+            logger.warning(f"{error} 오류 - {delay:.1f}초 후 재시도 ({attempt}회 실패): relic/list")
+            time.sleep(delay)
+
+        with response:
+            try:
+                yield from iter_response_items(
+                    response.iter_content(STREAM_CHUNK_SIZE), response.headers.get('Content-Type'), on_field,
+                )
+            except (DecodeError, RequestException) as e:
+                raise RelicPageError(f"relic/list {page} 페이지 스트리밍 실패: {e}") from e
+
+    def _iter_streamed_relics(self, params: Dict[str, Any], page_size: int, max_items: Optional[int], start_page: int) -> Iterator[Dict[str, Any]]:
+        page, size = start_page, page_size
+        yielded = 0
+        while True:
+            fields: Dict[str, Any] = {}
+            count = 0
+            for item in self.stream_relic_page(params, page, size, fields.__setitem__):
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield item
+                yielded += 1
+                count += 1
+            following = next_relic_page(page, size, count, int(fields.get('totalCount') or 0))
+            if following is None:
+                return
+            page, size = following
+
+    def iter_relics(
+        self,
+        query: Union[str, Dict[str, Any], None] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_items: Optional[int] = None,
+        start_page: int = 1,
+        stream: bool = False,
+    ) -> Iterator[Dict[str, Any]]:
+        """relic/list 전체 결과를 한 건씩 돌려주는 제너레이터
+
+        호출자가 N 페이지를 소비하는 동안 N+1 페이지를 미리 받아 두며,
+        max_items 에 도달하거나 호출자가 중간에 멈추면(break/close) 더 요청하지 않는다.
+        페이지를 끝내 받지 못하면 결과가 잘리지 않도록 RelicPageError 를 던진다.
+        서버가 page_size 보다 적게 보내도 totalCount 에 닿을 때까지 받는다 (next_relic_page).
+        query 는 검색어 문자열 또는 relic/list 파라미터 dict (예: {'manageNo': '본관'}).
+
+        stream=True 이면 페이지를 미리 받아 두는 대신 응답을 받는 대로 항목을 파싱해
+        돌려준다. numOfRows 가 큰 대량 수집에서 첫 항목까지의 지연과 최대 메모리가 줄어든다.
+        """
+        if stream:
+            yield from self._iter_streamed_relics(build_list_params(query), page_size, max_items, start_page)
+            return
+        yielded = 0
+        for page in self.iter_relic_pages(query, page_size, start_page, max_items=max_items):
+            for item in page.items:
+                if max_items is not None and yielded >= max_items:
+                    return
+                yield item
+                yielded += 1
+
+    def iter_relic_pages(
+        self,
+        query: Union[str, Dict[str, Any], None] = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        start_page: int = 1,
+        stream: bool = False,
+        max_items: Optional[int] = None,
+    ) -> Iterator[RelicPage]:
+        """relic/list 를 서버가 실제로 보낸 페이지 단위(RelicPage)로 돌려준다
+
+        다음 페이지 번호와 크기는 next_relic_page 로 정하므로, 서버가 numOfRows 를 줄여 보내면
+        그 뒤 페이지의 size 도 줄어든다. 호출자가 페이지를 처리하는 동안 다음 페이지를 미리 받아 두고
+        (max_items 건을 이미 받았으면 더 요청하지 않음), stream=True 면 응답을 받는 대로 파싱해 모은다.
+        """
+        params = build_list_params(query)
+
+        def fetch(page: int, size: int) -> RelicPage:
+            if stream:
+                fields: Dict[str, Any] = {}
+                items = list(self.stream_relic_page(params, page, size, fields.__setitem__))
+                return RelicPage(page, size, int(fields.get('totalCount') or 0), items)
+            total, items = extract_page(self._fetch_relic_page(params, page, size))
+            return RelicPage(page, size, total, items)
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='relic-prefetch')
+        pending = executor.submit(fetch, start_page, page_size)
+        received = 0
+        try:
+            while pending is not None:
+                current = pending.result()
+                pending = None
+                received += len(current.items)
+                following = next_relic_page(current.page, current.size, len(current.items), current.total)
+                if following is not None and (max_items is None or received < max_items):
+                    pending = executor.submit(fetch, *following)
+                yield current
+        finally:
+            if pending is not None:
+                pending.cancel()
+            executor.shutdown(wait=False)
 
     def get_relic_detail_by_title(self, title: str) -> Optional[Dict[str, Any]]:
         """제목으로 소장품 상세 정보 조회"""
@@ -121,6 +455,12 @@ class MuseumAPIClient:
             logger.warning(f"API 응답 형식이 예상과 다릅니다 (제목 검색): {title}")
         return None
     
+    def close(self):
+        """세션의 커넥션 풀 정리"""
+        if self.hedger is not None:
+            self.hedger.close()
+        self.session.close()
+
     def export_to_json(self, data: Dict[str, Any], filename: str) -> bool:
         """데이터를 JSON 파일로 저장"""
         try:
@@ -134,11 +474,11 @@ class MuseumAPIClient:
 
 ARTWORKS_JSON_PATH = 'src/data/artworks.json'
 
-def read_artworks_from_json(file_path: str) -> list:
-    """JSON 파일에서 작품 데이터를 읽어옵니다."""
+def read_artworks_from_json(file_path: str) -> List[Artwork]:
+    """JSON 파일에서 작품 데이터를 Artwork 레코드로 읽어옵니다."""
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            return artworks_from_json(json.load(f))
     except FileNotFoundError:
         print(f"오류: {file_path} 파일을 찾을 수 없습니다.")
         return []
@@ -147,16 +487,112 @@ def read_artworks_from_json(file_path: str) -> list:
         return []
 
 def write_artworks_to_json(file_path: str, data: list):
-    """업데이트된 작품 데이터를 JSON 파일에 씁니다."""
-    try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-        print(f"성공적으로 {file_path} 파일에 업데이트된 작품 데이터를 저장했습니다.")
-    except Exception as e:
-        print(f"오류: {file_path} 파일 저장 실패 - {e}")
-
-def update_artworks_data_from_api(artworks_data: list, api_client: MuseumAPIClient) -> list:
-    """API를 통해 작품 데이터를 업데이트합니다."""
+    """업데이트된 작품 데이터를 JSON 파일에 씁니다.
+
+    임시 파일에 쓴 뒤 교체하므로 중간에 실패해도 기존 파일은 그대로이고, 오류는 호출자에게 올린다
+    (동기화 상태는 이 함수가 성공한 뒤에만 저장해야 한다).
+    """
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(artworks_to_json(data), f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, file_path)
+    print(f"성공적으로 {file_path} 파일에 업데이트된 작품 데이터를 저장했습니다.")
+
+# 상세 응답 필드 → 작품 데이터 필드
+DETAIL_FIELD_MAP = {
+    'description': 'content',
+    'period': 'eraName',
+    'material': 'material',
+    'dimensions': 'standard',
+    'museum': 'museumName',
+    'inventoryNumber': 'inventoryNum',
+    'culturalProperty': 'designation',
+    # 상세 설명 필드 (API에 해당 필드가 있다면)
+    'detailedDescription': 'detailedContent',
+    'historicalBackground': 'historicalBackground',
+    'artisticFeatures': 'artisticFeatures',
+    'significance': 'significance',
+}
+
+def diff_api_detail(artwork: dict, detail_info: Dict[str, Any]) -> Dict[str, Any]:
+    """상세 정보 중 작품 데이터와 실제로 다른 필드만 모아 반환 (값이 없는 필드는 덮어쓰지 않음)"""
+    values = {field: detail_info.get(source) for field, source in DETAIL_FIELD_MAP.items()}
+    if detail_info.get('imageList'):
+        # 첫 번째 이미지 URL 사용
+        values['imageUrl'] = detail_info['imageList'][0].get('imgUrl')
+    return {
+        field: value for field, value in values.items()
+        if value not in (None, '') and artwork.get(field) != value
+    }
+
+def apply_api_detail(artwork: dict, api_detail: Optional[Dict[str, Any]]) -> bool:
+    """상세 조회 응답 중 달라진 필드만 작품 데이터에 반영합니다. 바뀐 필드가 있으면 True."""
+    _, items = extract_page(api_detail)
+    if not api_detail or 'response' not in api_detail:
+        print(f"  API 호출 실패 또는 응답 형식 오류: {artwork.get('title', '제목 없음')}")
+        return False
+    if not items:
+        print(f"  API에서 상세 정보를 찾을 수 없습니다: {artwork.get('title', '제목 없음')}")
+        return False
+
+    changes = diff_api_detail(artwork, items[0])
+    if 'imageUrl' in changes:
+        print(f"  이미지 URL 업데이트: {changes['imageUrl'][:50]}...")
+    if changes:
+        print(f"  변경된 필드: {', '.join(sorted(changes))}")
+    artwork.update(changes)
+    return bool(changes)
+
+def resolve_list_item(search_results: Optional[Dict[str, Any]], title: str) -> Optional[Dict[str, Any]]:
+    """제목 검색 결과의 첫 항목 (ID가 없으면 None)"""
+    _, items = extract_page(search_results)
+    if not items:
+        print(f"  검색 결과가 없습니다: {title}")
+        return None
+    if not items[0].get('id'):
+        print(f"  검색 결과에 ID가 없습니다: {title}")
+        return None
+    return items[0]
+
+def apply_delta(artwork: dict, item: Dict[str, Any], api_detail: Optional[Dict[str, Any]], sync_state: SyncState) -> bool:
+    """받아 온 상세 정보의 내용이 지난 동기화와 다를 때만 반영하고 상태를 기록"""
+    _, details = extract_page(api_detail)
+    if not details:
+        return apply_api_detail(artwork, api_detail)
+    key, relic_id = artwork_key(artwork), str(item['id'])
+    detail_hash = content_hash(details[0])
+    changed = False
+    if sync_state.detail_changed(key, relic_id, detail_hash):
+        changed = apply_api_detail(artwork, api_detail)
+    else:
+        print("  상세 정보가 지난 동기화와 같습니다.")
+    modified = next((item[f] for f in MODIFIED_FIELDS if item.get(f)), None)
+    sync_state.update(key, relic_id, list_fingerprint(item), detail_hash, modified)
+    return changed
+
+def sync_artwork_delta(artwork: dict, api_client: MuseumAPIClient, sync_state: SyncState) -> bool:
+    """목록 지문이 바뀐 작품만 상세 조회해 반영합니다. 바뀐 필드가 있으면 True."""
+    title = artwork.get('title', '')
+    item = resolve_list_item(api_client.search_relics(keyword=title, size=1), title)
+    if item is None:
+        return False
+    if not sync_state.needs_detail(artwork_key(artwork), str(item['id']), list_fingerprint(item)):
+        print("  목록 정보가 바뀌지 않아 상세 조회를 건너뜁니다.")
+        return False
+    return apply_delta(artwork, item, api_client.get_relic_detail(str(item['id'])), sync_state)
+
+def update_artwork(artwork: dict, api_client: MuseumAPIClient, sync_state: Optional[SyncState] = None) -> bool:
+    """작품 하나를 API 정보로 갱신합니다. 바뀐 필드가 있으면 True."""
+    if sync_state is not None:
+        return sync_artwork_delta(artwork, api_client, sync_state)
+    return apply_api_detail(artwork, api_client.get_relic_detail_by_title(artwork.get('title', '')))
+
+def update_artworks_data_from_api(artworks_data: list, api_client: MuseumAPIClient, sync_state: Optional[SyncState] = None) -> list:
+    """API를 통해 작품 데이터를 업데이트합니다. sync_state 를 주면 변경분만 반영합니다.
+
+    sync_state 는 저장하지 않는다. 호출자가 artworks.json 을 쓴 뒤에 save() 해야
+    쓰기에 실패했을 때 다음 실행이 바뀐 작품을 '이미 반영됨'으로 건너뛰지 않는다.
+    """
     updated_count = 0
     for i, artwork in enumerate(artworks_data):
         print(f"[{i+1}/{len(artworks_data)}] 작품 업데이트 중: {artwork.get('title', '제목 없음')}")
@@ -166,58 +602,51 @@ def update_artworks_data_from_api(artworks_data: list, api_client: MuseumAPIClie
         #     print(f"  이미지 URL이 존재하여 건너뜁니다.")
         #     continue
 
-        api_detail = api_client.get_relic_detail_by_title(artwork.get('title', ''))
-        
-        if api_detail and 'response' in api_detail and 'body' in api_detail['response'] and 'items' in api_detail['response']['body']:
-            items = api_detail['response']['body']['items']
-            if items:
-                detail_info = items[0]
-                
-                # 이미지 URL 업데이트
-                if 'imageList' in detail_info and detail_info['imageList']:
-                    # 첫 번째 이미지 URL 사용
-                    artwork['imageUrl'] = detail_info['imageList'][0].get('imgUrl', artwork.get('imageUrl'))
-                    print(f"  이미지 URL 업데이트: {artwork['imageUrl'][:50]}...")
-                
-                # 추가 정보 업데이트 (예시)
-                artwork['description'] = detail_info.get('content', artwork.get('description'))
-                artwork['period'] = detail_info.get('eraName', artwork.get('period'))
-                artwork['material'] = detail_info.get('material', artwork.get('material'))
-                artwork['dimensions'] = detail_info.get('standard', artwork.get('dimensions'))
-                artwork['museum'] = detail_info.get('museumName', artwork.get('museum'))
-                artwork['inventoryNumber'] = detail_info.get('inventoryNum', artwork.get('inventoryNumber'))
-                artwork['culturalProperty'] = detail_info.get('designation', artwork.get('culturalProperty'))
-                
-                # 상세 설명 필드 업데이트 (API에 해당 필드가 있다면)
-                artwork['detailedDescription'] = detail_info.get('detailedContent', artwork.get('detailedDescription'))
-                artwork['historicalBackground'] = detail_info.get('historicalBackground', artwork.get('historicalBackground'))
-                artwork['artisticFeatures'] = detail_info.get('artisticFeatures', artwork.get('artisticFeatures'))
-                artwork['significance'] = detail_info.get('significance', artwork.get('significance'))
-
+        try:
+            if update_artwork(artwork, api_client, sync_state):
                 updated_count += 1
-            else:
-                print(f"  API에서 상세 정보를 찾을 수 없습니다: {artwork.get('title', '제목 없음')}")
-        else:
-            print(f"  API 호출 실패 또는 응답 형식 오류: {artwork.get('title', '제목 없음')}")
-        
-        # API 호출 간격 유지 (과도한 호출 방지)
-        time.sleep(0.5) # 0.5초 대기
+        except CircuitOpenError as e:
+            print(f"  {e} - 남은 {len(artworks_data) - i}개 작품은 이번 실행에서 건너뜁니다.")
+            break
         
     print(f"총 {updated_count}개의 작품 정보가 API를 통해 업데이트되었습니다.")
+    if sync_state is not None:
+        print(f"변경분 동기화: {sync_state.stats()}")
     return artworks_data
 
 if __name__ == "__main__":
-    client = MuseumAPIClient()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="국립박물관 API로 artworks.json 업데이트")
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="동시에 진행할 API 요청 수 (2 이상이면 비동기 클라이언트 사용)")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="--concurrency 를 상한으로 지연/오류에 따라 동시 요청 수를 자동 조절")
+    parser.add_argument('--delta', action='store_true',
+                        help="지난 실행 이후 목록 정보가 바뀐 작품만 상세 조회하고 달라진 필드만 반영")
+    parser.add_argument('--sync-state', default=DEFAULT_SYNC_STATE_PATH,
+                        help=f"--delta 동기화 상태 파일 (기본 {DEFAULT_SYNC_STATE_PATH})")
+    args = parser.parse_args()
+    sync_state = SyncState(args.sync_state) if args.delta else None
     
     print("기존 작품 데이터를 JSON 파일에서 읽는 중...")
     artworks = read_artworks_from_json(ARTWORKS_JSON_PATH)
     
     if artworks:
         print(f"총 {len(artworks)}개의 작품 데이터를 읽었습니다. API를 통해 업데이트를 시작합니다...")
-        updated_artworks = update_artworks_data_from_api(artworks, client)
+        if args.concurrency > 1:
+            from museum_async import run_update_artworks_async
+            updated_artworks = run_update_artworks_async(
+                artworks, max_in_flight=args.concurrency, adaptive=args.adaptive, sync_state=sync_state
+            )
+        else:
+            client = MuseumAPIClient()
+            updated_artworks = update_artworks_data_from_api(artworks, client, sync_state=sync_state)
         
         print("업데이트된 작품 데이터를 JSON 파일에 쓰는 중...")
         write_artworks_to_json(ARTWORKS_JSON_PATH, updated_artworks)
+        if sync_state is not None:
+            sync_state.save()
         print("작업 완료.")
     else:
         print("작품 데이터를 읽거나 파싱하는 데 실패했습니다. 스크립트를 종료합니다.")
\ No newline at end of file